@@ -0,0 +1,99 @@
+"""
+Compare the size and load latency of Cacher payloads with and without
+compression, with a cold and a warm page cache.
+
+The cold measurements ask the kernel to drop the cached pages of the file
+before each load via ``posix_fadvise``, which is only available on Linux. On a
+local SSD the difference is small, but on a network filesystem, where reading
+bytes is expensive, a smaller file can load faster even though it has to be
+decompressed.
+"""
+import os
+import ubelt as ub
+
+
+def drop_page_cache(fpath):
+    """
+    Ask the kernel to evict the pages of a file from the page cache.
+    """
+    fd = os.open(fpath, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+def make_data(size=200_000):
+    """
+    A mixture of compressible and incompressible data that resembles a typical
+    cached result.
+    """
+    import random
+    rng = random.Random(0)
+    data = {
+        'names': ['item_{:08d}'.format(i) for i in range(size)],
+        'scores': [rng.random() for _ in range(size)],
+        'labels': [rng.choice(['cat', 'dog', 'bird']) for _ in range(size)],
+    }
+    return data
+
+
+def bench_cacher_compression():
+    import timerit
+    import pandas as pd
+    from ubelt.util_cache import _CACHER_CODECS
+
+    can_drop = hasattr(os, 'posix_fadvise')
+    if not can_drop:
+        print('posix_fadvise is unavailable, skipping cold measurements')
+
+    dpath = ub.Path.appdir('ubelt/bench/cacher_compression').delete().ensuredir()
+    data = make_data()
+
+    codecs = [None] + list(_CACHER_CODECS.keys())
+    rows = []
+    ti = timerit.Timerit(10, bestof=3, verbose=1)
+    for compress in codecs:
+        try:
+            cacher = ub.Cacher('data', depends=str(compress), dpath=dpath,
+                               compress=compress, verbose=0)
+            cacher.save(data)
+        except ImportError:
+            print('skip unavailable codec {}'.format(compress))
+            continue
+        fpath = cacher.get_fpath()
+        row = {
+            'compress': str(compress),
+            'size_MB': os.stat(fpath).st_size / 2 ** 20,
+        }
+
+        for timer in ti.reset('save compress={}'.format(compress)):
+            with timer:
+                cacher.save(data)
+        row['save'] = ti.min()
+
+        for timer in ti.reset('load warm compress={}'.format(compress)):
+            cacher.load()
+            with timer:
+                cacher.load()
+        row['load_warm'] = ti.min()
+
+        if can_drop:
+            for timer in ti.reset('load cold compress={}'.format(compress)):
+                drop_page_cache(fpath)
+                with timer:
+                    cacher.load()
+            row['load_cold'] = ti.min()
+        rows.append(row)
+
+    df = pd.DataFrame(rows).set_index('compress')
+    print(df.to_string(float_format='{:0.4f}'.format))
+
+
+if __name__ == '__main__':
+    """
+    CommandLine:
+        python ~/code/ubelt/dev/bench/bench_cacher_compression.py
+    """
+    bench_cacher_compression()
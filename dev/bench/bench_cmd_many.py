@@ -0,0 +1,85 @@
+"""
+Compare running many short commands with :func:`ubelt.cmd` in a thread
+:class:`ubelt.JobPool` against :func:`ubelt.cmd_many`, which reads the output
+of every process in a single selector loop.
+
+The peak number of Python threads is reported along with the wall time.
+"""
+import sys
+import threading
+import ubelt as ub
+
+
+def _peak_threads(func):
+    """
+    Run ``func`` while sampling the number of live threads.
+    """
+    peak = [threading.active_count()]
+    stop = threading.Event()
+
+    def sample():
+        while not stop.is_set():
+            peak[0] = max(peak[0], threading.active_count() - 1)
+            stop.wait(0.001)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        func()
+    finally:
+        stop.set()
+        sampler.join()
+    return peak[0]
+
+
+def bench_cmd_many():
+    import timerit
+    num_commands = 200
+    max_concurrent = 16
+    script = 'import sys; print("x" * 1000); print("y" * 1000, file=sys.stderr)'
+    commands = [[sys.executable, '-c', script] for _ in range(num_commands)]
+
+    def run_jobpool():
+        pool = ub.JobPool(mode='thread', max_workers=max_concurrent)
+        with pool:
+            for command in commands:
+                pool.submit(ub.cmd, command)
+            for job in pool.as_completed():
+                job.result()
+
+    def run_jobpool_tee():
+        import contextlib
+        import io
+        pool = ub.JobPool(mode='thread', max_workers=max_concurrent)
+        with ub.CaptureStdout(), contextlib.redirect_stderr(io.StringIO()), pool:
+            for command in commands:
+                pool.submit(ub.cmd, command, tee=True, tee_backend='thread')
+            for job in pool.as_completed():
+                job.result()
+
+    def run_cmd_many():
+        for _ in ub.cmd_many(commands, max_concurrent=max_concurrent):
+            pass
+
+    rows = []
+    ti = timerit.Timerit(3, bestof=1, verbose=1)
+    for key, func in [('jobpool', run_jobpool),
+                      ('jobpool_tee', run_jobpool_tee),
+                      ('cmd_many', run_cmd_many)]:
+        for timer in ti.reset(key):
+            with timer:
+                func()
+        rows.append({
+            'method': key,
+            'time': ti.min(),
+            'peak_threads': _peak_threads(func),
+        })
+    print(ub.urepr(rows, nl=1, precision=4, align=':'))
+
+
+if __name__ == '__main__':
+    """
+    CommandLine:
+        python ~/code/ubelt/dev/bench/bench_cmd_many.py
+    """
+    bench_cmd_many()
@@ -0,0 +1,71 @@
+"""
+Compare the throughput of the :func:`ubelt.cmd` tee backends on commands that
+print many short lines.
+
+The "thread" and "select" backends move one line at a time, so they are only
+measured on the smaller line counts. The "poll" backend reads all available
+output in large chunks and writes each chunk at once. Capturing without tee
+(which uses :func:`subprocess.Popen.communicate`) is included as a baseline.
+"""
+import io
+import sys
+import contextlib
+import ubelt as ub
+
+
+def line_printer_command(num_lines):
+    script = ub.codeblock(
+        '''
+        import sys
+        write = sys.stdout.write
+        for i in range({num_lines}):
+            write('line %d\\n' % i)
+        ''').format(num_lines=num_lines)
+    return [sys.executable, '-c', script]
+
+
+def bench_cmd_tee():
+    import timerit
+
+    # The maximum number of lines to test each backend with
+    backend_limits = {
+        'capture': 2_000_000,
+        'poll': 2_000_000,
+        'select': 100_000,
+        'thread': 10_000,
+    }
+    if ub.WIN32:
+        backend_limits.pop('poll')
+        backend_limits.pop('select')
+
+    rows = []
+    ti = timerit.Timerit(3, bestof=1, verbose=1)
+    for num_lines in [10_000, 100_000, 2_000_000]:
+        command = line_printer_command(num_lines)
+        for backend, limit in backend_limits.items():
+            if num_lines > limit:
+                continue
+            if backend == 'capture':
+                kwargs = {}
+            else:
+                kwargs = {'tee': True, 'tee_backend': backend}
+            for timer in ti.reset(f'{backend} {num_lines} lines'):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    with timer:
+                        info = ub.cmd(command, **kwargs)
+            assert info['out'].count('\n') == num_lines
+            rows.append({
+                'backend': backend,
+                'num_lines': num_lines,
+                'time': ti.min(),
+                'lines_per_second': num_lines / ti.min(),
+            })
+    print(ub.urepr(rows, nl=1, precision=4, align=':'))
+
+
+if __name__ == '__main__':
+    """
+    CommandLine:
+        python ~/code/ubelt/dev/bench/bench_cmd_tee.py
+    """
+    bench_cmd_tee()
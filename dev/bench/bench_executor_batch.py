@@ -0,0 +1,52 @@
+"""
+Compare submitting many tiny jobs to a process pool one at a time with
+sending them in chunks.
+
+With one job per task the time is dominated by pickling each call and
+communicating with the workers. The "auto" chunk size measures the time per
+job and sends chunks that take a few milliseconds each.
+"""
+import ubelt as ub
+
+
+def bench_executor_batch():
+    import timerit
+
+    num_items = 20_000
+    max_workers = 2
+    items = list(range(num_items))
+    expected = [abs(x) for x in items]
+
+    rows = []
+    ti = timerit.Timerit(3, bestof=1, verbose=1)
+    for method in ['map_1', 'map_auto', 'submit', 'submit_batch']:
+        for timer in ti.reset(method):
+            with ub.JobPool('process', max_workers=max_workers) as pool:
+                # Start the workers before timing
+                pool.executor.submit(abs, 0).result()
+                with timer:
+                    if method == 'map_1':
+                        results = list(pool.executor.map(abs, items, chunksize=1))
+                    elif method == 'map_auto':
+                        results = list(pool.executor.map(abs, items, chunksize='auto'))
+                    elif method == 'submit':
+                        jobs = [pool.submit(abs, x) for x in items]
+                        results = [job.result() for job in jobs]
+                    elif method == 'submit_batch':
+                        jobs = pool.submit_batch(abs, items)
+                        results = [job.result() for job in jobs]
+            assert results == expected
+        rows.append({
+            'method': method,
+            'time': ti.min(),
+            'jobs_per_second': num_items / ti.min(),
+        })
+    print(ub.urepr(rows, nl=1, precision=4, align=':'))
+
+
+if __name__ == '__main__':
+    """
+    CommandLine:
+        python ~/code/ubelt/dev/bench/bench_executor_batch.py
+    """
+    bench_executor_batch()
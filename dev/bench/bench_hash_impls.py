@@ -2,6 +2,7 @@
 Check iterative versus recursive implementation of hash_data
 """
 from ubelt import NoParam
+from ubelt import hash_data
 from ubelt.util_hash import (
     _HASHABLE_EXTENSIONS,  _rectify_hasher, _rectify_base,
     _digest_hasher, _int_to_bytes
@@ -49,7 +50,7 @@ def _convert_to_hashable(data, types=True, extensions=None):
         if extensions is None:
             extensions = _HASHABLE_EXTENSIONS
         # Then dynamically look up any other type
-        hash_func = extensions.lookup(data)
+        hash_func = _lookup_uncached(extensions, data)
         prefix, hashable = hash_func(data)
     if types:
         return prefix, hashable
@@ -57,6 +58,25 @@ def _convert_to_hashable(data, types=True, extensions=None):
         return b'', hashable
 
 
+def _lookup_uncached(extensions, data):
+    """
+    The HashableExtensions.lookup implementation before the type dispatch
+    cache was added.
+    """
+    if extensions._lazy_queue:
+        extensions._evaluate_lazy_queue()
+    query_hash_type = data.__class__
+    hash_func = extensions._hash_dispatch.dispatch(query_hash_type)
+    if getattr(hash_func, '__is_base__', False):
+        base_msg = f'No registered hash func for hashable type={query_hash_type!r}'
+        try:
+            msg = f'{base_msg} with mro: {query_hash_type.__mro__}'
+        except AttributeError:
+            msg = base_msg
+        raise TypeError(msg)
+    return hash_func
+
+
 @profile
 def _update_hasher_recursive(hasher, data, types=True, extensions=None):
     """
@@ -285,9 +305,111 @@ def main():
         with timer:
             result2 = hash_data_iterative(data)
 
+    for timer in ti.reset('version1'):
+        with timer:
+            result3 = hash_data(data, version=1)
+    version1_time = ti.min()
+
+    for timer in ti.reset('version2'):
+        with timer:
+            result4 = hash_data(data, version=2)
+    version2_time = ti.min()
+
     print(f'result1={result1}')
     print(f'result2={result2}')
-    assert result1 == result2
+    print(f'result3={result3}')
+    print(f'result4={result4}')
+    print(f'version2 speedup over version1: {version1_time / version2_time:.2f}x')
+    assert result1 == result2 == result3
+
+
+def bench_dispatch():
+    """
+    Compare the current hash_data against the reference implementation
+    without the type dispatch cache and exact type fast paths on flat and
+    nested inputs.
+    """
+    import uuid
+    import decimal
+    import timerit
+    import ubelt as ub
+
+    flat_builtins = [i for i in range(10000)] + [str(i) for i in range(10000)]
+    flat_builtins += [float(i) for i in range(1000)] + [None] * 1000
+    flat_extensions = [uuid.UUID(int=i) for i in range(5000)]
+    flat_extensions += [decimal.Decimal(i) for i in range(5000)]
+    nested_builtins = [[i, str(i), [float(i), None]] for i in range(5000)]
+    nested_mixed = [[uuid.UUID(int=i), (i, str(i))] for i in range(5000)]
+    inputs = {
+        'flat_builtins': flat_builtins,
+        'flat_extensions': flat_extensions,
+        'nested_builtins': nested_builtins,
+        'nested_mixed': nested_mixed,
+    }
+
+    ti = timerit.Timerit(10, bestof=3, verbose=1)
+    rows = []
+    for key, data in inputs.items():
+        for timer in ti.reset(f'{key} reference'):
+            with timer:
+                want = hash_data_recursive(data)
+        reference_time = ti.min()
+        for timer in ti.reset(f'{key} current'):
+            with timer:
+                got = hash_data(data)
+        current_time = ti.min()
+        assert got == want
+        rows.append({
+            'input': key,
+            'reference': reference_time,
+            'current': current_time,
+            'speedup': reference_time / current_time,
+        })
+    print(ub.urepr(rows, nl=1, precision=4, align=':'))
+
+
+def bench_versions():
+    """
+    Compare hash_data version=1 against version=2 on flat and nested inputs
+    and report the speedup of version 2.
+    """
+    import uuid
+    import timerit
+    import ubelt as ub
+
+    def make_nested_dict(leaf_width=10, branch_width=2, depth=8):
+        data = {f'leaf_{depth}_{i}': str(i) * 4 for i in range(leaf_width)}
+        if depth > 0:
+            for i in range(branch_width):
+                data[f'branch_{depth}_{i}'] = make_nested_dict(
+                    leaf_width, branch_width, depth - 1)
+        return data
+
+    inputs = {
+        'nested_dict': make_nested_dict(),
+        'flat_builtins': list(range(10000)) + [str(i) for i in range(10000)],
+        'nested_builtins': [[i, str(i), [float(i), None]] for i in range(5000)],
+        'nested_mixed': [[uuid.UUID(int=i), (i, str(i))] for i in range(5000)],
+    }
+
+    ti = timerit.Timerit(10, bestof=3, verbose=1)
+    rows = []
+    for key, data in inputs.items():
+        for timer in ti.reset(f'{key} version1'):
+            with timer:
+                hash_data(data, version=1)
+        version1_time = ti.min()
+        for timer in ti.reset(f'{key} version2'):
+            with timer:
+                hash_data(data, version=2)
+        version2_time = ti.min()
+        rows.append({
+            'input': key,
+            'version1': version1_time,
+            'version2': version2_time,
+            'speedup': version1_time / version2_time,
+        })
+    print(ub.urepr(rows, nl=1, precision=4, align=':'))
 
 
 if __name__ == '__main__':
@@ -297,3 +419,5 @@ if __name__ == '__main__':
         python ~/code/ubelt/dev/bench/bench_hash_impls.py
     """
     main()
+    bench_dispatch()
+    bench_versions()
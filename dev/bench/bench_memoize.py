@@ -37,9 +37,78 @@ def bench_memoize():
     ti.reset('memoized property').call(lambda: self.a_memoized_property)
     ti.reset('raw property').call(lambda: self.a_raw_property)
 
+def _make_signature_key_reference(args, kwargs):
+    """
+    The _make_signature_key implementation before unhashable arguments were
+    handled individually: one unhashable argument hashes the entire args
+    tuple with hash_data.
+    """
+    from ubelt import util_hash
+
+    def _hashable(item):
+        try:
+            hash(item)
+        except TypeError:
+            return util_hash.hash_data(item)
+        else:
+            return item
+    kwitems = tuple(kwargs.items())
+    return _hashable(args), _hashable(kwitems)
+
+
+def bench_signature_key():
+    """
+    Compare the reference and current signature key construction on mixed
+    hashable and unhashable arguments.
+    """
+    import timerit
+    import ubelt as ub
+    from ubelt.util_memoize import _make_signature_key, _IdentityKeys
+    import numpy as np
+
+    big_tuple = tuple(range(10000))
+    big_text = 'x' * 100000
+    arr = np.random.rand(1000, 1000)
+    identity = _IdentityKeys(lambda part: None)
+
+    inputs = {
+        'all_hashable': ((big_tuple, 1, 'a'), {'flag': True}),
+        'big_tuple_small_list': ((big_tuple, [1, 2, 3]), {}),
+        'big_text_small_kwlist': ((big_text,), {'items': [1, 2]}),
+        'ndarray_and_int': ((arr, 3), {}),
+    }
+
+    ti = timerit.Timerit(20, bestof=3, verbose=1)
+    rows = []
+    for key, (args, kwargs) in inputs.items():
+        for timer in ti.reset(f'{key} reference'):
+            with timer:
+                _make_signature_key_reference(args, kwargs)
+        reference_time = ti.min()
+        for timer in ti.reset(f'{key} current'):
+            with timer:
+                _make_signature_key(args, kwargs)
+        current_time = ti.min()
+        row = {
+            'input': key,
+            'reference': reference_time,
+            'current': current_time,
+            'speedup': reference_time / current_time,
+        }
+        if key == 'ndarray_and_int':
+            for timer in ti.reset(f'{key} identity'):
+                with timer:
+                    _make_signature_key(args, kwargs, identity)
+            row['identity'] = ti.min()
+            row['identity_speedup'] = reference_time / ti.min()
+        rows.append(row)
+    print(ub.urepr(rows, nl=1, precision=6, align=':'))
+
+
 if __name__ == '__main__':
     """
     CommandLine:
-        python ~/code/ubelt/dev/bench_memoize.py
+        python ~/code/ubelt/dev/bench/bench_memoize.py
     """
     bench_memoize()
+    bench_signature_key()
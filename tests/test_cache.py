@@ -217,3 +217,776 @@ if __name__ == '__main__':
     """
     import xdoctest
     xdoctest.doctest_module(__file__)
+
+
+def test_explicit_builtin_backends():
+    dpath = ub.Path.appdir('ubelt/tests/test-cache-backends').delete().ensuredir()
+    data = {'a': [1, 2.5, None], 'b': 'text'}
+    for backend in ['pickle', 'json', 'marshal', 'pickle5']:
+        cacher = ub.Cacher('data', depends=backend, dpath=dpath,
+                           backend=backend)
+        assert cacher.backend == backend
+        cacher.save(data)
+        assert cacher.load() == data
+        cacher.clear()
+    assert list(dpath.ls()) == []
+    with pytest.raises(ValueError):
+        ub.Cacher('data', dpath=dpath, backend='pickel')
+
+
+def test_numpy_backend_memmap():
+    np = pytest.importorskip('numpy')
+    dpath = ub.Path.appdir('ubelt/tests/test-cache-backends').delete().ensuredir()
+    cacher = ub.Cacher('arr', depends='v1', dpath=dpath, ext='.npy',
+                       backend='numpy')
+    data = np.random.rand(100, 100)
+    cacher.save(data)
+    loaded = cacher.load()
+    # Loading maps the file instead of reading it
+    assert isinstance(loaded, np.memmap)
+    assert not loaded.flags['WRITEABLE']
+    assert np.all(loaded == data)
+    # Overwriting the cache must not invalidate the existing map
+    cacher.save(data * 2)
+    assert np.all(loaded == data)
+    assert np.all(cacher.load() == data * 2)
+    cacher.clear()
+
+
+def test_pickle5_backend_buffers():
+    np = pytest.importorskip('numpy')
+    dpath = ub.Path.appdir('ubelt/tests/test-cache-backends').delete().ensuredir()
+    cacher = ub.Cacher('arrs', depends='v1', dpath=dpath, backend='pickle5')
+    arrs = [np.arange(n, dtype=np.float32) for n in [0, 1, 17, 1000]]
+    data = {'arrs': arrs, 'meta': {'name': 'x'}}
+    cacher.save(data)
+    loaded = cacher.load()
+    assert loaded['meta'] == data['meta']
+    for got, want in zip(loaded['arrs'], arrs):
+        assert got.dtype == want.dtype
+        assert np.all(got == want)
+    cacher.clear()
+    assert list(dpath.ls()) == []
+
+
+def test_pickle5_backend_empty_buffers():
+    """
+    When every out-of-band buffer is empty, the buffers file is empty and
+    cannot be memory mapped.
+    """
+    np = pytest.importorskip('numpy')
+    dpath = ub.Path.appdir('ubelt/tests/test-cache-backends').delete().ensuredir()
+    cacher = ub.Cacher('arrs', depends='v1', dpath=dpath, backend='pickle5')
+    data = {'a': np.zeros(0), 'b': [np.ones((0, 3))]}
+    cacher.save(data)
+    assert ub.Path(cacher.fpath + '.buffers').stat().st_size == 0
+    loaded = cacher.load()
+    assert loaded['a'].shape == (0,)
+    assert loaded['b'][0].shape == (0, 3)
+    cacher.clear()
+
+
+def test_cacher_compression():
+    from ubelt.util_cache import _detect_codec
+    dpath = ub.Path.appdir('ubelt/tests/test-cache-compress').delete().ensuredir()
+    data = {'key': ['value'] * 1000, 'num': list(range(1000))}
+    backends = ['pickle', 'json', 'marshal']
+    for compress in ['zlib', 'lzma', 'bz2', 'zstd', 'lz4']:
+        if compress == 'zstd' and not ub.modname_to_modpath('zstandard'):
+            continue
+        if compress == 'lz4' and not ub.modname_to_modpath('lz4'):
+            continue
+        for backend in backends:
+            cacher = ub.Cacher('data', depends=backend, dpath=dpath,
+                               backend=backend, compress=compress)
+            cacher.save(data)
+            assert _detect_codec(cacher.get_fpath()) == compress
+            assert cacher.load() == data
+            # The codec is detected regardless of the compress argument
+            cacher2 = ub.Cacher('data', depends=backend, dpath=dpath,
+                                backend=backend)
+            assert cacher2.load() == data
+            # Writing without compression is also detected
+            cacher2.save(data)
+            assert _detect_codec(cacher.get_fpath()) is None
+            assert cacher.load() == data
+
+
+def test_cacher_compression_uncompressed_lookalike():
+    """
+    Uncompressed payloads that happen to start with the magic bytes of a
+    compression format must not be treated as compressed.
+    """
+    dpath = ub.Path.appdir('ubelt/tests/test-cache-compress').delete().ensuredir()
+    lookalikes = [b'\x1f\x8b gzip', b'BZh bz2', b'\x04\x22\x4d\x18 lz4']
+    ub.Cacher.backends.register(
+        'test_raw_bytes',
+        load=lambda fpath, cacher: ub.Path(fpath).read_bytes(),
+        dump=lambda fpath, data, cacher: ub.Path(fpath).write_bytes(data),
+        load_file=lambda file, cacher: file.read(),
+        dump_file=lambda file, data, cacher: file.write(data))
+    try:
+        for idx, payload in enumerate(lookalikes):
+            cacher = ub.Cacher('custom', depends=str(idx), dpath=dpath,
+                               backend='test_raw_bytes')
+            cacher.save(payload)
+            assert cacher.load() == payload
+            cacher = ub.Cacher('custom', depends=str(idx), dpath=dpath,
+                               backend='test_raw_bytes', compress='zlib')
+            cacher.save(payload)
+            assert cacher.load() == payload
+    finally:
+        ub.Cacher.backends.backends.pop('test_raw_bytes', None)
+
+
+def test_cacher_compression_numpy():
+    np = pytest.importorskip('numpy')
+    dpath = ub.Path.appdir('ubelt/tests/test-cache-compress').delete().ensuredir()
+    cacher = ub.Cacher('arr', depends='v1', dpath=dpath, ext='.npy',
+                       backend='numpy', compress='zlib')
+    data = np.zeros((100, 100))
+    cacher.save(data)
+    assert cacher.fpath.stat().st_size < data.nbytes
+    assert np.all(cacher.load() == data)
+
+
+def test_cacher_compression_unsupported():
+    with pytest.raises(ValueError):
+        ub.Cacher('data', backend='pickle5', compress='zlib')
+    with pytest.raises(KeyError):
+        ub.Cacher('data', compress='not-a-codec')
+
+
+def _locked_ensure_worker(dpath, counter_fpath):
+    import time
+
+    def func():
+        # Record each time the data is computed
+        with open(counter_fpath, 'a') as file:
+            file.write('x')
+        time.sleep(0.1)
+        return list(range(1000))
+    cacher = ub.Cacher('shared', depends='v1', dpath=dpath, lock=True,
+                       verbose=0)
+    return cacher.ensure(func)
+
+
+def _atomic_writer_worker(dpath, num):
+    datas = [[i] * 100_000 for i in range(2)]
+    cacher = ub.Cacher('atomic', depends='v1', dpath=dpath, verbose=0)
+    for i in range(num):
+        cacher.save(datas[i % 2])
+
+
+def _atomic_reader_worker(dpath, num):
+    cacher = ub.Cacher('atomic', depends='v1', dpath=dpath, verbose=0)
+    num_loaded = 0
+    for _ in range(num):
+        # A partial write would raise an error here
+        data = cacher.tryload(on_error='raise')
+        if data is not None:
+            assert len(data) == 100_000 and data[0] == data[-1]
+            num_loaded += 1
+    return num_loaded
+
+
+def _fork_executor(max_workers):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        pytest.skip('requires fork')
+    return ProcessPoolExecutor(max_workers,
+                               mp_context=multiprocessing.get_context('fork'))
+
+
+def test_locked_ensure_multiprocess():
+    """
+    Many processes ensuring the same missing data compute it only once.
+    """
+    dpath = ub.Path.appdir('ubelt/tests/test-cache-lock').delete().ensuredir()
+    counter_fpath = dpath / 'counter.txt'
+    num_workers = 8
+    with _fork_executor(num_workers) as executor:
+        futures = [executor.submit(_locked_ensure_worker, dpath, counter_fpath)
+                   for _ in range(num_workers)]
+        results = [f.result() for f in futures]
+    assert all(r == list(range(1000)) for r in results)
+    assert counter_fpath.read_text() == 'x'
+
+
+def test_atomic_save_multiprocess():
+    """
+    Readers never see a partially written file while writers save.
+    """
+    dpath = ub.Path.appdir('ubelt/tests/test-cache-atomic').delete().ensuredir()
+    # Write once up front, otherwise on a single core the readers can finish
+    # before the first write and load nothing.
+    _atomic_writer_worker(dpath, 1)
+    with _fork_executor(6) as executor:
+        writers = [executor.submit(_atomic_writer_worker, dpath, 20)
+                   for _ in range(2)]
+        readers = [executor.submit(_atomic_reader_worker, dpath, 200)
+                   for _ in range(4)]
+        for f in writers:
+            f.result()
+        num_loaded = sum(f.result() for f in readers)
+    assert num_loaded > 0
+    # No temporary files are left behind
+    assert sorted(p.name for p in dpath.ls()) == [
+        'atomic_v1.pkl', 'atomic_v1.pkl.meta']
+
+
+def test_atomic_save_multiprocess_sidecars():
+    """
+    Readers never pair the main file of one save with the sidecar file of
+    another.
+    """
+    pytest.importorskip('numpy')
+    from ubelt.util_cache import _import_pickle5
+    try:
+        _import_pickle5()
+    except ImportError:
+        pytest.skip('requires pickle protocol 5')
+    dpath = ub.Path.appdir('ubelt/tests/test-cache-atomic-sidecars').delete().ensuredir()
+    _pickle5_writer_worker(dpath, 1)
+    with _fork_executor(6) as executor:
+        writers = [executor.submit(_pickle5_writer_worker, dpath, 40)
+                   for _ in range(2)]
+        readers = [executor.submit(_pickle5_reader_worker, dpath, 200)
+                   for _ in range(4)]
+        for f in writers:
+            f.result()
+        num_loaded = sum(f.result() for f in readers)
+    assert num_loaded > 0
+    assert sorted(p.name for p in dpath.ls()) == [
+        'atomic_v1.pkl', 'atomic_v1.pkl.buffers', 'atomic_v1.pkl.meta']
+    # Concurrent saves can drop each others metadata, but the metadata file
+    # is never partially written.
+    meta_text = (dpath / 'atomic_v1.pkl.meta').read_text()
+    records = meta_text.split('\n\nsaving ')[1:]
+    assert len(records) > 0
+    assert all(r.endswith('atomic\nv1\nv1\nNone\n') for r in records)
+
+
+def _pickle5_writer_worker(dpath, num):
+    import numpy as np
+    cacher = ub.Cacher('atomic', depends='v1', dpath=dpath, verbose=0,
+                       backend='pickle5')
+    for i in range(num):
+        value = i % 2
+        cacher.save({'value': value, 'arr': np.full(100_000, value)})
+
+
+def _pickle5_reader_worker(dpath, num):
+    cacher = ub.Cacher('atomic', depends='v1', dpath=dpath, verbose=0,
+                       backend='pickle5')
+    num_loaded = 0
+    for _ in range(num):
+        data = cacher.tryload(on_error='raise')
+        if data is not None:
+            assert data['arr'][0] == data['arr'][-1] == data['value']
+            num_loaded += 1
+    return num_loaded
+
+
+def test_cache_stamp_locked_renew():
+    dpath = ub.Path.appdir('ubelt/tests/test-cache-lock-stamp').delete().ensuredir()
+    stamp = ub.CacheStamp('stamp', dpath=dpath, depends='v1', lock=True)
+    assert stamp.expired()
+    with stamp.locked():
+        # renew re-enters the lock held by this thread
+        stamp.renew()
+    assert not stamp.expired()
+
+
+def _visible_names(dpath):
+    return sorted(p.name for p in dpath.ls() if not p.name.startswith('.'))
+
+
+def test_cache_dir_max_bytes():
+    dpath = ub.Path.appdir('ubelt/tests/test-cache-dir-bytes').delete().ensuredir()
+    budget = ub.CacheDir(dpath, max_bytes=2500)
+    for i in range(4):
+        cacher = ub.Cacher('blob', depends=str(i), dpath=dpath, verbose=0,
+                           budget=budget)
+        cacher.save(b'x' * 1000)
+    assert budget.total_bytes() <= 2500
+    # The entry that was just saved is never evicted
+    assert cacher.exists()
+    assert len(budget) == len([n for n in _visible_names(dpath)
+                               if n.endswith('.pkl')])
+    budget.close()
+
+
+def test_cache_dir_lru_vs_lfu():
+    for policy, expected in [('lru', {'1', '2'}), ('lfu', {'0', '2'})]:
+        dpath = ub.Path.appdir('ubelt/tests/test-cache-dir-' + policy).delete().ensuredir()
+        kw = dict(dpath=dpath, verbose=0,
+                  budget=dict(max_entries=2, policy=policy))
+        c0 = ub.Cacher('data', depends='0', **kw)
+        c1 = ub.Cacher('data', depends='1', **kw)
+        c2 = ub.Cacher('data', depends='2', **kw)
+        c0.save(0)
+        c1.save(1)
+        # Entry 0 is used more often, but entry 1 is used more recently
+        for _ in range(3):
+            c0.load()
+        c1.load()
+        c2.save(2)
+        remain = {c.depends for c in [c0, c1, c2] if c.exists()}
+        assert remain == expected, policy
+        for c in [c0, c1, c2]:
+            c.budget.close()
+
+
+def test_cache_dir_max_age_and_sync():
+    import os
+    import time
+    dpath = ub.Path.appdir('ubelt/tests/test-cache-dir-age').delete().ensuredir()
+    old_fpath = (dpath / 'old.txt')
+    old_fpath.write_text('old')
+    new_fpath = (dpath / 'new.txt')
+    new_fpath.write_text('new')
+    # An orphaned sidecar with no main file
+    (dpath / 'gone.pkl.meta').write_text('meta')
+    # A subdirectory is not an entry
+    (dpath / 'subdir').ensuredir()
+    old_time = time.time() - 3600
+    os.utime(old_fpath, (old_time, old_time))
+
+    budget = ub.CacheDir(dpath, max_age='30m')
+    # A dry run does not change anything, and does not create the index
+    before = sorted(p.name for p in dpath.ls())
+    removed = budget.gc(dry=True)
+    assert [ub.Path(p).name for p in removed] == ['old.txt']
+    assert sorted(p.name for p in dpath.ls()) == before
+    assert budget.sync(dry=True) == [str(dpath / 'gone.pkl.meta')]
+    assert sorted(p.name for p in dpath.ls()) == before
+
+    removed = budget.gc()
+    assert [ub.Path(p).name for p in removed] == ['old.txt']
+    assert _visible_names(dpath) == ['new.txt', 'subdir']
+    assert not (dpath / 'gone.pkl.meta').exists()
+
+    # A dry run with an existing index uses the recorded access times
+    (dpath / 'newer.txt').write_text('newer')
+    budget.touch(new_fpath)
+    budget.max_age = None
+    budget.max_entries = 1
+    index_mtime = (dpath / budget.INDEX_FNAME).stat().st_mtime
+    removed = budget.gc(dry=True)
+    assert [ub.Path(p).name for p in removed] == ['newer.txt']
+    assert (dpath / budget.INDEX_FNAME).stat().st_mtime == index_mtime
+    assert len(budget) == 1
+    budget.close()
+
+
+def test_cache_dir_clear_discards():
+    dpath = ub.Path.appdir('ubelt/tests/test-cache-dir-clear').delete().ensuredir()
+    cacher = ub.Cacher('data', dpath=dpath, verbose=0,
+                       budget=dict(max_entries=10))
+    cacher.save([1, 2, 3])
+    assert len(cacher.budget) == 1
+    assert cacher.budget.entries()[0]['hits'] == 0
+    cacher.load()
+    assert cacher.budget.entries()[0]['hits'] == 1
+    cacher.clear()
+    assert len(cacher.budget) == 0
+    cacher.budget.close()
+
+
+def test_cache_gc_cli():
+    import sys
+    dpath = ub.Path.appdir('ubelt/tests/test-cache-dir-cli').delete().ensuredir()
+    for i in range(3):
+        (dpath / 'file{}.txt'.format(i)).write_text('x' * 100)
+    info = ub.cmd([sys.executable, '-m', 'ubelt', 'cache-gc', dpath,
+                   '--max-entries', '1', '--dry'])
+    assert info['ret'] == 0
+    assert 'Would remove 2 entries' in info['out']
+    assert len(_visible_names(dpath)) == 3
+    assert not (dpath / ub.CacheDir.INDEX_FNAME).exists()
+    info = ub.cmd([sys.executable, '-m', 'ubelt', 'cache-gc', dpath,
+                   '--max-bytes', '1KB', '--max-entries', '1'])
+    assert info['ret'] == 0
+    assert len(_visible_names(dpath)) == 1
+    info = ub.cmd([sys.executable, '-m', 'ubelt', 'cache-gc',
+                   dpath / 'does-not-exist'])
+    assert info['ret'] == 1
+
+
+def test_cacher_memory_lru_bytes():
+    from ubelt.util_cache import _CacherMemory
+    dpath = ub.Path.appdir('ubelt/tests/test-cacher-memory-lru').delete().ensuredir()
+    memory = _CacherMemory(max_bytes=2500)
+    cachers = [ub.Cacher('blob', depends=str(i), dpath=dpath, verbose=0,
+                         memory=memory) for i in range(3)]
+    for cacher in cachers:
+        cacher.save(b'x' * 1000)
+    # Each entry is more than 1000 bytes on disk, so only two fit
+    info = memory.info()
+    assert info['entries'] == 2
+    assert info['bytes'] <= 2500
+    assert cachers[0].get_fpath() not in memory._entries
+    # Loading the evicted entry reads it from disk and evicts the next LRU
+    cachers[0].load()
+    assert memory.info()['misses'] == 1
+    assert cachers[1].get_fpath() not in memory._entries
+    # Data that is larger than the limit is not kept
+    big = ub.Cacher('big', dpath=dpath, verbose=0, memory=memory)
+    big.save(b'x' * 5000)
+    assert big.get_fpath() not in memory._entries
+
+
+def test_cacher_memory_invalidate_inode():
+    import os
+    from ubelt.util_cache import _CacherMemory
+    dpath = ub.Path.appdir('ubelt/tests/test-cacher-memory-inode').delete().ensuredir()
+    memory = _CacherMemory()
+    cacher = ub.Cacher('data', dpath=dpath, verbose=0, memory=memory)
+    cacher.save('aaaa')
+    fpath = cacher.get_fpath()
+    stat = os.stat(fpath)
+    assert cacher.load() == 'aaaa'
+    # Replace the file with one of the same size and mtime
+    ub.Cacher('data', dpath=dpath, verbose=0).save('bbbb')
+    os.utime(fpath, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert os.stat(fpath).st_size == stat.st_size
+    assert cacher.load() == 'bbbb'
+    # Clearing forgets the entry
+    cacher.clear()
+    assert memory.info()['entries'] == 0
+    with pytest.raises(IOError):
+        cacher.load()
+
+
+def test_cacher_memory_shared_tier():
+    dpath = ub.Path.appdir('ubelt/tests/test-cacher-memory-shared').delete().ensuredir()
+    ub.Cacher('data', dpath=dpath, verbose=0).save({'a': 1})
+    # Different instances with the same key share the process-wide tier
+    data1 = ub.Cacher('data', dpath=dpath, verbose=0, memory=True).load()
+    data2 = ub.Cacher('data', dpath=dpath, verbose=0, memory=True).load()
+    assert data1 is data2
+    # Without a memory tier each load returns a new object
+    data3 = ub.Cacher('data', dpath=dpath, verbose=0).load()
+    assert data3 == data1 and data3 is not data1
+    ub.Cacher.memory_tier.discard(ub.Cacher('data', dpath=dpath).get_fpath())
+
+
+def test_cacher_memory_hit_defers_budget_touch():
+    """
+    A memory hit records the access without writing to the budget index.
+    """
+    from ubelt.util_cache import _CacherMemory
+    dpath = ub.Path.appdir('ubelt/tests/test-cacher-memory-budget').delete().ensuredir()
+    budget = ub.CacheDir(dpath, max_entries=10)
+    cacher = ub.Cacher('data', dpath=dpath, verbose=0, budget=budget,
+                       memory=_CacherMemory())
+    cacher.save([1, 2, 3])
+    conn = budget._connect()
+    num_changes = conn.total_changes
+    for _ in range(10):
+        assert cacher.load() == [1, 2, 3]
+    assert conn.total_changes == num_changes
+    # The hits are written the next time the index is used
+    assert budget.entries()[0]['hits'] == 10
+    assert conn.total_changes > num_changes
+    budget.close()
+
+
+def test_cacher_dedup_shares_blobs():
+    import os
+    dpath = ub.Path.appdir('ubelt/tests/test-cacher-dedup').delete().ensuredir()
+    payload = {'table': list(range(1000))}
+    cachers = [
+        ub.Cacher('table', depends='cfg1', dpath=dpath, verbose=0, dedup=True),
+        ub.Cacher('table', depends='cfg2', dpath=dpath, verbose=0, dedup=True),
+        ub.Cacher('other_app', depends='x', dpath=dpath, verbose=0, dedup=True),
+    ]
+    cachers[0].save(payload)
+    blob_fpaths = (dpath / 'blobs').ls()
+    assert len(blob_fpaths) == 1
+    blob_inode = os.stat(blob_fpaths[0]).st_ino
+    for cacher in cachers[1:]:
+        cacher.save(payload)
+    # The existing blob is reused and not rewritten
+    blob_fpaths = (dpath / 'blobs').ls()
+    assert len(blob_fpaths) == 1
+    assert os.stat(blob_fpaths[0]).st_ino == blob_inode
+    for cacher in cachers:
+        assert cacher.get_fpath() != blob_fpaths[0]
+        assert os.stat(cacher.get_fpath()).st_size < 200
+        assert cacher.load() == payload
+    # A cacher without dedup can load a pointer written by one with it
+    plain = ub.Cacher('table', depends='cfg1', dpath=dpath, verbose=0)
+    assert plain.load() == payload
+    # Overwriting a pointer with a plain entry works as usual
+    plain.save('plain')
+    assert cachers[0].load() == 'plain'
+    assert cachers[1].load() == payload
+    # No temporary files are left behind
+    assert not [p for p in dpath.ls() if p.name.startswith('.')]
+    assert not [p for p in (dpath / 'blobs').ls() if p.name.startswith('.')]
+
+
+def test_cacher_dedup_compressed():
+    """
+    Compressed payloads are deterministic, so identical data is stored once.
+    """
+    dpath = ub.Path.appdir('ubelt/tests/test-cacher-dedup-compress').delete().ensuredir()
+    payload = {'table': list(range(1000))}
+    for compress in [True, 'zlib', 'lzma', 'bz2']:
+        blob_dpath = dpath / 'blobs'
+        blob_dpath.delete()
+        for depends in ['a', 'b']:
+            cacher = ub.Cacher('table', depends=depends, dpath=dpath,
+                               verbose=0, dedup=True, compress=compress)
+            cacher.save(payload)
+        assert len(blob_dpath.ls()) == 1, compress
+        assert cacher.load() == payload
+
+
+def test_cacher_dedup_prune_blobs():
+    dpath = ub.Path.appdir('ubelt/tests/test-cacher-dedup-prune').delete().ensuredir()
+    c1 = ub.Cacher('data', depends='1', dpath=dpath, verbose=0, dedup=True)
+    c2 = ub.Cacher('data', depends='2', dpath=dpath, verbose=0, dedup=True)
+    c1.save('one')
+    c2.save('two')
+    c2.save('three')
+    assert len((dpath / 'blobs').ls()) == 3
+    # Recently written blobs are kept by default
+    assert c1.prune_blobs() == []
+    removed = c1.prune_blobs(grace=0, dry=True)
+    assert len(removed) == 1
+    assert len((dpath / 'blobs').ls()) == 3
+    assert c1.prune_blobs(grace=0) == removed
+    assert c1.load() == 'one'
+    assert c2.load() == 'three'
+
+
+def test_cacher_dedup_sidecars_and_compress():
+    pytest.importorskip('numpy')
+    import numpy as np
+    from ubelt.util_cache import _import_pickle5
+    try:
+        _import_pickle5()
+    except ImportError:
+        pytest.skip('requires pickle protocol 5')
+    dpath = ub.Path.appdir('ubelt/tests/test-cacher-dedup-sidecars').delete().ensuredir()
+    data = {'arr': np.arange(1000)}
+    # A previous plain entry with a sidecar
+    ub.Cacher('data', depends='a', dpath=dpath, verbose=0,
+              backend='pickle5').save({'arr': np.zeros(10)})
+    assert (dpath / 'data_a.pkl.buffers').exists()
+    c1 = ub.Cacher('data', depends='a', dpath=dpath, verbose=0,
+                   backend='pickle5', dedup=True)
+    c2 = ub.Cacher('data', depends='b', dpath=dpath, verbose=0,
+                   backend='pickle5', dedup=True)
+    c1.save(data)
+    c2.save(data)
+    # The stale sidecar of the plain entry was removed
+    assert not (dpath / 'data_a.pkl.buffers').exists()
+    assert sorted(p.suffix for p in (dpath / 'blobs').ls()) == ['.buffers', '.pkl']
+    assert np.all(c2.load()['arr'] == data['arr'])
+    # Compressed blobs are detected when loading through the pointer
+    c3 = ub.Cacher('comp', dpath=dpath, verbose=0, compress='zlib', dedup=True)
+    c3.save(['x'] * 100)
+    assert c3.load() == ['x'] * 100
+
+
+def _register_gated_backend(name, gate):
+    """
+    A pickle backend that waits for an event before writing, so tests can
+    observe pending background writes.
+    """
+    import pickle
+
+    def load(fpath, cacher):
+        with open(fpath, 'rb') as file:
+            return pickle.load(file)
+
+    def dump(fpath, data, cacher):
+        gate.wait(timeout=10)
+        with open(fpath, 'wb') as file:
+            pickle.dump(data, file)
+
+    if name not in ub.Cacher.backends:
+        ub.Cacher.backends.register(name, load, dump)
+
+
+def test_cacher_background_pending_load():
+    import threading
+    gate = threading.Event()
+    _register_gated_backend('gated_pickle', gate)
+    dpath = ub.Path.appdir('ubelt/tests/test-cacher-background').delete().ensuredir()
+    cacher = ub.Cacher('data', dpath=dpath, verbose=0, backend='gated_pickle')
+    try:
+        futures = [cacher.save([i], background=True) for i in range(3)]
+        assert not futures[-1].done()
+        assert not cacher.exists()
+        # The latest pending write is visible before it is finished
+        assert cacher.load() == [2]
+        assert cacher.tryload() == [2]
+    finally:
+        gate.set()
+    assert ub.Cacher.flush(timeout=10)
+    assert all(f.done() for f in futures)
+    assert cacher.writer.lookup(cacher.get_fpath()) is None
+    # Writes were done in order, so the last one wins
+    assert ub.Cacher('data', dpath=dpath, verbose=0).load() == [2]
+
+
+def test_cacher_background_snapshot():
+    """
+    Changes to the data after a background save returns are not written.
+    """
+    import threading
+    gate = threading.Event()
+    _register_gated_backend('gated_pickle3', gate)
+    dpath = ub.Path.appdir('ubelt/tests/test-cacher-background-snapshot').delete().ensuredir()
+    for backend in ['pickle', 'json', 'gated_pickle3']:
+        cacher = ub.Cacher('data', depends=backend, dpath=dpath, verbose=0,
+                           backend=backend, compress=None)
+        data = {'items': [1, 2, 3]}
+        try:
+            future = cacher.save(data, background=True)
+            data['items'].append(4)
+            data['new'] = True
+            # The pending snapshot is what is loaded
+            assert cacher.load() == {'items': [1, 2, 3]}
+        finally:
+            gate.set()
+        future.result()
+        assert ub.Cacher('data', depends=backend, dpath=dpath,
+                         backend=backend).load() == {'items': [1, 2, 3]}
+
+
+def test_cacher_background_sync_and_clear_order():
+    import threading
+    gate = threading.Event()
+    _register_gated_backend('gated_pickle2', gate)
+    dpath = ub.Path.appdir('ubelt/tests/test-cacher-background-order').delete().ensuredir()
+    cacher = ub.Cacher('data', dpath=dpath, verbose=0, backend='gated_pickle2')
+    cacher.save('old', background=True)
+    timer = threading.Timer(0.1, gate.set)
+    timer.start()
+    # A synchronous save waits for the pending write to the same file
+    plain = ub.Cacher('data', dpath=dpath, verbose=0)
+    plain.save('new')
+    assert plain.load() == 'new'
+    gate.clear()
+    cacher.save('pending', background=True)
+    timer = threading.Timer(0.1, gate.set)
+    timer.start()
+    # Clear waits for the pending write, so it does not reappear
+    cacher.clear()
+    assert not cacher.exists()
+    assert cacher.tryload() is None
+
+
+def test_cacher_background_errors_and_serialized():
+    import pickle
+    dpath = ub.Path.appdir('ubelt/tests/test-cacher-background-errors').delete().ensuredir()
+    cacher = ub.Cacher('data', dpath=dpath, verbose=0)
+    future = cacher.save(lambda: None, background=True)
+    with pytest.raises(Exception):
+        future.result()
+    assert cacher.tryload() is None
+
+    cacher = ub.Cacher('data', dpath=dpath, verbose=0, compress='zlib')
+    payload = pickle.dumps(list(range(100)))
+    cacher.save(payload, serialized=True, background=True).result()
+    assert cacher.load() == list(range(100))
+    # Saving a serialized payload synchronously works as well
+    cacher.save(pickle.dumps('sync'), serialized=True)
+    assert cacher.load() == 'sync'
+
+    with pytest.raises(TypeError):
+        cacher.save('not bytes', serialized=True)
+    cacher5 = ub.Cacher('data5', dpath=dpath, verbose=0, backend='pickle5')
+    with pytest.raises(ValueError):
+        cacher5.save(payload, serialized=True)
+
+    disabled = ub.Cacher('data', dpath=dpath, verbose=0, enabled=False)
+    assert disabled.save('x', background=True).result() is None
+
+
+def test_cacher_sqlite_store_semantics():
+    for backend in ['pickle', 'json']:
+        dpath = ub.Path.appdir('ubelt/tests/test-cacher-sqlite-' + backend).delete()
+        kw = dict(dpath=dpath, verbose=0, store='sqlite', backend=backend)
+        c1 = ub.Cacher('data', depends='v1', **kw)
+        c2 = ub.Cacher('data', depends='v2' * 100, **kw)
+        other = ub.Cacher('other', depends='v1', **kw)
+        assert c1.tryload() is None
+        assert not c1.exists()
+        c1.save({'a': [1, 2]})
+        c2.save([3])
+        other.save('x')
+        assert c1.exists()
+        assert c1.load() == {'a': [1, 2]}
+        assert c2.load() == [3]
+        assert set(c1.existing_versions()) == {c1.get_fpath(), c2.get_fpath()}
+        # The data is not kept in separate files
+        assert [p.name for p in dpath.ls() if not p.name.startswith('cacher_store')] == []
+        c1.clear()
+        assert c1.tryload() is None
+        assert list(c1.existing_versions()) == [c2.get_fpath()]
+        assert c1.ensure(lambda: 'computed') == 'computed'
+        assert ub.Cacher('data', depends='v1', **kw).load() == 'computed'
+
+
+def test_cacher_sqlite_store_compress_and_errors():
+    from ubelt.util_cache import _CACHER_CODECS
+    dpath = ub.Path.appdir('ubelt/tests/test-cacher-sqlite-compress').delete()
+    data = list(range(100))
+    for codec in _CACHER_CODECS:
+        try:
+            cacher = ub.Cacher('data', depends=codec, dpath=dpath, verbose=0,
+                               store='sqlite', compress=codec)
+            cacher.save(data)
+        except ImportError:
+            continue
+        assert cacher.load() == data
+        assert ub.Cacher('data', depends=codec, dpath=dpath,
+                         store='sqlite').load() == data
+
+    # Corrupted entries are cleared by tryload
+    cacher = ub.Cacher('data', depends='bad', dpath=dpath, verbose=0,
+                       store='sqlite')
+    cacher.save('good', serialized=False)
+    cacher._sqlite_store().put_many([
+        ('data_bad.pkl', 'data', b'not a pickle', '')])
+    assert cacher.tryload(on_error='clear') is None
+    assert not cacher.exists()
+
+    with pytest.raises(KeyError):
+        ub.Cacher('data', dpath=dpath, store='lmdb')
+    with pytest.raises(ValueError):
+        ub.Cacher('data', dpath=dpath, store='sqlite', memory=True)
+    with pytest.raises(ValueError):
+        ub.Cacher('data', dpath=dpath, store='sqlite', backend='pickle5')
+
+
+def test_cacher_sqlite_store_threads_and_background():
+    from concurrent.futures import ThreadPoolExecutor
+    dpath = ub.Path.appdir('ubelt/tests/test-cacher-sqlite-threads').delete()
+
+    def worker(i):
+        cacher = ub.Cacher('data', depends=str(i), dpath=dpath, verbose=0,
+                           store='sqlite')
+        cacher.save(i)
+        return cacher.load()
+
+    with ThreadPoolExecutor(4) as executor:
+        assert list(executor.map(worker, range(40))) == list(range(40))
+    cacher = ub.Cacher('data', dpath=dpath, verbose=0, store='sqlite')
+    assert cacher.load_many(map(str, range(40))) == list(range(40))
+    assert len(list(cacher.existing_versions())) == 40
+    # Background saves are visible to load_many
+    cacher = ub.Cacher('data', depends='bg', dpath=dpath, verbose=0,
+                       store='sqlite')
+    cacher.save('pending', background=True)
+    assert cacher.load_many(['bg', '0']) == ['pending', 0]
+    ub.Cacher.flush()
+    assert cacher.load() == 'pending'
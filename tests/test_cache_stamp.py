@@ -124,3 +124,105 @@ def test_cache_stamp_noproduct():
     assert not self.expired()
     product.write_text('corrupted')
     assert not self.expired()
+
+
+def test_cache_stamp_hash_cache():
+    from ubelt.util_hash import FileHashCache
+    dpath = ub.Path.appdir('ubelt/tests', 'test-cache-stamp-hash-cache').delete().ensuredir()
+    hash_cache = FileHashCache(dpath / 'hashcache.sqlite')
+    product = dpath / 'product.txt'
+    product.write_text('very expensive')
+    self = ub.CacheStamp('test1', dpath=dpath, depends='test1',
+                         product=product, hasher='sha256',
+                         hash_cache=hash_cache)
+    assert self.expired()
+    self.renew()
+    assert len(hash_cache) == 1
+    assert not self.expired()
+    # Changing the content must still be detected
+    product.write_text('very corrupted')
+    assert self.expired()
+    self.renew()
+    assert not self.expired()
+    # The certificate is compatible with stamps that dont use the cache
+    other = ub.CacheStamp('test1', dpath=dpath, depends='test1',
+                          product=product, hasher='sha256')
+    assert not other.expired()
+    hash_cache.close()
+
+
+def _make_expired_many_cases(dpath):
+    import os
+    shared = dpath / 'shared.txt'
+    shared.write_text('shared')
+    stamps = []
+
+    def make(name, **kw):
+        product = dpath / (name + '.txt')
+        product.write_text(name)
+        kw.setdefault('product', [product, shared])
+        stamp = ub.CacheStamp(name, dpath=dpath, depends='v1', verbose=0,
+                              **kw)
+        stamps.append(stamp)
+        return stamp, product
+
+    make('valid')[0].renew()
+    make('no_cert')
+    stamp, product = make('missing')
+    stamp.renew()
+    product.delete()
+    stamp, product = make('size')
+    stamp.renew()
+    product.write_text('size changed')
+    stamp, product = make('hash')
+    stamp.renew()
+    stat = product.stat()
+    product.write_text('HASH')
+    os.utime(product, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    make('expired', expires=-1)[0].renew()
+    make('noproduct', product=None)[0].renew()
+    make('nohasher', hasher=None)[0].renew()
+    stamp, product = make('nohashcheck')
+    stamp._expire_checks['hash'] = False
+    stamp.renew()
+    stat = product.stat()
+    product.write_text('NOHASHCHECK')
+    os.utime(product, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    stamp = make('disabled')[0]
+    stamp.cacher.enabled = False
+    return stamps
+
+
+def test_cache_stamp_expired_many():
+    dpath = ub.Path.appdir('ubelt/tests/test-cache-stamp-many').delete().ensuredir()
+    stamps = _make_expired_many_cases(dpath)
+    expected = {stamp: stamp.expired() for stamp in stamps}
+    assert [expected[s] for s in stamps] == [
+        False, 'no_cert', 'missing_products', 'size_diff', 'hash_diff',
+        'expired_cert', False, False, False, 'disabled']
+    for workers in [0, 4]:
+        reasons = ub.CacheStamp.expired_many(stamps, workers=workers)
+        assert list(reasons.keys()) == stamps
+        assert reasons == expected
+
+
+def test_cache_stamp_expired_many_dedup(monkeypatch):
+    from ubelt import util_cache
+    dpath = ub.Path.appdir('ubelt/tests/test-cache-stamp-many-dedup').delete().ensuredir()
+    shared = dpath / 'shared.txt'
+    shared.write_text('shared')
+    stamps = [ub.CacheStamp('stamp{}'.format(i), dpath=dpath, depends='v1',
+                            product=shared, verbose=0) for i in range(5)]
+    for stamp in stamps:
+        stamp.renew()
+    calls = []
+    orig_worker = util_cache._hash_product_worker
+
+    def counting_worker(*args):
+        calls.append(args)
+        return orig_worker(*args)
+    monkeypatch.setattr(util_cache, '_hash_product_worker', counting_worker)
+    reasons = ub.CacheStamp.expired_many(stamps, workers=2)
+    assert not any(reasons.values())
+    # The shared product is only hashed once
+    assert len(calls) == 1
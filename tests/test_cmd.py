@@ -1,4 +1,5 @@
 import pytest
+import os
 import sys
 import ubelt as ub
 
@@ -127,6 +128,33 @@ def test_cmd_tee_select():
     assert result['out'] == '\n'.join(list(map(str, range(100)))) + '\n'
 
 
+@pytest.mark.skipif(sys.platform == 'win32', reason='not available on win32')
+def test_cmd_tee_poll():
+    py_script = ub.codeblock(
+        r"""
+        import sys
+        for i in range(20000):
+            sys.stdout.write('O{}\r\n'.format(i))
+            if i % 5000 == 0:
+                sys.stderr.write('!E{}\n'.format(i))
+        sys.stdout.write('\N{SNOWMAN}' * 3)
+        """)
+    command = [PYEXE, '-c', py_script]
+    want = ub.cmd(command, verbose=0)
+    with ub.CaptureStdout() as cap:
+        result = ub.cmd(command, verbose=1, tee_backend='poll')
+    assert result['out'] == want['out']
+    assert result['err'] == want['err'] == '!E0\n!E5000\n!E10000\n!E15000\n'
+    assert cap.text == want['out']
+    assert result['out'].endswith('O19999\n' + '\N{SNOWMAN}' * 3)
+
+    # The tee backend is ignored when detaching
+    for text in [True, False]:
+        info = ub.cmd(command, detach=True, verbose=1, text=text,
+                      tee_backend='poll')
+        info['proc'].communicate()
+
+
 @pytest.mark.skipif(sys.platform == 'win32', reason='not available on win32')
 def test_cmd_tee_badmethod():
     """
@@ -303,6 +331,7 @@ def test_timeout():
         if kw['tee']:
             if not ub.WIN32:
                 expanded_grid.append(kw | {'tee_backend': 'select'})
+                expanded_grid.append(kw | {'tee_backend': 'poll'})
             expanded_grid.append(kw | {'tee_backend': 'thread'})
         else:
             expanded_grid.append(kw)
@@ -534,6 +563,343 @@ def _dev_debug_timeouts():
     """
 
 
+
+def test_cmd_many_matches_cmd():
+    """
+    The captured output and return codes of cmd_many match cmd
+    """
+    py_script = ub.codeblock(
+        r"""
+        import sys
+        sys.stdout.write('out line 1\r\nout line 2\n')
+        sys.stderr.write('err ' * 20000)
+        sys.exit({})
+        """)
+    commands = [[PYEXE, '-c', py_script.format(i)] for i in range(6)]
+    results = list(ub.cmd_many(commands, max_concurrent=3))
+    assert sorted(info['index'] for info in results) == list(range(6))
+    for info in results:
+        want = ub.cmd(commands[info['index']])
+        assert info['ret'] == want['ret'] == info['index']
+        assert info['out'] == want['out']
+        assert info['err'] == want['err']
+        assert info.returncode == info['proc'].returncode
+        assert info.args == commands[info['index']]
+
+
+def test_cmd_many_max_concurrent():
+    """
+    No more than max_concurrent processes are running at once
+    """
+    import time
+    dpath = ub.Path.appdir('ubelt/tests/cmd_many/concurrent').delete().ensuredir()
+    py_script = ub.codeblock(
+        r"""
+        import os, sys, time
+        dpath = sys.argv[1]
+        fpath = os.path.join(dpath, sys.argv[2])
+        open(fpath, 'w').close()
+        time.sleep(0.2)
+        print(len(os.listdir(dpath)))
+        os.remove(fpath)
+        """)
+    commands = [[PYEXE, '-c', py_script, dpath, str(i)] for i in range(6)]
+    start = time.monotonic()
+    results = list(ub.cmd_many(commands, max_concurrent=2))
+    elapsed = time.monotonic() - start
+    assert len(results) == 6
+    assert max(int(info['out']) for info in results) <= 2
+    # The commands ran in parallel
+    assert elapsed < 6 * 0.2 + 1
+
+
+def test_cmd_many_options():
+    import subprocess
+    dpath = ub.Path.appdir('ubelt/tests/cmd_many/options').ensuredir()
+    env = dict(ub.udict(os.environ) | {'UBELT_CMD_MANY': 'custom'})
+    commands = [
+        {'command': [PYEXE, '-c', 'import os; print(os.getcwd())'],
+         'cwd': dpath},
+        {'command': [PYEXE, '-c', 'import os; print(os.environ["UBELT_CMD_MANY"])'],
+         'env': env},
+        {'command': 'echo $((1 + 2))', 'shell': True},
+    ]
+    if ub.WIN32:
+        commands = commands[:2]
+    results = sorted(ub.cmd_many(commands), key=lambda info: info['index'])
+    assert ub.Path(results[0]['out'].strip()).resolve() == dpath.resolve()
+    assert results[1]['out'].strip() == 'custom'
+    if not ub.WIN32:
+        assert results[2]['out'].strip() == '3'
+
+    with pytest.raises(ValueError):
+        list(ub.cmd_many([{'command': 'echo hi', 'capture': False}]))
+    with pytest.raises(ValueError):
+        list(ub.cmd_many([{'shell': True}]))
+
+    # check can also be given per command
+    commands = [
+        {'command': [PYEXE, '-c', 'raise SystemExit(2)'], 'check': True},
+    ]
+    with pytest.raises(subprocess.CalledProcessError) as ex:
+        list(ub.cmd_many(commands))
+    assert ex.value.returncode == 2
+
+
+def test_cmd_many_timeout():
+    """
+    A command that times out raises and the other running processes are
+    killed.
+    """
+    import subprocess
+    import time
+    sleeper = [PYEXE, '-c', 'import time; print("started", flush=True); time.sleep(30)']
+    commands = [
+        sleeper,
+        {'command': sleeper, 'timeout': 0.5},
+        [PYEXE, '-c', 'print("fast")'],
+    ]
+    start = time.monotonic()
+    outputs = []
+    with pytest.raises(subprocess.TimeoutExpired) as ex:
+        for info in ub.cmd_many(commands, max_concurrent=3):
+            outputs.append(info)
+    elapsed = time.monotonic() - start
+    assert elapsed < 10
+    assert [info['out'].strip() for info in outputs] == ['fast']
+    assert 'started' in ex.value.stdout
+    # Closing the generator early kills running processes
+    gen = ub.cmd_many([sleeper, [PYEXE, '-c', 'pass']], max_concurrent=2)
+    first = next(gen)
+    assert first['index'] == 1
+    gen.close()
+    assert time.monotonic() - start < 10
+
+
+def test_cmd_bytes_output():
+    py_script = ub.codeblock(
+        r"""
+        import sys
+        sys.stdout.buffer.write(bytes(range(256)) + b'\r\n')
+        sys.stderr.buffer.write(b'\xff err')
+        """)
+    command = [PYEXE, '-c', py_script]
+    info = ub.cmd(command, text=False)
+    assert info['out'] == bytes(range(256)) + b'\r\n'
+    assert info['err'] == b'\xff err'
+
+    backends = ['thread'] if ub.WIN32 else ['thread', 'select']
+    for backend in backends:
+        with ub.CaptureStdout() as cap:
+            info = ub.cmd(command, text=False, verbose=1, tee_backend=backend)
+        assert info['out'] == bytes(range(256)) + b'\r\n'
+        assert info['err'] == b'\xff err'
+        assert len(cap.text) > 0
+
+
+def test_cmd_output_callbacks():
+    py_script = ub.codeblock(
+        r"""
+        import sys
+        for i in range(1000):
+            sys.stdout.write('line {}\r\n'.format(i) * 10)
+            sys.stderr.write('\N{SNOWMAN}' * 10)
+        """)
+    command = [PYEXE, '-c', py_script]
+    want = ub.cmd(command)
+    backends = ['thread'] if ub.WIN32 else ['thread', 'select']
+    for backend in backends:
+        for text in [True, False]:
+            out_chunks = []
+            err_chunks = []
+            info = ub.cmd(command, text=text, capture=False,
+                          stdout_callback=out_chunks.append,
+                          stderr_callback=err_chunks.append,
+                          tee_backend=backend)
+            assert info['out'] is None and info['err'] is None
+            assert info['ret'] == 0
+            if text:
+                assert ''.join(out_chunks) == want['out']
+                assert ''.join(err_chunks) == want['err']
+            else:
+                assert b''.join(out_chunks).replace(b'\r\n', b'\n') == want['out'].encode()
+                assert len(err_chunks) > 0
+
+        # Callbacks can also be combined with capture
+        out_chunks = []
+        info = ub.cmd(command, stdout_callback=out_chunks.append,
+                      tee_backend=backend)
+        assert ''.join(out_chunks) == info['out'] == want['out']
+        assert info['err'] == want['err']
+
+    with pytest.raises(ValueError):
+        ub.cmd('echo hi', detach=True, stdout_callback=print)
+    with pytest.raises(ValueError):
+        ub.cmd('echo hi', stdout_callback=print, tee_backend='bad')
+
+
+def test_cmd_callback_timeout():
+    import subprocess
+    sleeper = [PYEXE, '-c', 'import time; print("started", flush=True); time.sleep(30)']
+    backends = ['thread'] if ub.WIN32 else ['thread', 'select']
+    for backend in backends:
+        chunks = []
+        with pytest.raises(subprocess.TimeoutExpired) as ex:
+            ub.cmd(sleeper, stdout_callback=chunks.append, timeout=1,
+                   tee_backend=backend)
+        assert ''.join(chunks).strip() == 'started'
+        assert ex.value.stdout.strip() == 'started'
+
+    # The process keeps running after it closes its output streams
+    closer = [PYEXE, '-c', ub.codeblock(
+        r"""
+        import os, sys, time
+        print("closing", flush=True)
+        os.close(sys.stdout.fileno())
+        os.close(sys.stderr.fileno())
+        time.sleep(30)
+        """)]
+    for backend in backends:
+        chunks = []
+        timer = ub.Timer().tic()
+        with pytest.raises(subprocess.TimeoutExpired) as ex:
+            ub.cmd(closer, stdout_callback=chunks.append, timeout=1,
+                   tee_backend=backend)
+        assert timer.toc() < 10
+        assert ''.join(chunks).strip() == 'closing'
+        assert ex.value.stdout.strip() == 'closing'
+
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='not available on win32')
+def test_cmd_callback_fast_producer():
+    """
+    The poll reader must not buffer an unbounded amount of output from a fast
+    producer, and must still enforce the timeout.
+    """
+    import subprocess
+    py_script = ub.codeblock(
+        r"""
+        import sys
+        block = b'y\n' * 65536
+        write = sys.stdout.buffer.write
+        while True:
+            write(block)
+        """)
+    sizes = []
+    timer = ub.Timer().tic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        ub.cmd([PYEXE, '-c', py_script], text=False, capture=False,
+               stdout_callback=lambda chunk: sizes.append(len(chunk)),
+               timeout=1, tee_backend='poll')
+    elapsed = timer.toc()
+    assert len(sizes) > 1
+    assert max(sizes) <= 1 << 20
+    assert elapsed < 3
+
+
+def _async_run(coro):
+    import asyncio
+    if sys.version_info[0:2] >= (3, 7):
+        return asyncio.run(coro)
+    else:  # nocover
+        return asyncio.get_event_loop().run_until_complete(coro)
+
+
+def test_acmd_matches_cmd():
+    py_script = ub.codeblock(
+        r"""
+        import sys
+        sys.stdout.write('out line 1\r\nout line 2\n')
+        sys.stderr.write('err ' * 20000)
+        sys.exit(3)
+        """)
+    commands = [
+        [PYEXE, '-c', py_script],
+        'echo str noshell',
+        ('echo', 'tuple noshell'),
+    ]
+    for command in commands:
+        want = ub.cmd(command)
+        got = _async_run(ub.acmd(command))
+        assert got['out'] == want['out']
+        assert got['err'] == want['err']
+        assert got['ret'] == want['ret']
+        assert got['command'] == want['command']
+        assert got.args == want.args
+    got = _async_run(ub.acmd('echo str&&echo shell', shell=True))
+    assert got['out'].strip() == 'str' + chr(10) + 'shell'
+
+
+def test_acmd_tee():
+    py_script = ub.codeblock(
+        r"""
+        import sys
+        sys.stdout.write('tee out\r\n')
+        sys.stdout.flush()
+        sys.stderr.write('tee err\n')
+        """)
+    with ub.CaptureStdout() as cap:
+        info = _async_run(ub.acmd([PYEXE, '-c', py_script], verbose=1))
+    assert info['out'] == 'tee out\n'
+    assert info['err'] == 'tee err\n'
+    assert cap.text == 'tee out\n'
+
+    info = _async_run(ub.acmd([PYEXE, '-c', 'print("hi")'], capture=False))
+    assert info['out'] is None and info['ret'] == 0
+
+
+def test_acmd_check_and_timeout():
+    import asyncio
+    import subprocess
+    with pytest.raises(subprocess.CalledProcessError):
+        _async_run(ub.acmd('exit 1', shell=True, check=True))
+
+    sleeper = [PYEXE, '-c', 'import time; print("started", flush=True); time.sleep(30)']
+    with pytest.raises(subprocess.TimeoutExpired) as ex:
+        _async_run(ub.acmd(sleeper, timeout=1))
+    assert 'started' in ex.value.stdout
+
+    # Cancelling the task kills the process
+    async def cancel_sleeper():
+        task = asyncio.ensure_future(ub.acmd(sleeper))
+        await asyncio.sleep(0.5)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return 'cancelled'
+    assert _async_run(cancel_sleeper()) == 'cancelled'
+
+
+def test_acmd_concurrent():
+    """
+    Many commands can be awaited at once without blocking the event loop
+    """
+    import asyncio
+    import time
+    sleeper = [PYEXE, '-c', 'import time; time.sleep(0.5); print("done")']
+
+    async def main():
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.05)
+
+        results = await asyncio.gather(
+            ticker(), *[ub.acmd(sleeper) for _ in range(4)])
+        return ticks, results[1:]
+
+    start = time.monotonic()
+    ticks, infos = _async_run(main())
+    elapsed = time.monotonic() - start
+    assert [info['out'].strip() for info in infos] == ['done'] * 4
+    assert len(ticks) == 5
+    # The processes ran concurrently
+    assert elapsed < 4 * 0.5 + 1.5
+
 if __name__ == '__main__':
     """
         pytest ubelt/tests/test_cmd.py -s
@@ -315,3 +315,105 @@ if __name__ == '__main__':
     test_as_completed_timeout()
     # import xdoctest
     # xdoctest.doctest_module(__file__)
+
+
+def _set_worker_state(value):
+    """
+    Initializer that records a value in the worker
+    """
+    global _WORKER_STATE
+    _WORKER_STATE = value
+
+
+def _get_worker_state(offset=0):
+    return _WORKER_STATE + offset
+
+
+def _checked_inverse(x):
+    if x == 0:
+        raise ZeroDivisionError('cannot invert zero')
+    return 1 / x
+
+
+def _skip_process_on_unsupported():
+    import platform
+    import sys
+    import pytest
+    if 'pypy' in platform.python_implementation().lower():
+        pytest.skip('not testing process on pypy')
+    if sys.platform.startswith('win32'):
+        pytest.skip('not running this test on win32 for now')
+
+
+def test_executor_initializer():
+    _skip_process_on_unsupported()
+    import ubelt as ub
+    for mode in ['process', 'thread', 'serial']:
+        with ub.Executor(mode=mode, max_workers=2,
+                         initializer=_set_worker_state,
+                         initargs=(mode,)) as executor:
+            job = executor.submit(_get_worker_state, '!')
+            assert job.result() == mode + '!'
+
+    with ub.JobPool(mode='process', max_workers=2,
+                    initializer=_set_worker_state,
+                    initargs=(10,)) as pool:
+        jobs = pool.submit_batch(_get_worker_state, range(20))
+        assert [job.result() for job in jobs] == list(range(10, 30))
+
+
+def test_executor_map_auto_chunksize():
+    _skip_process_on_unsupported()
+    import ubelt as ub
+    import pytest
+    for mode in ['process', 'thread', 'serial']:
+        with ub.Executor(mode=mode, max_workers=2) as executor:
+            # Lengths are known
+            results = list(executor.map(divmod, range(500), [7] * 500,
+                                        chunksize='auto'))
+            assert results == [divmod(i, 7) for i in range(500)]
+            # Lengths are unknown, and the sizer has measured earlier batches
+            items = (i for i in range(-300, 0))
+            results = list(executor.map(abs, items, chunksize='auto'))
+            assert results == list(range(300, 0, -1))
+            # Exceptions are raised in order
+            results = executor.map(_checked_inverse, [1, 2, 0, 4],
+                                   chunksize='auto')
+            assert next(results) == 1
+            assert next(results) == 0.5
+            with pytest.raises(ZeroDivisionError):
+                next(results)
+        if mode != 'serial':
+            assert executor._sizer.item_seconds is not None
+
+
+def test_job_pool_submit_batch():
+    _skip_process_on_unsupported()
+    import ubelt as ub
+    import pytest
+    for mode in ['process', 'thread', 'serial']:
+        with ub.JobPool(mode=mode, max_workers=2) as pool:
+            jobs = pool.submit_batch(_checked_inverse, [1, 2, 0, 4, 5] * 20)
+            assert len(pool) == 100
+            assert jobs[0].result() == 1
+            with pytest.raises(ZeroDivisionError):
+                jobs[2].result()
+            assert [job.result() for job in jobs[3:5]] == [0.25, 0.2]
+            # Explicit chunk sizes work too
+            more = pool.submit_batch(divmod, range(10), range(1, 11),
+                                     chunksize=3)
+            assert [job.result() for job in more] == [
+                divmod(i, i + 1) for i in range(10)]
+            completed = list(pool.as_completed())
+            assert len(completed) == 110
+            # Invalid chunk sizes are rejected instead of dropping jobs
+            for chunksize in [0, -1, 1.5, 'big']:
+                with pytest.raises(ValueError):
+                    pool.submit_batch(divmod, [1], [1], chunksize=chunksize)
+            num_errors = 0
+            for job in completed:
+                try:
+                    job.result()
+                except ZeroDivisionError:
+                    num_errors += 1
+            assert num_errors == 20
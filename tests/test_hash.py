@@ -283,6 +283,37 @@ def test_ndarray_zeros():
     assert hashid != ub.hash_data(data.astype(np.int8))
 
 
+def test_ndarray_noncontiguous():
+    if np is None:
+        pytest.skip('requires numpy')
+    from ubelt.util_hash import _NDArrayChunks
+    data = np.arange(2 * 3 * 4 * 5, dtype=np.float32).reshape(2, 3, 4, 5)
+    views = [data.T, data[:, ::2], data[::-1, :, 1::3], np.asfortranarray(data),
+             data[..., 0], data.astype('M8[D]')[:, ::-1]]
+    for view in views:
+        assert not view.flags['C_CONTIGUOUS']
+        # Streaming the rows must give the same result as a contiguous copy
+        for version in [1, 2]:
+            assert ub.hash_data(view, version=version) == ub.hash_data(
+                view.copy(), version=version)
+        for blocksize in [1, 7, 64, 1 << 20]:
+            chunks = _NDArrayChunks(b'', view, blocksize=blocksize)
+            assert bytes(chunks) == view.tobytes()
+
+
+def test_hash_buffers():
+    import array
+    assert ub.hash_data(bytearray(b'abc')) == ub.hash_data(b'abc')
+    assert ub.hash_data(memoryview(b'abc')) == ub.hash_data(b'abc')
+    assert ub.hash_data(memoryview(b'abcdef')[::2]) == ub.hash_data(b'ace')
+    assert ub.hash_data([bytearray(b'a'), 1], version=2) == ub.hash_data([b'a', 1], version=2)
+    a1 = array.array('i', [1, 2, 3])
+    a2 = array.array('I', [1, 2, 3])
+    assert ub.hash_data(a1) == ub.hash_data(array.array('i', [1, 2, 3]))
+    assert ub.hash_data(a1) != ub.hash_data(a2)
+    assert ub.hash_data(a1, types=True) != ub.hash_data(a1.tobytes(), types=True)
+
+
 def test_nesting():
     assert _hashable_sequence([1, 1, 1]) != _hashable_sequence([[1], 1, 1])
     assert _hashable_sequence([[1], 1]) != _hashable_sequence([[1, 1]])
@@ -433,6 +464,274 @@ def test_empty_hash_file():
     assert a == b == c == d
 
 
+def test_hash_files():
+    import hashlib
+    from ubelt import util_hash
+    dpath = ub.Path.appdir('ubelt/tests/test-hash-files-cases').delete().ensuredir()
+    sizes = [0, 1, 100, util_hash._MMAP_THRESHOLD + 17]
+    fpaths = []
+    for idx, size in enumerate(sizes):
+        fpath = dpath / 'file_{}.bin'.format(idx)
+        fpath.write_bytes(bytes(range(256)) * (size // 256) + b'z' * (size % 256))
+        fpaths.append(fpath)
+    fpaths = fpaths[::-1]
+
+    kwargs_grid = [
+        dict(),
+        dict(hasher='sha1', base='abc'),
+        dict(blocksize=4099, maxbytes=util_hash._MMAP_THRESHOLD + 3),
+        dict(blocksize=4096, maxbytes=10),
+        dict(blocksize=3, stride=2),
+    ]
+    for kwargs in kwargs_grid:
+        want = {fpath: ub.hash_file(fpath, **kwargs) for fpath in fpaths}
+        for backend in ['serial', 'thread', 'process']:
+            got = ub.hash_files(fpaths, workers=2, backend=backend, **kwargs)
+            assert list(got.keys()) == fpaths
+            assert got == want
+
+    # Hasher instances are copied for each file
+    got = ub.hash_files(fpaths, workers=2, hasher=hashlib.sha1())
+    assert got == {fpath: ub.hash_file(fpath, hasher='sha1') for fpath in fpaths}
+
+
+def test_hash_file_tree():
+    import hashlib
+    dpath = ub.Path.appdir('ubelt/tests/test-hash-file-tree').delete().ensuredir()
+    fpath = dpath / 'data.bin'
+    data = bytes(range(256)) * 40 + b'tail'
+    fpath.write_bytes(data)
+    chunksize = 1000
+    tree = ub.hash_file_tree(fpath, chunksize=chunksize, hasher='sha256')
+    assert tree['size'] == len(data)
+    assert len(tree['chunks']) == 11
+    for idx, chunk_hash in enumerate(tree['chunks']):
+        chunk = data[idx * chunksize:(idx + 1) * chunksize]
+        assert chunk_hash == hashlib.sha256(chunk).hexdigest()
+
+    # Results do not depend on the parallel backend or the read blocksize
+    for backend in ['serial', 'thread', 'process']:
+        other = ub.hash_file_tree(fpath, chunksize=chunksize, hasher='sha256',
+                                  workers=3, backend=backend, blocksize=7)
+        assert other == tree
+
+    # The root depends on the chunksize and differs from the linear hash
+    root = ub.hash_file(fpath, mode='tree', chunksize=chunksize, hasher='sha256')
+    assert root == tree['root']
+    assert root != ub.hash_file(fpath, hasher='sha256')
+    assert root != ub.hash_file(fpath, mode='tree', chunksize=999, hasher='sha256')
+    assert ub.hash_file(fpath, mode='tree', chunksize=chunksize,
+                        hasher='sha256', base='abc') != root
+
+    # Hasher instances are copied for each chunk
+    other = ub.hash_file_tree(fpath, chunksize=chunksize, hasher=hashlib.sha256())
+    assert other == tree
+
+    # Empty files have a well defined hash
+    empty_fpath = dpath / 'empty.bin'
+    empty_fpath.write_bytes(b'')
+    empty_tree = ub.hash_file_tree(empty_fpath, chunksize=chunksize)
+    assert empty_tree['chunks'] == []
+    assert empty_tree['root'] is not None
+
+    # Tree hashes can be cached
+    from ubelt.util_hash import FileHashCache
+    cache = FileHashCache(dpath / 'hashcache.sqlite')
+    got = ub.hash_file(fpath, mode='tree', chunksize=chunksize,
+                       hasher='sha256', cache=cache)
+    assert got == root
+    got = ub.hash_file(fpath, mode='tree', chunksize=chunksize,
+                       hasher='sha256', cache=cache)
+    assert got == root
+    assert ub.hash_file(fpath, hasher='sha256', cache=cache) != root
+    cache.close()
+
+    with pytest.raises(ValueError):
+        ub.hash_file(fpath, mode='tree', maxbytes=10)
+    with pytest.raises(KeyError):
+        ub.hash_file(fpath, mode='unknown')
+
+
+def test_file_hash_cache():
+    import hashlib
+    import os
+    from ubelt.util_hash import FileHashCache
+    dpath = ub.Path.appdir('ubelt/tests/test-file-hash-cache').delete().ensuredir()
+    cache = FileHashCache(dpath / 'hashcache.sqlite')
+    fpath = dpath / 'data.txt'
+    fpath.write_text('abcdefghijklmnop')
+
+    kwargs_grid = [
+        dict(),
+        dict(hasher='sha1', base='abc'),
+        dict(hasher=hashlib.md5, maxbytes=3),
+        dict(hasher='sha1', blocksize=3, stride=2),
+    ]
+    for kwargs in kwargs_grid:
+        want = ub.hash_file(fpath, **kwargs)
+        assert ub.hash_file(fpath, cache=cache, **kwargs) == want
+        assert ub.hash_file(fpath, cache=cache, **kwargs) == want
+    assert len(cache) == len(kwargs_grid)
+
+    # The cache is consulted if stat info matches
+    stat = os.stat(fpath)
+    cache.store(fpath, stat, 'sha1', 'f' * 40)
+    assert ub.hash_file(fpath, hasher='sha1', cache=cache) == 'f' * 40
+
+    # But a modified file will be rehashed
+    fpath.write_text('changed and longer')
+    want = ub.hash_file(fpath, hasher='sha1')
+    assert ub.hash_file(fpath, hasher='sha1', cache=cache) == want
+    assert cache.lookup(fpath, os.stat(fpath), 'sha1') == want
+
+    # Hasher instances bypass the cache
+    cache.clear()
+    ub.hash_file(fpath, hasher=hashlib.sha1(), cache=cache)
+    assert len(cache) == 0
+
+    # Least recently used entries are evicted
+    cache.max_entries = 2
+    fpaths = []
+    for idx in range(4):
+        fpath = dpath / 'file_{}.txt'.format(idx)
+        fpath.write_text(str(idx))
+        fpaths.append(fpath)
+        ub.hash_file(fpath, cache=cache)
+    assert cache.evict() == 2
+    assert len(cache) == 2
+    assert cache.lookup(fpaths[0], os.stat(fpaths[0]), 'sha512') is None
+    assert cache.lookup(fpaths[3], os.stat(fpaths[3]), 'sha512') is not None
+    cache.close()
+
+
+def test_file_hash_cache_max_bytes():
+    import os
+    from ubelt.util_hash import FileHashCache
+    dpath = ub.Path.appdir('ubelt/tests/test-file-hash-cache-bytes').delete().ensuredir()
+    cache = FileHashCache(dpath / 'hashcache.sqlite', max_bytes=100_000)
+    fpath = dpath / 'data.txt'
+    fpath.write_text('data')
+    stat = os.stat(fpath)
+    recent = str(dpath / 'recent.txt')
+    cache.store(recent, stat, 'sha512', 'r' * 128)
+    for idx in range(2000):
+        cache.store(str(dpath / 'file_{:06d}.txt'.format(idx)), stat,
+                    'sha512', 'f' * 128)
+        if idx % 100 == 0:
+            # Keep one entry recently used
+            assert cache.lookup(recent, stat, 'sha512') == 'r' * 128
+    cache.evict()
+    assert cache.nbytes() <= 100_000
+    assert 0 < len(cache) < 2000
+    # The least recently used entries were evicted
+    assert cache.lookup(recent, stat, 'sha512') == 'r' * 128
+    assert cache.lookup(str(dpath / 'file_000000.txt'), stat, 'sha512') is None
+    assert cache.lookup(str(dpath / 'file_001999.txt'), stat, 'sha512') is not None
+    cache.close()
+
+
+def test_hasher_matches_hash_data():
+    from collections import OrderedDict
+    sequences = [
+        [],
+        [1, 2, 3],
+        ['a', b'b', None, 1.5],
+        [[1, 2], 3, [4, [5]]],
+        [1, [2], [3, 4], 'x', {'a': [1]}],
+        [{'a': 1}, OrderedDict([('b', 2)]), {3, 4}, (5, 6)],
+        [uuid.UUID(int=3), [uuid.UUID(int=4)]],
+    ]
+    for seq in sequences:
+        for version in [1, 2]:
+            for types in [True, False]:
+                for hasher in ['sha1', 'sha512']:
+                    kw = dict(types=types, version=version)
+                    streamer = ub.Hasher(hasher, **kw)
+                    for item in iter(seq):
+                        streamer.update(item)
+                    got = streamer.hexdigest()
+                    want = ub.hash_data(seq, hasher=hasher, **kw)
+                    assert got == want, (seq, kw)
+                    assert streamer.hexdigest(base='abc') == ub.hash_data(
+                        seq, hasher=hasher, base='abc', **kw)
+
+
+def test_hasher_update_after_digest():
+    streamer = ub.Hasher()
+    streamer.update([1, 2])
+    first = streamer.hexdigest()
+    assert first == ub.hash_data([[1, 2]])
+    streamer.update('more')
+    assert streamer.hexdigest() == ub.hash_data([[1, 2], 'more'])
+    assert streamer.hexdigest() != first
+
+
+def test_hasher_update_file():
+    dpath = ub.Path.appdir('ubelt/tests/test-hasher-file').ensuredir()
+    fpath = dpath / 'data.bin'
+    fpath.write_bytes(b'0123456789' * 100)
+    for version in [1, 2]:
+        for types in [True, False]:
+            streamer = ub.Hasher(types=types, version=version)
+            streamer.update(1)
+            streamer.update_file(fpath, blocksize=7)
+            streamer.update([2])
+            want = ub.hash_data([1, fpath.read_bytes(), [2]], types=types,
+                                version=version)
+            assert streamer.hexdigest() == want
+
+
+def test_extension_lookup_cache_invalidation():
+    import abc
+    extensions = ub.util_hash.HashableExtensions()
+
+    class Base(object):
+        pass
+
+    class Derived(Base):
+        pass
+
+    with pytest.raises(TypeError):
+        extensions.lookup(Derived())
+    # Registering a new function must invalidate the cached lookup
+    extensions.register(Base)(lambda x: (b'BASE', b''))
+    assert extensions.lookup(Derived())(Derived()) == (b'BASE', b'')
+    extensions.register(Derived)(lambda x: (b'DERIVED', b''))
+    assert extensions.lookup(Derived())(Derived()) == (b'DERIVED', b'')
+    assert extensions.lookup(Base())(Base()) == (b'BASE', b'')
+
+    # Registering a virtual subclass of an ABC must also invalidate it
+    class MyABC(abc.ABC):
+        pass
+
+    class Virtual(object):
+        pass
+
+    extensions.register(MyABC)(lambda x: (b'ABC', b''))
+    with pytest.raises(TypeError):
+        extensions.lookup(Virtual())
+    MyABC.register(Virtual)
+    assert extensions.lookup(Virtual())(Virtual()) == (b'ABC', b'')
+
+
+def test_convert_to_hashable_subclasses():
+    import enum
+    from ubelt.util_hash import _convert_to_hashable
+
+    class MyStr(str):
+        pass
+
+    class MyInt(enum.IntEnum):
+        a = 3
+
+    # Subclasses of builtins do not use the exact type fast path, but they
+    # are still hashed like their base type.
+    assert _convert_to_hashable(MyStr('a')) == _convert_to_hashable('a')
+    assert _convert_to_hashable(MyInt.a) == _convert_to_hashable(3)
+    assert _convert_to_hashable(True) == _convert_to_hashable(1)
+    assert _hashable_sequence([MyStr('a'), [MyInt.a]]) == _hashable_sequence(['a', [3]])
+
+
 def test_convert_base_hex():
     # Test that hex values are unchanged
     for i in it.chain(range(-10, 10), range(-1000, 1000, 7)):
@@ -503,6 +802,58 @@ def test_base32():
     assert hashstr == 'VGMT4NSHA2AWVOR6EVYXQUGCNSONBWE5'
 
 
+def test_hash_data_version1_is_default():
+    data = {'a': [1, 2, [3.2, 5]], 'b': (None, 'c', b'd'), 'e': {1, 2}}
+    assert ub.hash_data(data) == ub.hash_data(data, version=1)
+    assert ub.hash_data(data) != ub.hash_data(data, version=2)
+    # Scalars are encoded identically in both versions
+    for item in [1, 'a', b'b', None, 3.2, uuid.UUID(int=0)]:
+        for types in [True, False]:
+            assert (ub.hash_data(item, types=types, version=1) ==
+                    ub.hash_data(item, types=types, version=2))
+    with pytest.raises(ValueError):
+        ub.hash_data(data, version=3)
+
+
+def test_hash_data_version2_separators():
+    # Every nested item must be followed by a separator in version 2
+    seq = b''.join(_hashable_sequence([[1], [2]], version=2))
+    assert seq == b'_[__[_\x01_,__]__,__[_\x02_,__]__,__]_'
+    assert _hashable_sequence([[1], 1], version=2) != _hashable_sequence([[1, 1]], version=2)
+    assert _hashable_sequence([1, [1]], version=2) != _hashable_sequence([[1, 1]], version=2)
+    assert _hashable_sequence([[[1]]], version=2) != _hashable_sequence([[1]], version=2)
+
+
+def test_hash_data_version2_containers():
+    from collections import OrderedDict
+    data1 = {'b': 2, 'a': [1, {'c': {3, 1, 2}}]}
+    data2 = {'a': [1, {'c': {2, 1, 3}}], 'b': 2}
+    assert ub.hash_data(data1, version=2) == ub.hash_data(data2, version=2)
+    odict1 = OrderedDict([('a', 1), ('b', 2)])
+    odict2 = OrderedDict([('b', 2), ('a', 1)])
+    assert ub.hash_data(odict1, version=2) != ub.hash_data(odict2, version=2)
+    assert ub.hash_data(odict1, version=2, types=True) != ub.hash_data(dict(odict1), version=2, types=True)
+    # Unsortable containers fall back to sorting by their string repr
+    assert ub.hash_data({1: 'a', 'b': 2}, version=2) == ub.hash_data({'b': 2, 1: 'a'}, version=2)
+    assert ub.hash_data({1, 'b'}, version=2) == ub.hash_data({'b', 1}, version=2)
+    # Tuples and lists are hashed the same way
+    assert ub.hash_data([1, (2, 3)], version=2) == ub.hash_data((1, [2, 3]), version=2)
+    # Registered extensions are used for other types
+    assert ub.hash_data([uuid.UUID(int=0)], version=2) != ub.hash_data([uuid.UUID(int=1)], version=2)
+    with pytest.raises(TypeError):
+        ub.hash_data([object()], version=2)
+
+
+def test_hash_data_version2_batching():
+    # The result must not depend on how the buffer is flushed
+    big = b'x' * (ub.util_hash._V2_BATCH_SIZE + 3)
+    data = [list(range(10000)), big, ['y'] * 10000, big]
+    got = ub.hash_data(data, version=2)
+    want_bytes = b''.join(_hashable_sequence(data, version=2))
+    import hashlib
+    assert got == hashlib.sha512(want_bytes).hexdigest()
+
+
 def test_compatible_hash_bases():
     """
     Ubelt ~1.2.3 has a ~bug~ incompatibility with non-hex hash bases. Depending
@@ -0,0 +1,359 @@
+import ubelt as ub
+import pytest
+
+
+def _write_memoize_script(dpath, body):
+    script_fpath = dpath / 'script.py'
+    script_fpath.write_text(ub.codeblock(
+        '''
+        import sys
+        import ubelt as ub
+        cache_dpath, counter_fpath = sys.argv[1:3]
+
+        @ub.memoize(persist=True, dpath=cache_dpath)
+        def compute(x, items):
+            with open(counter_fpath, 'a') as file:
+                file.write('x')
+            return {BODY}
+
+        print(compute(3, [1, 2]))
+        ''').replace('{BODY}', body))
+    return script_fpath
+
+
+def test_memoize_persist_across_processes():
+    import os
+    import sys
+    dpath = ub.Path.appdir('ubelt/tests/test-memoize-persist').delete().ensuredir()
+    cache_dpath = dpath / 'cache'
+    counter_fpath = dpath / 'counter.txt'
+    counter_fpath.write_text('')
+    script_fpath = _write_memoize_script(dpath, 'x + sum(items)')
+    command = [sys.executable, script_fpath, cache_dpath, counter_fpath]
+    # Ensure this version of ubelt is importable in the subprocess
+    env = os.environ.copy()
+    env['PYTHONPATH'] = os.pathsep.join([
+        os.path.dirname(os.path.dirname(ub.__file__)),
+        env.get('PYTHONPATH', '')])
+    for _ in range(2):
+        info = ub.cmd(command, check=True, env=env)
+        assert info['out'].strip() == '6'
+    # The second process loaded the result from disk
+    assert counter_fpath.read_text() == 'x'
+    # Changing the source of the function invalidates the results
+    _write_memoize_script(dpath, 'x * sum(items)')
+    info = ub.cmd(command, check=True, env=env)
+    assert info['out'].strip() == '9'
+    assert counter_fpath.read_text() == 'xx'
+
+
+def test_memoize_persist_depends_and_errors():
+    dpath = ub.Path.appdir('ubelt/tests/test-memoize-persist-depends').delete()
+    calls = []
+
+    def func(x):
+        calls.append(x)
+        return [x]
+
+    memo1 = ub.memoize(func, persist=True, dpath=dpath, depends='v1')
+    memo2 = ub.memoize(func, persist=True, dpath=dpath, depends='v2')
+    assert memo1(1) == [1]
+    assert memo2(1) == [1]
+    assert calls == [1, 1]
+    memo1b = ub.memoize(func, persist=True, dpath=dpath, depends='v1')
+    assert memo1b(1) == [1]
+    assert calls == [1, 1]
+
+    # Arguments that cannot be hashed stably cannot be persisted
+    with pytest.raises(TypeError):
+        memo1(object())
+
+
+def test_memoize_ttl():
+    import time
+    calls = []
+
+    @ub.memoize(ttl=0.05)
+    def func(x):
+        calls.append(x)
+        return x
+
+    func(1)
+    func(1)
+    assert calls == [1]
+    time.sleep(0.1)
+    func(1)
+    assert calls == [1, 1]
+    info = func.cache_info()
+    assert info['hits'] == 1 and info['misses'] == 2
+    assert info['evictions'] == 1 and info['currsize'] == 1
+
+
+def test_memoize_maxbytes_unhashable_args():
+    @ub.memoize(maxbytes=10000)
+    def make(items, size):
+        return b'x' * size
+
+    make([1], 4000)
+    make([2], 4000)
+    assert make.cache_info()['currsize'] == 2
+    # The oldest result is evicted to fit the new one
+    make([3], 4000)
+    info = make.cache_info()
+    assert info['currsize'] == 2
+    assert info['evictions'] == 1
+    assert info['nbytes'] <= 10000
+    make([3], 4000)
+    assert make.cache_info()['hits'] == 1
+    # A result larger than the limit is not kept
+    make([4], 20000)
+    assert make.cache_info()['currsize'] == 0
+    make.cache_clear()
+    assert make.cache_info() == {
+        'hits': 0, 'misses': 0, 'evictions': 0, 'maxsize': None,
+        'currsize': 0, 'nbytes': 0}
+    # Clearing the cache dict directly is also handled
+    make([1], 4000)
+    make.cache.clear()
+    make([1], 4000)
+    assert make.cache_info()['nbytes'] < 10000
+
+
+def test_memoize_method_bounded():
+    class Foo:
+        def __init__(self):
+            self.calls = 0
+
+        @ub.memoize_method(maxsize=2, ttl=60)
+        def compute(self, x):
+            self.calls += 1
+            return x
+
+    foo1 = Foo()
+    foo2 = Foo()
+    for x in [1, 2, 3, 1]:
+        foo1.compute(x)
+    foo2.compute(1)
+    assert foo1.calls == 4
+    assert foo1.compute.cache_info()['evictions'] == 2
+    assert foo2.compute.cache_info()['currsize'] == 1
+    foo1.compute.cache_clear()
+    assert foo1.compute.cache_info()['currsize'] == 0
+
+
+def test_memoize_method_unbounded_dict():
+    """
+    Without options the per-instance cache is a plain dict, as in the
+    original implementation and like the ``cache`` of :func:`memoize`.
+    """
+    class Foo:
+        @ub.memoize_method
+        def compute(self, x):
+            return x * 2
+
+        @ub.memoize_method(identity=True)
+        def compute_ident(self, x):
+            return len(x)
+
+    foo = Foo()
+    foo.compute(1)
+    foo.compute(2)
+    foo.compute(1)
+    cache = foo._cache__compute
+    assert isinstance(cache, dict)
+    assert len(cache) == 2
+    assert sorted(cache.values()) == [2, 4]
+    info = foo.compute.cache_info()
+    assert info['hits'] == 1 and info['misses'] == 2
+    assert foo.compute.cache is cache
+    foo.compute.cache_clear()
+    assert len(cache) == 0
+    assert foo.compute(3) == 6 and len(cache) == 1
+
+    assert foo.compute_ident([1, 2]) == 2
+    assert isinstance(foo._cache__compute_ident, dict)
+
+    # With options the cache is bounded
+    class Bar:
+        @ub.memoize_method(maxsize=2)
+        def compute(self, x):
+            return x
+
+    bar = Bar()
+    bar.compute(1)
+    assert not isinstance(bar._cache__compute, dict)
+
+    # A zero bound is a bound, and caches nothing (like memoize)
+    class Baz:
+        def __init__(self):
+            self.calls = 0
+
+        @ub.memoize_method(maxsize=0)
+        def compute(self, x):
+            self.calls += 1
+            return x
+
+    baz = Baz()
+    baz.compute(1)
+    baz.compute(1)
+    assert baz.calls == 2
+    info = baz.compute.cache_info()
+    assert info['maxsize'] == 0 and info['currsize'] == 0
+
+
+def test_memoize_mixed_args_key():
+    calls = []
+
+    @ub.memoize
+    def func(big, items, scale=1):
+        calls.append(1)
+        return (len(big) + sum(items)) * scale
+
+    big = tuple(range(1000))
+    assert func(big, [1, 2]) == 1003
+    assert func(big, [1, 2]) == 1003
+    assert func(big, [1, 3]) == 1004
+    assert func(big, [1, 3], scale=[2][0]) == 2008
+    assert func(big, items=[1, 2]) == 1003
+    assert len(calls) == 4
+    # The hash of an unhashable argument does not collide with a string
+    key = ub.util_memoize._make_signature_key((big, [1, 2]), {})
+    hashed_text = key[0][1][1]
+    assert isinstance(hashed_text, str)
+    with pytest.raises(TypeError):
+        func(big, hashed_text)
+
+
+def test_memoize_identity():
+    np = pytest.importorskip('numpy')
+    import gc
+    calls = []
+
+    @ub.memoize(identity=True)
+    def total(arr, items):
+        calls.append(1)
+        return arr.sum() + sum(items)
+
+    arr1 = np.ones(1000)
+    arr2 = np.ones(1000)
+    assert total(arr1, [1]) == 1001
+    assert total(arr1, [1]) == 1001
+    assert len(calls) == 1
+    # Equal content but a different object is a different key
+    assert total(arr2, [1]) == 1001
+    assert len(calls) == 2
+    # Results are removed when the argument is garbage collected
+    del arr2
+    gc.collect()
+    assert total.cache_info()['currsize'] == 1
+    # Lists do not support weak references and are hashed instead
+    assert total(arr1, [1]) == 1001
+    assert len(calls) == 2
+
+    class Foo:
+        @ub.memoize_method(identity=True)
+        def norm(self, arr):
+            calls.append(1)
+            return float(np.sqrt((arr ** 2).sum()))
+
+    foo = Foo()
+    foo.norm(arr1)
+    foo.norm(arr1)
+    assert len(calls) == 3
+
+
+def test_memoize_threadsafe_single_flight():
+    import threading
+    import time
+    calls = []
+    barrier = threading.Barrier(8)
+
+    @ub.memoize(threadsafe=True)
+    def slow(x):
+        calls.append(x)
+        time.sleep(0.05)
+        return [x]
+
+    def worker(x):
+        barrier.wait()
+        return slow(x)
+
+    pool = ub.JobPool(mode='thread', max_workers=8)
+    for i in range(8):
+        pool.submit(worker, i % 2)
+    results = [job.result() for job in pool.as_completed()]
+    assert sorted(calls) == [0, 1]
+    # Every caller for a key gets the same result object
+    assert len({id(r) for r in results}) == 2
+    info = slow.cache_info()
+    assert info['currsize'] == 2
+
+
+def test_memoize_threadsafe_error():
+    import threading
+    import time
+    calls = []
+    barrier = threading.Barrier(4)
+
+    @ub.memoize(threadsafe=True, maxsize=4)
+    def fail(x):
+        calls.append(x)
+        time.sleep(0.05)
+        raise ValueError(x)
+
+    def worker():
+        barrier.wait()
+        return fail(1)
+
+    pool = ub.JobPool(mode='thread', max_workers=4)
+    for _ in range(4):
+        pool.submit(worker)
+    errors = []
+    for job in pool.as_completed():
+        with pytest.raises(ValueError):
+            job.result()
+        errors.append(job)
+    assert len(errors) == 4
+    assert calls == [1]
+    # Failures are not cached, so the next call tries again
+    with pytest.raises(ValueError):
+        fail(1)
+    assert calls == [1, 1]
+
+
+def test_memoize_threadsafe_recursive():
+    @ub.memoize(threadsafe=True, maxsize=100)
+    def fib(n):
+        return n if n < 2 else fib(n - 1) + fib(n - 2)
+    assert fib(50) == 12586269025
+
+
+def test_memoize_method_threadsafe():
+    import threading
+    import time
+    calls = []
+
+    class Foo:
+        def __init__(self, name):
+            self.name = name
+
+        @ub.memoize_method(threadsafe=True)
+        def describe(self, x):
+            calls.append((self.name, x))
+            time.sleep(0.05)
+            return (self.name, x)
+
+    foos = [Foo('a'), Foo('b')]
+    barrier = threading.Barrier(8)
+
+    def worker(foo):
+        barrier.wait()
+        return foo.describe(1)
+
+    pool = ub.JobPool(mode='thread', max_workers=8)
+    for i in range(8):
+        pool.submit(worker, foos[i % 2])
+    results = sorted(job.result() for job in pool.as_completed())
+    assert results == [('a', 1)] * 4 + [('b', 1)] * 4
+    # Each instance computes its own result once
+    assert sorted(calls) == [('a', 1), ('b', 1)]
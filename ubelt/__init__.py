@@ -152,10 +152,10 @@ __deprecated__ = [
 
 
 from ubelt.util_arg import (argflag, argval,)
-from ubelt.util_cache import (CacheStamp, Cacher,)
+from ubelt.util_cache import (CacheDir, CacheStamp, Cacher,)
 from ubelt.util_colors import (NO_COLOR, color_text, highlight_code,)
 from ubelt.util_const import (NoParam,)
-from ubelt.util_cmd import (cmd,)
+from ubelt.util_cmd import (acmd, cmd, cmd_many,)
 from ubelt.util_dict import (AutoDict, AutoOrderedDict, SetDict, UDict, ddict,
                              dict_diff, dict_hist, dict_isect, dict_subset,
                              dict_union, dzip, find_duplicates, group_items,
@@ -173,7 +173,8 @@ from ubelt.util_links import (symlink,)
 from ubelt.util_list import (allsame, argmax, argmin, argsort, argunique,
                              boolmask, chunks, compress, flatten, iter_window,
                              iterable, peek, take, unique, unique_flags,)
-from ubelt.util_hash import (hash_data, hash_file,)
+from ubelt.util_hash import (Hasher, hash_data, hash_file, hash_file_tree,
+                             hash_files,)
 from ubelt.util_import import (import_module_from_name,
                                import_module_from_path, modname_to_modpath,
                                modpath_to_modname, split_modpath,)
@@ -192,35 +193,36 @@ from ubelt.util_zip import (split_archive, zopen,)
 from ubelt.orderedset import (OrderedSet, oset,)
 from ubelt.progiter import (ProgIter,)
 
-__all__ = ['AutoDict', 'AutoOrderedDict', 'CacheStamp', 'Cacher',
+__all__ = ['AutoDict', 'AutoOrderedDict', 'CacheDir', 'CacheStamp', 'Cacher',
            'CaptureStdout', 'CaptureStream', 'ChDir', 'DARWIN',
-           'DownloadManager', 'Executor', 'FormatterExtensions',
+           'DownloadManager', 'Executor', 'FormatterExtensions', 'Hasher',
            'IndexableWalker', 'JobPool', 'LINUX', 'NO_COLOR', 'NiceRepr',
            'NoParam', 'OrderedSet', 'POSIX', 'Path', 'ProgIter',
            'ReprExtensions', 'SetDict', 'TeeStringIO', 'TempDir', 'Timer',
-           'UDict', 'WIN32', 'allsame', 'argflag', 'argmax', 'argmin',
+           'UDict', 'WIN32', 'acmd', 'allsame', 'argflag', 'argmax', 'argmin',
            'argsort', 'argunique', 'argval', 'augpath', 'boolmask', 'chunks',
-           'cmd', 'codeblock', 'color_text', 'compatible', 'compress', 'ddict',
-           'delete', 'dict_diff', 'dict_hist', 'dict_isect', 'dict_subset',
-           'dict_union', 'download', 'dzip', 'ensure_app_cache_dir',
-           'ensure_app_config_dir', 'ensure_app_data_dir', 'ensure_unicode',
-           'ensuredir', 'expandpath', 'find_duplicates', 'find_exe',
-           'find_path', 'flatten', 'get_app_cache_dir', 'get_app_config_dir',
-           'get_app_data_dir', 'grabdata', 'group_items', 'hash_data',
-           'hash_file', 'highlight_code', 'hzcat', 'identity',
-           'import_module_from_name', 'import_module_from_path', 'indent',
-           'indexable_allclose', 'inject_method', 'invert_dict', 'iter_window',
-           'iterable', 'map_keys', 'map_vals', 'map_values', 'memoize',
-           'memoize_method', 'memoize_property', 'modname_to_modpath',
-           'modpath_to_modname', 'named_product', 'odict', 'orderedset',
-           'oset', 'paragraph', 'peek', 'platform_cache_dir',
-           'platform_config_dir', 'platform_data_dir', 'progiter', 'readfrom',
-           'repr2', 'schedule_deprecation', 'sdict', 'shrinkuser',
-           'sorted_keys', 'sorted_vals', 'sorted_values', 'split_archive',
-           'split_modpath', 'symlink', 'take', 'timeparse', 'timestamp',
-           'touch', 'udict', 'unique', 'unique_flags', 'urepr', 'userhome',
-           'util_arg', 'util_cache', 'util_cmd', 'util_colors', 'util_const',
-           'util_deprecate', 'util_dict', 'util_download',
+           'cmd', 'cmd_many', 'codeblock', 'color_text', 'compatible',
+           'compress', 'ddict', 'delete', 'dict_diff', 'dict_hist',
+           'dict_isect', 'dict_subset', 'dict_union', 'download', 'dzip',
+           'ensure_app_cache_dir', 'ensure_app_config_dir',
+           'ensure_app_data_dir', 'ensure_unicode', 'ensuredir', 'expandpath',
+           'find_duplicates', 'find_exe', 'find_path', 'flatten',
+           'get_app_cache_dir', 'get_app_config_dir', 'get_app_data_dir',
+           'grabdata', 'group_items', 'hash_data', 'hash_file',
+           'hash_file_tree', 'hash_files', 'highlight_code', 'hzcat',
+           'identity', 'import_module_from_name', 'import_module_from_path',
+           'indent', 'indexable_allclose', 'inject_method', 'invert_dict',
+           'iter_window', 'iterable', 'map_keys', 'map_vals', 'map_values',
+           'memoize', 'memoize_method', 'memoize_property',
+           'modname_to_modpath', 'modpath_to_modname', 'named_product',
+           'odict', 'orderedset', 'oset', 'paragraph', 'peek',
+           'platform_cache_dir', 'platform_config_dir', 'platform_data_dir',
+           'progiter', 'readfrom', 'repr2', 'schedule_deprecation', 'sdict',
+           'shrinkuser', 'sorted_keys', 'sorted_vals', 'sorted_values',
+           'split_archive', 'split_modpath', 'symlink', 'take', 'timeparse',
+           'timestamp', 'touch', 'udict', 'unique', 'unique_flags', 'urepr',
+           'userhome', 'util_arg', 'util_cache', 'util_cmd', 'util_colors',
+           'util_const', 'util_deprecate', 'util_dict', 'util_download',
            'util_download_manager', 'util_format', 'util_func', 'util_futures',
            'util_hash', 'util_import', 'util_indexable', 'util_io',
            'util_links', 'util_list', 'util_memoize', 'util_mixins',
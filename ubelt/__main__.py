@@ -2,12 +2,22 @@
 """
 Runs the xdoctest CLI interface for ubelt
 
+The ``cache-gc`` subcommand instead removes old files from a cache directory
+(see :class:`ubelt.util_cache.CacheDir`).
+
 CommandLine:
     python -m ubelt list
     python -m ubelt all
     python -m ubelt zero
+    python -m ubelt cache-gc --help
+    python -m ubelt cache-gc --max-bytes 10GB --max-age 30d
 """
 
 if __name__ == '__main__':
-    import xdoctest  # type: ignore
-    xdoctest.doctest_module('ubelt')
+    import sys
+    if sys.argv[1:2] == ['cache-gc']:
+        from ubelt.util_cache import _cache_gc_cli
+        sys.exit(_cache_gc_cli(sys.argv[2:]))
+    else:
+        import xdoctest  # type: ignore
+        xdoctest.doctest_module('ubelt')
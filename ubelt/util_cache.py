@@ -116,7 +116,1151 @@ RelatedWork:
     https://github.com/shaypal5/cachier
 """
 import os
-from os.path import join, normpath, basename, exists
+from os.path import join, normpath, basename, dirname, exists
+
+
+class _CacherBackends(object):
+    """
+    A registry of the serialization backends that :class:`Cacher` can use to
+    write data to and read data from disk.
+
+    A backend is a pair of functions ``dump(fpath, data, cacher)`` and
+    ``load(fpath, cacher)``, where ``cacher`` is the :class:`Cacher` instance
+    that is requesting the operation (e.g. to access ``cacher.protocol``).
+
+    The builtin backends are:
+
+        * ``'pickle'`` - the default, uses :func:`pickle.dump`.
+
+        * ``'json'`` - uses :func:`json.dump`.
+
+        * ``'marshal'`` - uses :func:`marshal.dump`, which is fast, but only
+          supports builtin types and is specific to the Python version.
+
+        * ``'numpy'`` - writes a single array with :func:`numpy.save` or a
+          dictionary of arrays with :func:`numpy.savez`. A single array is
+          loaded as a read-only memory map, so loading is nearly instant
+          regardless of the size of the array.
+
+        * ``'pickle5'`` - uses pickle protocol 5 and writes out-of-band
+          buffers (e.g. the memory of ndarrays) into a ``.buffers`` side
+          file, which is memory mapped when loading.
+
+    Attributes:
+        backends (Dict[str, Dict[str, Callable | None]]):
+            maps a backend name to its "load", "dump", "sidecars",
+            "load_file", and "dump_file" functions.
+
+        ext_to_backend (Dict[str, str]):
+            maps a file extension to the backend it implies when the
+            ``backend`` is ``'auto'``.
+
+    Example:
+        >>> import ubelt as ub
+        >>> def dump(fpath, data, cacher):
+        >>>     ub.Path(fpath).write_text(str(data))
+        >>> def load(fpath, cacher):
+        >>>     return ub.Path(fpath).read_text()
+        >>> ub.Cacher.backends.register('text', load, dump, exts=['.txt'])
+        >>> cacher = ub.Cacher('demo_text_backend', depends=[1], ext='.txt')
+        >>> assert cacher.backend == 'text'
+        >>> cacher.save(123)
+        >>> assert cacher.load() == '123'
+        >>> cacher.clear()
+    """
+
+    def __init__(self):
+        self.backends = {}  # type: Dict[str, Dict[str, Callable | None]]
+        self.ext_to_backend = {}  # type: Dict[str, str]
+
+    def available(self):
+        """
+        The names of the registered backends
+
+        Returns:
+            List[str]
+        """
+        return list(self.backends.keys())
+
+    def __contains__(self, name):
+        """
+        Args:
+            name (str): name of the backend to check
+
+        Returns:
+            bool: if the backend is registered
+        """
+        return name in self.backends
+
+    def register(self, name, load, dump, exts=None, sidecars=None,
+                 load_file=None, dump_file=None):
+        """
+        Registers a new backend or overwrites an existing one.
+
+        Args:
+            name (str):
+                The name used to select the backend via the ``backend``
+                argument of :class:`Cacher`.
+
+            load (Callable[[str, Cacher], object]):
+                reads the data stored at a path
+
+            dump (Callable[[str, object, Cacher], Any]):
+                writes data to a path
+
+            exts (List[str] | None):
+                File extensions that select this backend when
+                :class:`Cacher` is given ``backend='auto'``.
+
+            sidecars (Callable[[str], List[str]] | None):
+                If the backend writes files other than the given path, this
+                should return their paths, so they can be removed when the
+                cache is cleared.
+
+            load_file (Callable[[IO[bytes], Cacher], object] | None):
+                Like ``load``, but reads from an open binary file object.
+                This is required to use the backend with compression.
+
+            dump_file (Callable[[IO[bytes], object, Cacher], Any] | None):
+                Like ``dump``, but writes to an open binary file object.
+                This is required to use the backend with compression.
+        """
+        self.backends[name] = {
+            'load': load,
+            'dump': dump,
+            'sidecars': sidecars,
+            'load_file': load_file,
+            'dump_file': dump_file,
+        }
+        for ext in (exts or []):
+            self.ext_to_backend[ext] = name
+
+    def lookup(self, name):
+        """
+        Args:
+            name (str): the name of a registered backend
+
+        Returns:
+            Dict[str, Callable | None]: the "load", "dump", "sidecars",
+                "load_file", and "dump_file" functions of the backend
+        """
+        try:
+            return self.backends[name]
+        except KeyError:
+            raise KeyError('unknown cacher backend: {}. Available: {}'.format(
+                name, self.available()))
+
+    def _rectify(self, backend, ext):
+        """
+        Determine the backend name for the arguments given to Cacher
+
+        Args:
+            backend (str): a backend name or 'auto'
+            ext (str): the cache file extension
+
+        Returns:
+            str
+        """
+        if backend == 'auto':
+            backend = self.ext_to_backend.get(ext, 'pickle')
+        elif backend not in self.backends:
+            raise ValueError('unknown cacher backend: {}. Available: {}'.format(
+                backend, self.available()))
+        return backend
+
+
+def _pickle_load(fpath, cacher):
+    with open(fpath, 'rb') as file_:
+        data = _pickle_load_file(file_, cacher)
+    return data
+
+
+def _pickle_dump(fpath, data, cacher):
+    with open(fpath, 'wb') as file_:
+        _pickle_dump_file(file_, data, cacher)
+
+
+def _pickle_load_file(file_, cacher):
+    import pickle
+    return pickle.load(file_)
+
+
+def _pickle_dump_file(file_, data, cacher):
+    import pickle
+    pickle.dump(data, file_, protocol=cacher.protocol)
+
+
+def _json_load(fpath, cacher):
+    import json
+    with open(fpath, 'r') as file_:
+        data = json.load(file_)
+    return data
+
+
+def _json_dump(fpath, data, cacher):
+    import json
+    with open(fpath, 'w') as file_:
+        json.dump(data, file_)
+
+
+def _json_load_file(file_, cacher):
+    import io
+    import json
+    return json.load(io.TextIOWrapper(file_, encoding='utf8'))
+
+
+def _json_dump_file(file_, data, cacher):
+    import io
+    import json
+    text_file = io.TextIOWrapper(file_, encoding='utf8')
+    json.dump(data, text_file)
+    # Detach so closing the wrapper does not close the underlying stream
+    text_file.detach()
+
+
+def _marshal_load(fpath, cacher):
+    with open(fpath, 'rb') as file_:
+        data = _marshal_load_file(file_, cacher)
+    return data
+
+
+def _marshal_dump(fpath, data, cacher):
+    with open(fpath, 'wb') as file_:
+        _marshal_dump_file(file_, data, cacher)
+
+
+def _marshal_load_file(file_, cacher):
+    import marshal
+    # marshal.load requires a real file, so read the stream into memory
+    return marshal.loads(file_.read())
+
+
+def _marshal_dump_file(file_, data, cacher):
+    import marshal
+    file_.write(marshal.dumps(data))
+
+
+def _numpy_load(fpath, cacher):
+    """
+    Example:
+        >>> # xdoctest: +REQUIRES(module:numpy)
+        >>> import ubelt as ub
+        >>> import numpy as np
+        >>> dpath = ub.Path.appdir('ubelt/tests/util_cache/numpy').ensuredir()
+        >>> cacher = ub.Cacher('arr', depends=[1], dpath=dpath, ext='.npy',
+        >>>                    backend='numpy')
+        >>> cacher.save(np.arange(10))
+        >>> data = cacher.load()
+        >>> assert isinstance(data, np.memmap)
+        >>> assert data.sum() == 45
+        >>> cacher.save({'a': np.arange(3), 'b': np.ones(2)})
+        >>> data = cacher.load()
+        >>> assert sorted(data.keys()) == ['a', 'b']
+        >>> cacher.clear()
+    """
+    import numpy as np
+    data = np.load(fpath, mmap_mode='r', allow_pickle=False)
+    if hasattr(data, 'files'):
+        # An npz file cannot be memory mapped, so read each array
+        with data:
+            data = {key: data[key] for key in data.files}
+    return data
+
+
+def _numpy_dump(fpath, data, cacher):
+    with open(fpath, 'wb') as file_:
+        _numpy_dump_file(file_, data, cacher)
+
+
+def _numpy_load_file(file_, cacher):
+    import io
+    import numpy as np
+    # np.load needs to seek, which most decompression streams do not support
+    # efficiently.
+    data = np.load(io.BytesIO(file_.read()), allow_pickle=False)
+    if hasattr(data, 'files'):
+        with data:
+            data = {key: data[key] for key in data.files}
+    return data
+
+
+def _numpy_dump_file(file_, data, cacher):
+    import numpy as np
+    if isinstance(data, dict):
+        np.savez(file_, **data)
+    else:
+        np.save(file_, data, allow_pickle=False)
+
+
+# Out-of-band buffers are aligned to this many bytes in the side file
+_PICKLE5_ALIGN = 64
+
+# The main file and the side file both start with the same token (a hash of
+# the data), so a reader can detect when it opened a main file and a side file
+# from different saves.
+_PICKLE5_TOKEN_SIZE = 16
+_PICKLE5_MAX_ATTEMPTS = 100
+
+
+def _import_pickle5():
+    import pickle
+    if pickle.HIGHEST_PROTOCOL < 5:  # nocover
+        # The backport for older versions of Python
+        import pickle5 as pickle  # type: ignore
+    return pickle
+
+
+def _pickle5_sidecars(fpath):
+    return [fpath + '.buffers']
+
+
+def _pickle5_load(fpath, cacher):
+    """
+    Example:
+        >>> # xdoctest: +REQUIRES(module:numpy)
+        >>> import ubelt as ub
+        >>> import numpy as np
+        >>> dpath = ub.Path.appdir('ubelt/tests/util_cache/pickle5').ensuredir()
+        >>> cacher = ub.Cacher('arrs', depends=[1], dpath=dpath,
+        >>>                    backend='pickle5')
+        >>> data = {'x': np.arange(10), 'y': [np.ones(3), 'text']}
+        >>> cacher.save(data)
+        >>> assert ub.Path(cacher.fpath + '.buffers').exists()
+        >>> got = cacher.load()
+        >>> assert got['x'].sum() == 45 and got['y'][1] == 'text'
+        >>> assert not got['x'].flags['WRITEABLE'], 'should be memory mapped'
+        >>> cacher.clear()
+        >>> assert not ub.Path(cacher.fpath + '.buffers').exists()
+    """
+    import time
+    pickle = _import_pickle5()
+    for _ in range(_PICKLE5_MAX_ATTEMPTS):
+        with open(fpath, 'rb') as file_:
+            token, spans = pickle.load(file_)
+            if all(size == 0 for _, size in spans):
+                # Empty buffers do not need the side file (which is empty
+                # and cannot be memory mapped).
+                buffers = [memoryview(b'')] * len(spans)
+            else:
+                buffers = _pickle5_map_buffers(fpath, token, spans)
+                if buffers is None:
+                    # A concurrent save replaced the side file after we
+                    # opened the main file. It replaces the main file next.
+                    time.sleep(0.001)
+                    continue
+            return pickle.load(file_, buffers=buffers)
+    raise IOError('The buffers of {} kept changing while loading'.format(
+        fpath))
+
+
+def _pickle5_map_buffers(fpath, token, spans):
+    """
+    Returns:
+        List[memoryview] | None:
+            the out-of-band buffers or None if the side file is from a
+            different save than the main file.
+    """
+    import mmap
+    with open(fpath + '.buffers', 'rb') as buf_file:
+        if buf_file.read(_PICKLE5_TOKEN_SIZE) != token:
+            return None
+        mem = mmap.mmap(buf_file.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mem)
+    return [view[start:start + size] for start, size in spans]
+
+
+def _pickle5_dump(fpath, data, cacher):
+    pickle = _import_pickle5()
+    pickle_buffers = []
+    payload = pickle.dumps(data, protocol=5,
+                           buffer_callback=pickle_buffers.append)
+    # The token only has to differ between saves of different data, and
+    # hashing (instead of a random token) keeps identical saves identical
+    # for Cacher(dedup=True).
+    import hashlib
+    hasher = hashlib.blake2b(payload, digest_size=_PICKLE5_TOKEN_SIZE)
+    for pickle_buffer in pickle_buffers:
+        with pickle_buffer.raw() as raw:
+            hasher.update(raw)
+    token = hasher.digest()
+    # Write the out-of-band buffers to the side file, and remember where
+    # each one starts and how large it is.
+    spans = []
+    buf_fpath = fpath + '.buffers'
+    with open(buf_fpath, 'wb') as buf_file:
+        offset = 0
+        for pickle_buffer in pickle_buffers:
+            with pickle_buffer.raw() as raw:
+                if raw.nbytes == 0:
+                    spans.append((0, 0))
+                    continue
+                if offset == 0:
+                    buf_file.write(token)
+                    offset = _PICKLE5_TOKEN_SIZE
+                padding = -offset % _PICKLE5_ALIGN
+                buf_file.write(b'\x00' * padding)
+                offset += padding
+                buf_file.write(raw)
+                spans.append((offset, raw.nbytes))
+                offset += raw.nbytes
+    with open(fpath, 'wb') as file_:
+        pickle.dump((token, spans), file_, protocol=5)
+        file_.write(payload)
+
+
+def _open_zlib(file_, mode):
+    import gzip
+    # The gzip container holds a zlib deflate stream and has a magic header.
+    # Use the zlib default level, because gzip defaults to the slowest one.
+    # The header would record the file name and time, so clear them to make
+    # the output depend only on the data (e.g. for Cacher(dedup=True)).
+    return gzip.GzipFile(filename='', fileobj=file_, mode=mode,
+                         compresslevel=6, mtime=0)
+
+
+def _open_lzma(file_, mode):
+    import lzma
+    return lzma.LZMAFile(file_, mode=mode)
+
+
+def _open_bz2(file_, mode):
+    import bz2
+    return bz2.BZ2File(file_, mode=mode)
+
+
+def _open_zstd(file_, mode):
+    import zstandard  # type: ignore
+    if mode == 'wb':
+        return zstandard.ZstdCompressor().stream_writer(file_, closefd=False)
+    else:
+        return zstandard.ZstdDecompressor().stream_reader(file_, closefd=False)
+
+
+def _open_lz4(file_, mode):
+    import lz4.frame  # type: ignore
+    return lz4.frame.LZ4FrameFile(file_, mode=mode)
+
+
+# Maps the name of each compression codec to a function that wraps a binary
+# file object in a compressing (mode "wb") or decompressing (mode "rb") stream.
+_CACHER_CODECS = {
+    'zlib': _open_zlib,
+    'lzma': _open_lzma,
+    'bz2': _open_bz2,
+    'zstd': _open_zstd,
+    'lz4': _open_lz4,
+}
+
+# Header of compressed cache files. It is followed by the name of the codec and
+# a newline, and then the compressed payload. Uncompressed files are written
+# without a header.
+_COMPRESS_MAGIC = b'UBELT_COMPRESSED:'
+
+
+def _rectify_compress(compress):
+    """
+    Args:
+        compress (str | bool | None): a codec name, or True for zlib
+
+    Returns:
+        str | None: the name of the codec or None for no compression
+
+    Example:
+        >>> from ubelt.util_cache import _rectify_compress
+        >>> assert _rectify_compress(None) is None
+        >>> assert _rectify_compress(False) is None
+        >>> assert _rectify_compress(True) == 'zlib'
+        >>> assert _rectify_compress('lzma') == 'lzma'
+        >>> import pytest
+        >>> with pytest.raises(KeyError):
+        >>>     _rectify_compress('rar')
+    """
+    if compress is None or compress is False:
+        return None
+    if compress is True:
+        return 'zlib'
+    if compress not in _CACHER_CODECS:
+        raise KeyError('unknown compression codec: {}. Available: {}'.format(
+            compress, list(_CACHER_CODECS)))
+    return compress
+
+
+def _codec_header(codec):
+    """
+    Args:
+        codec (str): the name of the codec
+
+    Returns:
+        bytes: the header written before data compressed with the codec
+    """
+    return _COMPRESS_MAGIC + codec.encode('ascii') + b'\n'
+
+
+def _parse_codec_header(header):
+    r"""
+    Read the codec recorded at the start of a cache payload.
+
+    Args:
+        header (bytes): the first bytes of the payload (at least 64 of them,
+            unless the payload is shorter)
+
+    Returns:
+        Tuple[str | None, int]:
+            the name of the codec (or None if it is not compressed) and the
+            size of the header to skip.
+
+    Example:
+        >>> from ubelt.util_cache import _parse_codec_header
+        >>> _parse_codec_header(b'UBELT_COMPRESSED:zlib\npayload')
+        ('zlib', 22)
+        >>> # Data without the header is not compressed
+        >>> _parse_codec_header(b'\x80\x04 a plain pickle')
+        (None, 0)
+    """
+    if header.startswith(_COMPRESS_MAGIC):
+        start = len(_COMPRESS_MAGIC)
+        stop = header.find(b'\n', start)
+        if stop > 0:
+            codec = header[start:stop].decode('ascii', 'replace')
+            if codec not in _CACHER_CODECS:
+                raise IOError('Unknown compression codec {!r}'.format(codec))
+            return codec, stop + 1
+    return None, 0
+
+
+def _detect_codec(fpath):
+    """
+    Determine which codec compressed a file from its header.
+
+    Args:
+        fpath (str | PathLike): path to the file
+
+    Returns:
+        str | None: the name of the codec or None if it is not compressed
+    """
+    with open(fpath, 'rb') as file_:
+        header = file_.read(64)
+    return _parse_codec_header(header)[0]
+
+
+def _atomic_append_text(fpath, text):
+    """
+    Append text to a file by writing the combined text to a temporary file and
+    moving it into place, so readers never see a partial write. When several
+    processes append at once, only the text of the last one to finish is
+    kept.
+
+    Args:
+        fpath (str | PathLike): path to the file
+        text (str): text to append
+    """
+    import uuid
+    dpath, fname = os.path.split(fpath)
+    tmp_fpath = join(dpath, '.{}.tmp-{}-{}'.format(
+        fname, os.getpid(), uuid.uuid4().hex[0:8]))
+    try:
+        with open(fpath, 'r') as file_:
+            prev_text = file_.read()
+    except FileNotFoundError:
+        prev_text = ''
+    try:
+        with open(tmp_fpath, 'w') as file_:
+            file_.write(prev_text)
+            file_.write(text)
+        os.replace(tmp_fpath, fpath)
+    finally:
+        if exists(tmp_fpath):
+            os.remove(tmp_fpath)
+
+
+# Header of the pointer files written by Cacher(dedup=True). The rest of the
+# file is the path of the blob relative to the cache directory.
+_BLOB_POINTER_MAGIC = b'UBELT_BLOB_POINTER\n'
+_BLOB_DNAME = 'blobs'
+_BLOB_HASHER = 'sha256'
+
+
+def _read_blob_pointer(fpath):
+    """
+    Determine if a cache file is a pointer to a content-addressed blob.
+
+    Args:
+        fpath (str | PathLike): path to the cache file
+
+    Returns:
+        str | None: the absolute path of the blob, or None if the file is not a
+            pointer.
+    """
+    with open(fpath, 'rb') as file_:
+        header = file_.read(len(_BLOB_POINTER_MAGIC))
+        if header != _BLOB_POINTER_MAGIC:
+            return None
+        rel_fpath = file_.read().decode('utf8')
+    return join(dirname(fpath), rel_fpath)
+
+
+_CACHER_BACKENDS = _CacherBackends()
+_CACHER_BACKENDS.register('pickle', _pickle_load, _pickle_dump, exts=['.pkl'],
+                          load_file=_pickle_load_file,
+                          dump_file=_pickle_dump_file)
+_CACHER_BACKENDS.register('json', _json_load, _json_dump, exts=['.json'],
+                          load_file=_json_load_file,
+                          dump_file=_json_dump_file)
+_CACHER_BACKENDS.register('marshal', _marshal_load, _marshal_dump,
+                          load_file=_marshal_load_file,
+                          dump_file=_marshal_dump_file)
+_CACHER_BACKENDS.register('numpy', _numpy_load, _numpy_dump,
+                          load_file=_numpy_load_file,
+                          dump_file=_numpy_dump_file)
+_CACHER_BACKENDS.register('pickle5', _pickle5_load, _pickle5_dump,
+                          sidecars=_pickle5_sidecars)
+
+
+class _FileLock(object):
+    """
+    An exclusive advisory lock on a file that is shared between processes
+    via :func:`fcntl.flock` (or :func:`msvcrt.locking` on Windows).
+
+    The lock is reentrant within a thread and excludes other threads. Use
+    :func:`_FileLock.coerce` to get the lock object for a path, so all users
+    in a process share the same one.
+
+    Note:
+        The lock is advisory, so it only excludes other processes that also
+        use it. The lock file is never deleted, because that would allow a
+        new process to lock a new file while an old one still holds the old
+        file.
+
+    Example:
+        >>> import ubelt as ub
+        >>> from ubelt.util_cache import _FileLock
+        >>> dpath = ub.Path.appdir('ubelt/tests/util_cache/lock').ensuredir()
+        >>> lock = _FileLock.coerce(dpath / 'demo.lock')
+        >>> assert lock is _FileLock.coerce(dpath / 'demo.lock')
+        >>> with lock:
+        >>>     with lock:
+        >>>         assert lock.count == 2
+        >>> assert lock.count == 0
+    """
+    _instances = {}  # type: Dict[str, _FileLock]
+
+    def __init__(self, fpath):
+        import threading
+        self.fpath = fpath
+        self.count = 0
+        self._fd = None
+        self._thread_lock = threading.RLock()
+
+    @classmethod
+    def coerce(cls, fpath):
+        """
+        Args:
+            fpath (str | PathLike): path to the lock file
+
+        Returns:
+            _FileLock: the lock object for this path in this process
+        """
+        key = os.path.abspath(os.fspath(fpath))
+        # dict.setdefault is atomic, so concurrent threads get the same lock
+        return cls._instances.setdefault(key, cls(key))
+
+    def acquire(self):
+        self._thread_lock.acquire()
+        if self.count == 0:
+            try:
+                fd = os.open(self.fpath, os.O_RDWR | os.O_CREAT)
+                try:
+                    _lock_fd(fd)
+                except BaseException:
+                    os.close(fd)
+                    raise
+            except BaseException:
+                self._thread_lock.release()
+                raise
+            self._fd = fd
+        self.count += 1
+
+    def release(self):
+        self.count -= 1
+        if self.count == 0:
+            fd, self._fd = self._fd, None
+            try:
+                _unlock_fd(fd)
+            finally:
+                os.close(fd)
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, ex_type, ex_value, ex_traceback):
+        self.release()
+
+
+def _lock_fd(fd):
+    """
+    Block until we have an exclusive lock on the file descriptor
+    """
+    try:
+        import fcntl
+    except ImportError:  # nocover
+        import msvcrt
+        while True:
+            try:
+                # LK_LOCK gives up after retrying for about 10 seconds
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            except OSError:
+                continue
+            else:
+                break
+    else:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+
+def _unlock_fd(fd):
+    try:
+        import fcntl
+    except ImportError:  # nocover
+        import msvcrt
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class _CacherMemory(object):
+    """
+    A bounded in-memory LRU cache of loaded :class:`Cacher` data, which is
+    checked before reading the file from disk.
+
+    Entries are keyed by the path of the cache file and are valid as long as
+    the inode, modification time, and size of the file do not change. Data is
+    kept by reference: the same object is returned on every hit, so callers
+    must not modify it.
+
+    The size of an entry is the ``nbytes`` of the data if it has one (e.g. an
+    ndarray) and otherwise the size of the file on disk.
+
+    Attributes:
+        max_bytes (int | None): maximum total size of the entries in memory
+        max_entries (int | None): maximum number of entries in memory
+
+    Example:
+        >>> import ubelt as ub
+        >>> from ubelt.util_cache import _CacherMemory
+        >>> dpath = ub.Path.appdir('ubelt/tests/cacher-memory').delete().ensuredir()
+        >>> memory = _CacherMemory(max_bytes=2 ** 20)
+        >>> cacher = ub.Cacher('data', dpath=dpath, memory=memory, verbose=0)
+        >>> cacher.save([1, 2, 3])
+        >>> data1 = cacher.load()
+        >>> data2 = cacher.load()
+        >>> assert data1 is data2
+        >>> assert memory.info()['hits'] == 2
+        >>> # Writing the file from another process invalidates the entry
+        >>> ub.Cacher('data', dpath=dpath, verbose=0).save([4, 5])
+        >>> assert cacher.load() == [4, 5]
+        >>> assert memory.info()['misses'] == 1
+    """
+
+    def __init__(self, max_bytes=256 * 2 ** 20, max_entries=None):
+        """
+        Args:
+            max_bytes (int | None): maximum total size of the entries in
+                memory. Defaults to 256 MiB.
+            max_entries (int | None): maximum number of entries in memory.
+                Defaults to no limit.
+        """
+        import threading
+        from collections import OrderedDict
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        # Maps fpath to a (stamp, data, nbytes) tuple in LRU order
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _stamp(fpath):
+        """
+        Returns:
+            Tuple[int, int, int] | None:
+                the inode, modification time, and size of the file, or None if
+                it does not exist.
+        """
+        try:
+            stat = os.stat(fpath)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def get(self, fpath):
+        """
+        Lookup the data loaded from a file if the file has not changed.
+
+        Args:
+            fpath (str): path to the cache file
+
+        Returns:
+            Tuple[bool, object, Tuple | None]:
+                A flag indicating if the lookup was a hit, the data (if it
+                was), and the stamp of the file, which should be passed to
+                :func:`_CacherMemory.put` after loading the file on a miss.
+        """
+        stamp = self._stamp(fpath)
+        with self._lock:
+            entry = self._entries.get(fpath, None)
+            if entry is not None:
+                if stamp is not None and entry[0] == stamp:
+                    self._entries.move_to_end(fpath)
+                    self._hits += 1
+                    return True, entry[1], stamp
+                # The file was changed or removed
+                self._pop(fpath)
+            self._misses += 1
+        return False, None, stamp
+
+    def put(self, fpath, data, stamp=None):
+        """
+        Remember the data loaded from (or saved to) a file.
+
+        Args:
+            fpath (str): path to the cache file
+            data (object): the loaded data
+            stamp (Tuple | None): the stamp of the file when it was read.
+                If unspecified, the file is checked now.
+        """
+        if stamp is None:
+            stamp = self._stamp(fpath)
+            if stamp is None:
+                return
+        nbytes = getattr(data, 'nbytes', None)
+        if not isinstance(nbytes, int):
+            nbytes = stamp[2]
+        with self._lock:
+            self._pop(fpath)
+            if self.max_bytes is not None and nbytes > self.max_bytes:
+                return
+            self._entries[fpath] = (stamp, data, nbytes)
+            self._total_bytes += nbytes
+            while self._entries and (
+                    (self.max_bytes is not None and
+                     self._total_bytes > self.max_bytes) or
+                    (self.max_entries is not None and
+                     len(self._entries) > self.max_entries)):
+                _, (_, _, old_nbytes) = self._entries.popitem(last=False)
+                self._total_bytes -= old_nbytes
+
+    def discard(self, fpath):
+        """
+        Forget the data loaded from a file.
+
+        Args:
+            fpath (str): path to the cache file
+        """
+        with self._lock:
+            self._pop(fpath)
+
+    def _pop(self, fpath):
+        entry = self._entries.pop(fpath, None)
+        if entry is not None:
+            self._total_bytes -= entry[2]
+
+    def clear(self):
+        """
+        Forget all entries.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def info(self):
+        """
+        Returns:
+            Dict[str, int]: the number of hits, misses, entries, and bytes
+        """
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+            }
+
+
+_CACHER_MEMORY = _CacherMemory()
+
+
+class _CacherWriter(object):
+    """
+    Writes :class:`Cacher` data in a background thread.
+
+    Writes are done in the order they are submitted. At most ``max_pending``
+    writes can be waiting at a time, after which submitting another one
+    blocks until the oldest is finished. The data (or serialized payload) of
+    each pending write is kept so it can be loaded before it is written.
+
+    Attributes:
+        max_pending (int): maximum number of pending writes
+    """
+
+    def __init__(self, max_pending=8):
+        """
+        Args:
+            max_pending (int): maximum number of pending writes.
+                Defaults to 8.
+        """
+        import threading
+        self.max_pending = max_pending
+        self._lock = threading.RLock()
+        # Maps fpath to the (data, serialized, future) of its latest write
+        self._pending = {}
+        self._executor = None
+        self._slots = None
+
+    def submit(self, fpath, func, data, serialized=False):
+        """
+        Schedule a write.
+
+        Args:
+            fpath (str): path of the cache file that will be written
+            func (Callable[[], Any]): does the write
+            data (object): the data that will be written
+            serialized (bool): if the data is a pre-serialized payload
+
+        Returns:
+            concurrent.futures.Future: resolves when the write is finished
+        """
+        from functools import partial
+        with self._lock:
+            if self._executor is None:
+                import atexit
+                import threading
+                from concurrent.futures import ThreadPoolExecutor
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix='ubelt-cacher-writer')
+                self._slots = threading.BoundedSemaphore(self.max_pending)
+                atexit.register(self.flush)
+        # Block while there are too many pending writes
+        self._slots.acquire()
+        with self._lock:
+            future = self._executor.submit(func)
+            self._pending[fpath] = (data, serialized, future)
+            future.add_done_callback(partial(self._finished, fpath))
+        return future
+
+    def _finished(self, fpath, future):
+        with self._lock:
+            entry = self._pending.get(fpath, None)
+            if entry is not None and entry[2] is future:
+                del self._pending[fpath]
+        self._slots.release()
+
+    def lookup(self, fpath):
+        """
+        Args:
+            fpath (str): path of a cache file
+
+        Returns:
+            Tuple[object, bool, concurrent.futures.Future] | None:
+                the data, if it is serialized, and the future of the latest
+                pending write to the file, if there is one.
+        """
+        if not self._pending:
+            return None
+        with self._lock:
+            return self._pending.get(fpath, None)
+
+    def wait(self, fpath):
+        """
+        Block until the pending write to a file (if any) is finished.
+
+        Args:
+            fpath (str): path of a cache file
+        """
+        import concurrent.futures
+        entry = self.lookup(fpath)
+        if entry is not None:
+            concurrent.futures.wait([entry[2]])
+
+    def flush(self, timeout=None):
+        """
+        Block until all pending writes are finished.
+
+        Args:
+            timeout (float | None): maximum number of seconds to wait
+
+        Returns:
+            bool: True if all writes finished
+        """
+        import concurrent.futures
+        with self._lock:
+            futures = [entry[2] for entry in self._pending.values()]
+        _, not_done = concurrent.futures.wait(futures, timeout=timeout)
+        return not not_done
+
+
+_CACHER_WRITER = _CacherWriter()
+
+
+class _CacherSQLiteStore(object):
+    """
+    Keeps the data of many :class:`Cacher` entries in a single SQLite
+    database in WAL mode.
+
+    Each row is keyed on the name of the file the entry would have without
+    the store and holds the serialized data and metadata.
+
+    Example:
+        >>> import ubelt as ub
+        >>> from ubelt.util_cache import _CacherSQLiteStore
+        >>> dpath = ub.Path.appdir('ubelt/tests/cacher-sqlite-store').delete()
+        >>> store = _CacherSQLiteStore.coerce(dpath)
+        >>> store.put_many([('a_1.pkl', 'a', b'one', ''),
+        >>>                 ('a_2.pkl', 'a', b'two', '')])
+        >>> assert store.get('a_1.pkl') == b'one'
+        >>> assert store.get_many(['a_2.pkl', 'a_3.pkl']) == {'a_2.pkl': b'two'}
+        >>> assert sorted(store.names('a')) == ['a_1.pkl', 'a_2.pkl']
+        >>> store.delete('a_1.pkl')
+        >>> assert not store.contains('a_1.pkl')
+    """
+    FNAME = 'cacher_store.sqlite'
+
+    # Instances are shared between Cacher objects with the same dpath
+    _instances = {}
+
+    def __init__(self, fpath):
+        """
+        Args:
+            fpath (str | PathLike): path to the database file
+        """
+        import threading
+        self.fpath = fpath
+        # sqlite connections cannot be shared between threads
+        self._local = threading.local()
+
+    @classmethod
+    def coerce(cls, dpath):
+        """
+        Args:
+            dpath (str | PathLike): the cache directory
+
+        Returns:
+            _CacherSQLiteStore: the shared store of the directory
+        """
+        fpath = os.path.realpath(join(dpath, cls.FNAME))
+        self = cls._instances.get(fpath, None)
+        if self is None:
+            self = cls._instances.setdefault(fpath, cls(fpath))
+        return self
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            import sqlite3
+            os.makedirs(dirname(self.fpath), exist_ok=True)
+            conn = sqlite3.connect(self.fpath, timeout=60)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            with conn:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS entries (
+                        name TEXT PRIMARY KEY,
+                        fname TEXT NOT NULL,
+                        data BLOB NOT NULL,
+                        meta TEXT NOT NULL
+                    )
+                    """)
+                conn.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS entries_fname
+                    ON entries (fname)
+                    """)
+            self._local.conn = conn
+        return conn
+
+    def contains(self, name):
+        """
+        Args:
+            name (str): the entry name
+
+        Returns:
+            bool
+        """
+        row = self._connect().execute(
+            'SELECT 1 FROM entries WHERE name=?', (name,)).fetchone()
+        return row is not None
+
+    def get(self, name):
+        """
+        Args:
+            name (str): the entry name
+
+        Returns:
+            bytes | None: the serialized data, if the entry exists
+        """
+        row = self._connect().execute(
+            'SELECT data FROM entries WHERE name=?', (name,)).fetchone()
+        return None if row is None else row[0]
+
+    def get_many(self, names, chunksize=500):
+        """
+        Args:
+            names (List[str]): the entry names
+            chunksize (int): maximum number of names per query
+
+        Returns:
+            Dict[str, bytes]: the serialized data of the entries that exist
+        """
+        conn = self._connect()
+        found = {}
+        names = list(names)
+        for start in range(0, len(names), chunksize):
+            chunk = names[start:start + chunksize]
+            query = 'SELECT name, data FROM entries WHERE name IN ({})'.format(
+                ', '.join(['?'] * len(chunk)))
+            found.update(conn.execute(query, chunk).fetchall())
+        return found
+
+    def put_many(self, rows):
+        """
+        Insert or replace entries in a single transaction.
+
+        Args:
+            rows (Iterable[Tuple[str, str, bytes, str]]):
+                the name, fname, serialized data, and metadata of each entry
+        """
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO entries (name, fname, data, meta)
+                VALUES (?, ?, ?, ?)
+                """, rows)
+
+    def delete(self, name):
+        """
+        Args:
+            name (str): the entry name
+        """
+        conn = self._connect()
+        with conn:
+            conn.execute('DELETE FROM entries WHERE name=?', (name,))
+
+    def names(self, fname):
+        """
+        Args:
+            fname (str): the fname of a Cacher
+
+        Returns:
+            List[str]: the names of the entries saved with this fname
+        """
+        rows = self._connect().execute(
+            'SELECT name FROM entries WHERE fname=?', (fname,)).fetchall()
+        return [row[0] for row in rows]
 
 
 class Cacher:
@@ -167,10 +1311,15 @@ class Cacher:
     """
     VERBOSE = 1  # default verbosity
     FORCE_DISABLE = False  # global scope override
+    backends = _CACHER_BACKENDS  # registry of serialization backends
+    memory_tier = _CACHER_MEMORY  # shared in-memory cache of loaded data
+    writer = _CACHER_WRITER  # shared background writer used by save
 
     def __init__(self, fname, depends=None, dpath=None, appname='ubelt',
                  ext='.pkl', meta=None, verbose=None, enabled=True, log=None,
-                 hasher='sha1', protocol=-1, cfgstr=None, backend='auto'):
+                 hasher='sha1', protocol=-1, cfgstr=None, backend='auto',
+                 compress=None, lock=False, budget=None, memory=False,
+                 dedup=False, store='files'):
         """
         Args:
             fname (str):
@@ -218,11 +1367,73 @@ class Cacher:
                 Defaults to the -1 which is the latest protocol.
 
             backend (str):
-                Set to either ``'pickle'`` or ``'json'`` to force backend. Defaults
-                to auto which chooses one based on the extension.
+                The name of the serialization backend. Builtin options are
+                ``'pickle'``, ``'json'``, ``'marshal'``, ``'numpy'``, and
+                ``'pickle5'``, and others can be added via
+                ``Cacher.backends.register``. Defaults to auto which chooses
+                one based on the extension.
 
             cfgstr (str | None):
                 Deprecated in favor of ``depends``.
+
+            compress (str | bool | None):
+                If specified, the data is compressed as it is written.
+                Can be ``'zlib'``, ``'lzma'``, ``'bz2'``, or if the
+                ``zstandard`` or ``lz4`` packages are installed ``'zstd'`` or
+                ``'lz4'``. True means ``'zlib'``. The codec is recorded in a
+                header written before the compressed data and read when
+                loading, so this only affects how new data is saved. Only
+                backends that register ``load_file`` and ``dump_file``
+                functions support compression. Defaults to None, which does
+                not compress.
+
+            lock (bool):
+                If True, :func:`Cacher.ensure` holds an exclusive advisory
+                file lock (see :func:`Cacher.locked`) while it computes and
+                saves missing data. When several processes ensure the same
+                missing data, one computes it while the others wait and then
+                load it. Defaults to False.
+
+            budget (CacheDir | dict | None):
+                Limits on the size, number of entries, and age of the files
+                in ``dpath``. This can be a :class:`CacheDir` (which can be
+                shared between Cacher instances) or a dictionary of its
+                keyword arguments. Saves and loads are recorded, and after
+                each save, entries are evicted if a limit is exceeded.
+                Defaults to None, which does not bound the directory.
+
+            memory (bool | _CacherMemory):
+                If True, loaded data is kept in the in-memory LRU cache
+                ``Cacher.memory_tier``, which is shared by all Cacher
+                instances in the process, and repeated loads return the same
+                object without reading the file as long as its inode,
+                modification time, and size do not change. Saved data is
+                also added to it. The returned data must not be modified. A
+                private cache can be used by passing a ``_CacherMemory``.
+                Defaults to False.
+
+            dedup (bool):
+                If True, the serialized data is stored once in
+                ``{dpath}/blobs/{sha256}{ext}`` and the cache file is a small
+                pointer to it, so entries with identical payloads (e.g. under
+                different ``depends`` or from different applications that
+                share a ``dpath``) use the space of one. Saving data that is
+                already in a blob skips writing it. Any Cacher can load a
+                pointer file. Clearing an entry only removes the pointer; use
+                :func:`Cacher.prune_blobs` to remove blobs that are no longer
+                referenced. A ``budget`` only counts the pointer files.
+                Defaults to False.
+
+            store (str):
+                Where entries are kept. Can be ``'files'``, which writes one
+                file per entry, or ``'sqlite'``, which keeps all entries in
+                ``dpath`` in a single SQLite database (in WAL mode) to avoid
+                creating many small files. The ``'sqlite'`` store supports
+                every backend that can be compressed, and does not support
+                ``budget``, ``memory``, or ``dedup``. Paths returned by
+                :func:`Cacher.get_fpath` and
+                :func:`Cacher.existing_versions` are then the names of the
+                entries and do not exist on disk. Defaults to ``'files'``.
         """
 
         if depends is None:
@@ -249,16 +1460,13 @@ class Cacher:
             # from ubelt.util_path import Path
             # dpath = os.fspath(Path.appdir(appname, type='cache'))
 
-        if backend == 'auto':
-            if ext == '.pkl':
-                backend = 'pickle'
-            elif ext == '.json':
-                backend = 'json'
-            else:
-                backend = 'pickle'
-        else:
-            if backend not in {'json', 'pickel'}:
-                raise ValueError(backend)
+        backend = self.backends._rectify(backend, ext)
+        compress = _rectify_compress(compress)
+        if compress is not None:
+            if self.backends.lookup(backend)['dump_file'] is None:
+                raise ValueError(
+                    'The {} backend does not support compression'.format(
+                        backend))
 
         self.dpath = dpath
         self.fname = fname
@@ -272,6 +1480,24 @@ class Cacher:
         self.hasher = hasher
         self.log = print if log is None else log
         self.backend = backend
+        self.compress = compress
+        self.lock = lock
+        self.budget = CacheDir.coerce(budget, dpath)
+        if memory is True:
+            memory = self.memory_tier
+        self.memory = memory or None
+        self.dedup = dedup
+        if store not in {'files', 'sqlite'}:
+            raise KeyError('store must be files or sqlite, not {}'.format(
+                store))
+        self.store = store
+        if store == 'sqlite':
+            if self.backends.lookup(self.backend)['dump_file'] is None:
+                raise ValueError('The {} backend does not support the sqlite '
+                                 'store'.format(self.backend))
+            if self.budget is not None or self.memory is not None or dedup:
+                raise ValueError('The sqlite store does not support budget, '
+                                 'memory, or dedup')
         if len(self.ext) > 0 and self.ext[0] != '.':
             raise ValueError('Please be explicit and use a dot in ext')
 
@@ -369,7 +1595,23 @@ class Cacher:
         Returns:
             bool
         """
-        return exists(self.get_fpath(cfgstr=cfgstr))
+        data_fpath = self.get_fpath(cfgstr=cfgstr)
+        if self.store == 'sqlite':
+            return self._sqlite_store().contains(basename(data_fpath))
+        return exists(data_fpath)
+
+    def _sqlite_store(self):
+        return _CacherSQLiteStore.coerce(self.dpath)
+
+    def _sibling(self, depends):
+        """
+        A shallow copy of this cacher with different dependencies.
+        """
+        import copy
+        sibling = copy.copy(self)
+        sibling.depends = depends
+        sibling.cfgstr = None
+        return sibling
 
     def existing_versions(self):
         """
@@ -403,6 +1645,12 @@ class Cacher:
             >>> assert exist_fpaths.issubset(known_fpaths)
         """
         import glob
+        if self.store == 'sqlite':
+            prefix = self.fname + '_'
+            for name in self._sqlite_store().names(self.fname):
+                if name.startswith(prefix) and name.endswith(self.ext):
+                    yield join(self.dpath, name)
+            return
         pattern = join(self.dpath, self.fname + '_*' + self.ext)
         for fname in glob.iglob(pattern):
             data_fpath = join(self.dpath, fname)
@@ -416,9 +1664,13 @@ class Cacher:
             cfgstr (str | None): overrides the instance-level cfgstr
         """
         data_fpath = self.get_fpath(cfgstr)
+        # Do not let a pending background write restore the data later
+        self.writer.wait(data_fpath)
         if self.verbose > 0:
             self.log('[cacher] clear cache')
-        if exists(data_fpath):
+        if self.store == 'sqlite':
+            self._sqlite_store().delete(basename(data_fpath))
+        elif exists(data_fpath):
             if self.verbose > 0:
                 self.log('[cacher] removing {}'.format(data_fpath))
             os.remove(data_fpath)
@@ -427,10 +1679,35 @@ class Cacher:
             meta_fpath = data_fpath + '.meta'
             if exists(meta_fpath):
                 os.remove(meta_fpath)
+
+            # Remove any other files written by the backend
+            sidecars = self.backends.lookup(self.backend)['sidecars']
+            if sidecars is not None:
+                for sidecar_fpath in sidecars(data_fpath):
+                    if exists(sidecar_fpath):
+                        os.remove(sidecar_fpath)
+
+            if self.budget is not None:
+                self.budget.discard(data_fpath)
+            if self.memory is not None:
+                self.memory.discard(data_fpath)
         else:
             if self.verbose > 0:
                 self.log('[cacher] ... nothing to clear')
 
+    @classmethod
+    def flush(cls, timeout=None):
+        """
+        Block until all data saved with ``background=True`` is written.
+
+        Args:
+            timeout (float | None): maximum number of seconds to wait
+
+        Returns:
+            bool: True if all writes finished
+        """
+        return cls.writer.flush(timeout=timeout)
+
     def tryload(self, cfgstr=None, on_error='raise'):
         """
         Like load, but returns None if the load fails due to a cache miss.
@@ -510,7 +1787,35 @@ class Cacher:
 
         data_fpath = self.get_fpath(cfgstr=cfgstr)
 
-        if not exists(data_fpath):
+        pending = self.writer.lookup(data_fpath)
+        if pending is not None:
+            data, serialized, future = pending
+            if verbose > 2:
+                self.log('[cacher] ... {} pending write hit'.format(
+                    self.fname))
+            if serialized:
+                data = self._backend_loads(data)
+            return data
+
+        stamp = None
+        if self.memory is not None:
+            is_hit, data, stamp = self.memory.get(data_fpath)
+            if is_hit:
+                if verbose > 2:
+                    self.log('[cacher] ... {} memory hit'.format(self.fname))
+                if self.budget is not None:
+                    # Recorded in memory, so a hit does not write the index
+                    self.budget.touch(data_fpath, defer=True)
+                return data
+
+        payload = None
+        if self.store == 'sqlite':
+            payload = self._sqlite_store().get(basename(data_fpath))
+            is_missing = payload is None
+        else:
+            is_missing = not exists(data_fpath)
+
+        if is_missing:
             if verbose > 2:
                 self.log('[cacher] ... cache does not exist: '
                          'dpath={} fname={} cfgstr={}'.format(
@@ -518,12 +1823,18 @@ class Cacher:
             raise IOError(2, 'No such file or directory: {!r}'.format(data_fpath))
         else:
             if verbose > 3:
-                sizestr = _byte_str(os.stat(data_fpath).st_size)
+                if payload is None:
+                    sizestr = _byte_str(os.stat(data_fpath).st_size)
+                else:
+                    sizestr = _byte_str(len(payload))
                 self.log('[cacher] ... cache exists: '
                          'dpath={} fname={} cfgstr={}, size={}'.format(
                              basename(dpath), fname, cfgstr_, sizestr))
         try:
-            data = self._backend_load(data_fpath)
+            if payload is None:
+                data = self._backend_load(data_fpath)
+            else:
+                data = self._backend_loads(payload)
         except Exception as ex:
             if verbose > 0:
                 self.log('CORRUPTED? fpath = {!r}'.format(data_fpath))
@@ -541,9 +1852,13 @@ class Cacher:
                 self.log('[cacher] ... {} cache hit'.format(self.fname))
             elif verbose > 1:
                 self.log('[cacher] ... cache hit')
+            if self.budget is not None:
+                self.budget.touch(data_fpath)
+            if self.memory is not None and stamp is not None:
+                self.memory.put(data_fpath, data, stamp)
         return data
 
-    def save(self, data, cfgstr=None):
+    def save(self, data, cfgstr=None, background=False, serialized=False):
         """
         Writes data to path specified by ``self.fpath``.
 
@@ -554,6 +1869,31 @@ class Cacher:
             data (object): arbitrary pickleable object to be cached
             cfgstr (str | None): overrides the instance-level cfgstr
 
+            background (bool):
+                If True, the data is written by the shared background thread
+                ``Cacher.writer`` and a future is returned immediately.
+                The data is snapshotted first: it is serialized in the
+                calling thread (or deep copied if the backend can only write
+                to a path), so changes made to it after this returns are not
+                written. Compression is done in the background. Writes are
+                done in order, and if too many are pending this blocks until
+                one finishes. Until the data is written, the snapshot is
+                returned by :func:`Cacher.load` in this process. Use
+                :func:`Cacher.flush` to wait for all pending writes.
+                Defaults to False.
+
+            serialized (bool):
+                If True, ``data`` is a bytes payload that was already
+                serialized in the format of the backend (e.g. by
+                :func:`pickle.dumps`), which is written as-is (and compressed
+                if ``compress`` is set). Not supported by backends that write
+                sidecar files. Defaults to False.
+
+        Returns:
+            None | concurrent.futures.Future:
+                if ``background`` is True, a future that resolves when the
+                data is written.
+
         Example:
             >>> from ubelt.util_cache import *  # NOQA
             >>> # Normal functioning
@@ -568,82 +1908,508 @@ class Cacher:
             >>>                  appname='ubelt/tests/util_cache')
             >>> cacher2.save('data')
             >>> assert not exists(cacher2.get_fpath()), 'should be disabled'
+
+        Example:
+            >>> import ubelt as ub
+            >>> import pickle
+            >>> dpath = ub.Path.appdir('ubelt/tests/util_cache/background')
+            >>> cacher = ub.Cacher('bg', depends='v1', dpath=dpath, verbose=0)
+            >>> future = cacher.save(['data'] * 3, background=True)
+            >>> # Loading sees the data even if it is not written yet
+            >>> assert cacher.load() == ['data'] * 3
+            >>> future.result()
+            >>> assert cacher.exists()
+            >>> # A pre-serialized payload can be written
+            >>> payload = pickle.dumps({'a': 1})
+            >>> cacher.save(payload, serialized=True, background=True)
+            >>> ub.Cacher.flush()
+            >>> assert cacher.load() == {'a': 1}
+        """
+        if not self.enabled:
+            if background:
+                from concurrent.futures import Future
+                future = Future()
+                future.set_result(None)
+                return future
+            return
+        if serialized:
+            if self.backends.lookup(self.backend)['sidecars'] is not None:
+                raise ValueError('The {} backend does not support serialized '
+                                 'payloads'.format(self.backend))
+            if not isinstance(data, (bytes, bytearray, memoryview)):
+                raise TypeError('A serialized payload must be bytes, '
+                                'not {}'.format(type(data)))
+        data_fpath = self.get_fpath(cfgstr=cfgstr)
+        if background:
+            from functools import partial
+            if not serialized:
+                try:
+                    data, serialized = self._snapshot(data)
+                except Exception as ex:
+                    # Report errors through the future, like write errors
+                    from concurrent.futures import Future
+                    future = Future()
+                    future.set_exception(ex)
+                    return future
+            func = partial(self._save, data, cfgstr=cfgstr,
+                           serialized=serialized)
+            return self.writer.submit(data_fpath, func, data, serialized)
+        # Do not let a pending background write replace this one later
+        self.writer.wait(data_fpath)
+        self._save(data, cfgstr=cfgstr, serialized=serialized)
+
+    def _snapshot(self, data):
+        """
+        Capture the current state of data for a background save.
+
+        Returns:
+            Tuple[object, bool]:
+                An uncompressed serialized payload and True, or if the backend
+                cannot write to a file object or writes sidecar files, a deep
+                copy of the data and False.
+        """
+        funcs = self.backends.lookup(self.backend)
+        if funcs['dump_file'] is not None and funcs['sidecars'] is None:
+            import io
+            file_ = io.BytesIO()
+            funcs['dump_file'](file_, data, self)
+            return file_.getvalue(), True
+        import copy
+        return copy.deepcopy(data), False
+
+    def save_many(self, items):
+        """
+        Save data for many different dependencies at once.
+
+        This is equivalent to saving each item with a cacher that has the
+        same parameters but a different ``depends``. With the ``'sqlite'``
+        store all items are written in a single transaction.
+
+        Args:
+            items (Dict[Any, object] | Iterable[Tuple[Any, object]]):
+                maps the ``depends`` value of each entry to its data.
+
+        Example:
+            >>> import ubelt as ub
+            >>> dpath = ub.Path.appdir('ubelt/tests/util_cache/save-many')
+            >>> for store in ['files', 'sqlite']:
+            >>>     cacher = ub.Cacher('item', dpath=dpath, store=store, verbose=0)
+            >>>     cacher.save_many({'a': 1, 'b': 2, 'c': [3]})
+            >>>     assert cacher.load_many(['c', 'b', 'x']) == [[3], 2, None]
+            >>>     assert ub.Cacher('item', depends='a', dpath=dpath,
+            >>>                      store=store).load() == 1
         """
         from ubelt.util_path import ensuredir
-        from ubelt.util_time import timestamp
         if not self.enabled:
             return
+        if isinstance(items, dict):
+            items = items.items()
+        if self.store != 'sqlite':
+            for depends, data in items:
+                self._sibling(depends).save(data)
+            return
         if self.verbose > 0:
-            self.log('[cacher] ... {} cache save'.format(self.fname))
+            self.log('[cacher] ... {} cache save many'.format(self.fname))
+        rows = []
+        for depends, data in items:
+            sibling = self._sibling(depends)
+            data_fpath = sibling.get_fpath()
+            self.writer.wait(data_fpath)
+            rows.append((basename(data_fpath), self.fname,
+                         self._backend_dumps(data), sibling._meta_text()))
+        ensuredir(self.dpath)
+        self._sqlite_store().put_many(rows)
 
+    def load_many(self, depends_list):
+        """
+        Load data for many different dependencies at once.
+
+        This is equivalent to loading each item with a cacher that has the
+        same parameters but a different ``depends``. With the ``'sqlite'``
+        store all items are read with a few queries.
+
+        Args:
+            depends_list (Iterable[Any]): the ``depends`` value of each entry
+
+        Returns:
+            List[object | None]:
+                the data of each entry, or None if it does not exist (or the
+                cache is disabled).
+        """
+        depends_list = list(depends_list)
+        if not self.enabled:
+            return [None] * len(depends_list)
+        if self.store != 'sqlite':
+            return [self._sibling(depends).tryload(on_error='raise')
+                    for depends in depends_list]
+        names = []
+        results = {}
+        for depends in depends_list:
+            data_fpath = self._sibling(depends).get_fpath()
+            name = basename(data_fpath)
+            names.append(name)
+            pending = self.writer.lookup(data_fpath)
+            if pending is not None:
+                if pending[1]:
+                    results[name] = self._backend_loads(pending[0])
+                else:
+                    results[name] = pending[0]
+        missing = [name for name in names if name not in results]
+        if missing:
+            payloads = self._sqlite_store().get_many(missing)
+            for name, payload in payloads.items():
+                results[name] = self._backend_loads(payload)
+        return [results.get(name, None) for name in names]
+
+    def _meta_text(self, cfgstr=None):
+        """
+        The metadata recorded each time an entry is saved.
+        """
+        from ubelt.util_time import timestamp
         cfgstr_ = self._rectify_cfgstr(cfgstr)
         condensed = self._condense_cfgstr(cfgstr)
+        meta_text = ''.join([
+            '\n\nsaving {}\n'.format(timestamp()),
+            self.fname + '\n',
+            condensed + '\n',
+            cfgstr_ + '\n',
+            str(self.meta) + '\n',
+        ])
+        return meta_text
+
+    def _save(self, data, cfgstr=None, serialized=False):
+        from ubelt.util_path import ensuredir
+        if self.verbose > 0:
+            self.log('[cacher] ... {} cache save'.format(self.fname))
 
         # Make sure the cache directory exists
         ensuredir(self.dpath)
 
         data_fpath = self.get_fpath(cfgstr=cfgstr)
-        meta_fpath = data_fpath + '.meta'
+        meta_text = self._meta_text(cfgstr)
+
+        if self.store == 'sqlite':
+            payload = self._backend_dumps(data, serialized=serialized)
+            self._sqlite_store().put_many([
+                (basename(data_fpath), self.fname, payload, meta_text)])
+            if self.verbose > 3:
+                sizestr = _byte_str(len(payload))
+                self.log('[cacher] ... finish save, size={}'.format(sizestr))
+            return
 
         # Also save metadata file to reconstruct hashing
         # This may be deprecated in the future.
-        with open(meta_fpath, 'a') as file_:
-            # TODO: maybe append this in json or YML format?
-            file_.write('\n\nsaving {}\n'.format(timestamp()))
-            file_.write(self.fname + '\n')
-            file_.write(condensed + '\n')
-            file_.write(cfgstr_ + '\n')
-            file_.write(str(self.meta) + '\n')
+        meta_fpath = data_fpath + '.meta'
+        # TODO: maybe append this in json or YML format?
+        _atomic_append_text(meta_fpath, meta_text)
 
-        self._backend_dump(data_fpath, data)
+        if self.dedup:
+            self._dedup_backend_dump(data_fpath, data, serialized=serialized)
+        else:
+            self._atomic_backend_dump(data_fpath, data, serialized=serialized)
+        if self.memory is not None:
+            if serialized:
+                self.memory.discard(data_fpath)
+            else:
+                self.memory.put(data_fpath, data)
+
+        if self.budget is not None:
+            self.budget.add(data_fpath)
+            if self.budget._needs_eviction():
+                self.budget.evict(keep=[data_fpath])
 
         if self.verbose > 3:
             sizestr = _byte_str(os.stat(data_fpath).st_size)
             self.log('[cacher] ... finish save, size={}'.format(sizestr))
 
-    def _backend_load(self, data_fpath):
-        """
+    def _backend_load(self, data_fpath):
+        """
+        Example:
+            >>> import ubelt as ub
+            >>> cacher = ub.Cacher('test_other_backend', depends=['a'], ext='.json')
+            >>> cacher.save(['data'])
+            >>> cacher.tryload()
+
+            >>> import ubelt as ub
+            >>> cacher = ub.Cacher('test_other_backend2', depends=['a'], ext='.yaml', backend='json')
+            >>> cacher.save({'data': [1, 2, 3]})
+            >>> cacher.tryload()
+
+            >>> import pytest
+            >>> with pytest.raises(ValueError):
+            >>>     ub.Cacher('test_other_backend2', depends=['a'], ext='.yaml', backend='does-not-exist')
+            >>> cacher = ub.Cacher('test_other_backend2', depends=['a'], ext='.really-a-pickle', backend='auto')
+            >>> assert cacher.backend == 'pickle', 'should be default'
+
+            >>> cacher = ub.Cacher('test_other_backend3', depends=['a'], backend='marshal')
+            >>> cacher.save({'data': (1, 2.5, b'3')})
+            >>> assert cacher.tryload() == {'data': (1, 2.5, b'3')}
+
+            >>> # Compressed data is detected when loading
+            >>> cacher = ub.Cacher('test_compress', depends=['a'], compress='lzma')
+            >>> cacher.save(['data'] * 100)
+            >>> cacher2 = ub.Cacher('test_compress', depends=['a'])
+            >>> assert cacher2.load() == ['data'] * 100
+        """
+        if self.backend not in self.backends:
+            raise NotImplementedError('self.backend = {}'.format(self.backend))
+        funcs = self.backends.lookup(self.backend)
+        blob_fpath = _read_blob_pointer(data_fpath)
+        if blob_fpath is not None:
+            data_fpath = blob_fpath
+        with open(data_fpath, 'rb') as file_:
+            codec, offset = _parse_codec_header(file_.read(64))
+            if codec is not None:
+                if funcs['load_file'] is None:
+                    raise IOError('The {} backend cannot load data compressed '
+                                  'with {}'.format(self.backend, codec))
+                open_codec = _CACHER_CODECS[codec]
+                file_.seek(offset)
+                with open_codec(file_, 'rb') as stream:
+                    return funcs['load_file'](stream, self)
+        data = funcs['load'](data_fpath, self)
+        return data
+
+    def _backend_dump(self, data_fpath, data, serialized=False):
+        if self.backend not in self.backends:
+            raise NotImplementedError('self.backend = {}'.format(self.backend))
+        funcs = self.backends.lookup(self.backend)
+        if serialized:
+            with open(data_fpath, 'wb') as file_:
+                if self.compress is None:
+                    file_.write(data)
+                else:
+                    file_.write(_codec_header(self.compress))
+                    open_codec = _CACHER_CODECS[self.compress]
+                    with open_codec(file_, 'wb') as stream:
+                        stream.write(data)
+        elif self.compress is None:
+            funcs['dump'](data_fpath, data, self)
+        else:
+            open_codec = _CACHER_CODECS[self.compress]
+            with open(data_fpath, 'wb') as file_:
+                file_.write(_codec_header(self.compress))
+                with open_codec(file_, 'wb') as stream:
+                    funcs['dump_file'](stream, data, self)
+        return data
+
+    def _backend_loads(self, payload):
+        """
+        Load data from bytes serialized by :func:`Cacher._backend_dumps`.
+        """
+        import io
+        funcs = self.backends.lookup(self.backend)
+        codec, offset = _parse_codec_header(payload[0:64])
+        file_ = io.BytesIO(payload)
+        if codec is None:
+            data = funcs['load_file'](file_, self)
+        else:
+            open_codec = _CACHER_CODECS[codec]
+            file_.seek(offset)
+            with open_codec(file_, 'rb') as stream:
+                data = funcs['load_file'](stream, self)
+        return data
+
+    def _backend_dumps(self, data, serialized=False):
+        """
+        Serialize data (and compress it) in memory.
+
+        Returns:
+            bytes
+        """
+        import io
+        if serialized and self.compress is None:
+            return bytes(data)
+        funcs = self.backends.lookup(self.backend)
+        file_ = io.BytesIO()
+        if self.compress is None:
+            funcs['dump_file'](file_, data, self)
+        else:
+            file_.write(_codec_header(self.compress))
+            open_codec = _CACHER_CODECS[self.compress]
+            with open_codec(file_, 'wb') as stream:
+                if serialized:
+                    stream.write(data)
+                else:
+                    funcs['dump_file'](stream, data, self)
+        return file_.getvalue()
+
+    def _atomic_backend_dump(self, data_fpath, data, serialized=False):
+        """
+        Dump the data to a temporary file in the same directory and then move
+        it (and any sidecar files) into place with :func:`os.replace`.
+
+        Concurrent readers either see the previous file or the complete new
+        one, never a partial write. This also means an existing memory map
+        of the previous file remains valid.
+        """
+        import uuid
+        dpath, fname = os.path.split(data_fpath)
+        # The temporary file is hidden, so it does not match the patterns in
+        # existing_versions, but keeps the extension.
+        tmp_fpath = join(dpath, '.{}.tmp-{}-{}{}'.format(
+            fname, os.getpid(), uuid.uuid4().hex[0:8], self.ext))
+        sidecars = self.backends.lookup(self.backend)['sidecars']
+        if sidecars is None:
+            tmp_sidecars, final_sidecars = [], []
+        else:
+            tmp_sidecars = sidecars(tmp_fpath)
+            final_sidecars = sidecars(data_fpath)
+        try:
+            self._backend_dump(tmp_fpath, data, serialized=serialized)
+            # Move sidecars first and the main file last, so the main file
+            # never refers to missing sidecar data. A reader that opened the
+            # previous main file can still see the new sidecars, so backends
+            # with sidecars must detect that (e.g. the pickle5 backend
+            # writes a hash of the pickled data into both files).
+            for src, dst in zip(tmp_sidecars, final_sidecars):
+                if exists(src):
+                    os.replace(src, dst)
+            os.replace(tmp_fpath, data_fpath)
+        finally:
+            for fpath in [tmp_fpath] + tmp_sidecars:
+                if exists(fpath):
+                    os.remove(fpath)
+        return data
+
+    def _dedup_backend_dump(self, data_fpath, data, serialized=False):
+        """
+        Dump the data to a content-addressed blob (unless an identical blob
+        already exists) and atomically write a pointer to it.
+        """
+        import uuid
+        from ubelt.util_hash import hash_file, hash_data
+        from ubelt.util_path import ensuredir
+        blob_dpath = ensuredir(join(self.dpath, _BLOB_DNAME))
+        suffix = '.tmp-{}-{}'.format(os.getpid(), uuid.uuid4().hex[0:8])
+        tmp_fpath = join(blob_dpath, '.' + suffix + self.ext)
+        dpath, fname = os.path.split(data_fpath)
+        tmp_pointer_fpath = join(dpath, '.{}{}'.format(fname, suffix))
+        sidecars = self.backends.lookup(self.backend)['sidecars']
+        if sidecars is None:
+            sidecars = _no_sidecars
+        tmp_sidecars = sidecars(tmp_fpath)
+        try:
+            self._backend_dump(tmp_fpath, data, serialized=serialized)
+            blob_hash = hash_file(tmp_fpath, hasher=_BLOB_HASHER, base='hex')
+            if tmp_sidecars:
+                # The sidecar contents are part of the payload
+                blob_hash = hash_data([blob_hash] + [
+                    hash_file(fpath, hasher=_BLOB_HASHER, base='hex')
+                    if exists(fpath) else None for fpath in tmp_sidecars
+                ], hasher=_BLOB_HASHER, base='hex')
+            blob_fname = blob_hash + self.ext
+            blob_fpath = join(blob_dpath, blob_fname)
+            if exists(blob_fpath):
+                # The payload already exists. Update its mtime so a concurrent
+                # prune_blobs does not remove it.
+                os.utime(blob_fpath)
+            else:
+                for src, dst in zip(tmp_sidecars, sidecars(blob_fpath)):
+                    if exists(src):
+                        os.replace(src, dst)
+                os.replace(tmp_fpath, blob_fpath)
+            with open(tmp_pointer_fpath, 'wb') as file_:
+                file_.write(_BLOB_POINTER_MAGIC)
+                file_.write(join(_BLOB_DNAME, blob_fname).encode('utf8'))
+            os.replace(tmp_pointer_fpath, data_fpath)
+            # Sidecars of a previous non-pointer entry are stale
+            for fpath in sidecars(data_fpath):
+                if exists(fpath):
+                    os.remove(fpath)
+        finally:
+            for fpath in [tmp_fpath, tmp_pointer_fpath] + tmp_sidecars:
+                if exists(fpath):
+                    os.remove(fpath)
+        return data
+
+    def prune_blobs(self, grace=60.0, dry=False):
+        """
+        Remove the content-addressed blobs in ``dpath`` that are not
+        referenced by any pointer file in ``dpath``.
+
+        Blobs that were written or reused shortly before (or after) the pointer
+        files were scanned are kept, so this is safe to run while other
+        processes save.
+
+        Args:
+            grace (float):
+                blobs modified less than this many seconds before the scan
+                are kept. Defaults to 60.
+
+            dry (bool):
+                if True, report what would be removed, but do not remove it.
+
+        Returns:
+            List[str]: paths of the removed blob files
+
+        Example:
+            >>> import ubelt as ub
+            >>> dpath = ub.Path.appdir('ubelt/tests/cacher-prune-blobs').delete()
+            >>> cacher1 = ub.Cacher('data', depends='a', dpath=dpath, dedup=True)
+            >>> cacher2 = ub.Cacher('data', depends='b', dpath=dpath, dedup=True)
+            >>> cacher1.save('payload')
+            >>> cacher2.save('payload')
+            >>> assert len((dpath / 'blobs').ls()) == 1
+            >>> cacher1.clear()
+            >>> assert cacher1.prune_blobs(grace=0) == []
+            >>> cacher2.clear()
+            >>> assert len(cacher2.prune_blobs(grace=0)) == 1
+            >>> assert len((dpath / 'blobs').ls()) == 0
+        """
+        import time
+        blob_dpath = join(self.dpath, _BLOB_DNAME)
+        if not os.path.isdir(blob_dpath):
+            return []
+        min_mtime = time.time() - grace
+        referenced = set()
+        for entry in os.scandir(self.dpath):
+            if entry.is_file() and not entry.name.startswith('.'):
+                try:
+                    blob_fpath = _read_blob_pointer(entry.path)
+                except OSError:  # nocover
+                    continue
+                if blob_fpath is not None:
+                    # The blob stem is its hash. Sidecars share the stem.
+                    referenced.add(basename(blob_fpath).split('.')[0])
+        removed = []
+        for entry in os.scandir(blob_dpath):
+            if entry.name.startswith('.') or not entry.is_file():
+                continue
+            if entry.name.split('.')[0] in referenced:
+                continue
+            if entry.stat().st_mtime >= min_mtime:
+                continue
+            removed.append(entry.path)
+            if not dry:
+                os.remove(entry.path)
+        return removed
+
+    def _lock_fpath(self, cfgstr=None):
+        return self.get_fpath(cfgstr=cfgstr) + '.lock'
+
+    def locked(self, cfgstr=None):
+        """
+        A context manager that holds an exclusive advisory lock for this
+        cache, which can be used to ensure only one process computes
+        missing data. See :class:`ubelt.util_cache._FileLock` for details.
+
+        Args:
+            cfgstr (str | None): overrides the instance-level cfgstr
+
+        Returns:
+            _FileLock
+
         Example:
             >>> import ubelt as ub
-            >>> cacher = ub.Cacher('test_other_backend', depends=['a'], ext='.json')
-            >>> cacher.save(['data'])
-            >>> cacher.tryload()
-
-            >>> import ubelt as ub
-            >>> cacher = ub.Cacher('test_other_backend2', depends=['a'], ext='.yaml', backend='json')
-            >>> cacher.save({'data': [1, 2, 3]})
-            >>> cacher.tryload()
-
-            >>> import pytest
-            >>> with pytest.raises(ValueError):
-            >>>     ub.Cacher('test_other_backend2', depends=['a'], ext='.yaml', backend='does-not-exist')
-            >>> cacher = ub.Cacher('test_other_backend2', depends=['a'], ext='.really-a-pickle', backend='auto')
-            >>> assert cacher.backend == 'pickle', 'should be default'
+            >>> cacher = ub.Cacher('test_locked', depends='a')
+            >>> with cacher.locked():
+            >>>     data = cacher.tryload()
+            >>>     if data is None:
+            >>>         data = 'expensive result'
+            >>>         cacher.save(data)
         """
-        if self.backend == 'pickle':
-            import pickle
-            with open(data_fpath, 'rb') as file_:
-                data = pickle.load(file_)
-        elif self.backend == 'json':
-            import json
-            with open(data_fpath, 'r') as file_:
-                data = json.load(file_)
-        else:
-            raise NotImplementedError('self.backend = {}'.format(self.backend))
-        return data
-
-    def _backend_dump(self, data_fpath, data):
-        if self.backend == 'pickle':
-            import pickle
-            with open(data_fpath, 'wb') as file_:
-                pickle.dump(data, file_, protocol=self.protocol)
-        elif self.backend == 'json':
-            import json
-            with open(data_fpath, 'w') as file_:
-                json.dump(data, file_)
-        else:
-            raise NotImplementedError('self.backend = {}'.format(self.backend))
-        return data
+        return _FileLock.coerce(self._lock_fpath(cfgstr))
 
     def ensure(self, func, *args, **kwargs):
         """
@@ -670,8 +2436,16 @@ class Cacher:
         """
         data = self.tryload()
         if data is None:
-            data = func(*args, **kwargs)
-            self.save(data)
+            if self.lock and self.enabled:
+                with self.locked():
+                    # Another process may have saved the data while we waited
+                    data = self.tryload()
+                    if data is None:
+                        data = func(*args, **kwargs)
+                        self.save(data)
+            else:
+                data = func(*args, **kwargs)
+                self.save(data)
         return data
 
     def __call__(self, func):
@@ -760,7 +2534,8 @@ class CacheStamp(object):
     """
     def __init__(self, fname, dpath, cfgstr=None, product=None, hasher='sha1',
                  verbose=None, enabled=True, depends=None, meta=None,
-                 hash_prefix=None, expires=None, ext='.pkl'):
+                 hash_prefix=None, expires=None, ext='.pkl', hash_cache=None,
+                 lock=False):
         """
         Args:
             fname (str):
@@ -808,15 +2583,28 @@ class CacheStamp(object):
                 File extension for the cache format. Can be ``'.pkl'`` or
                 ``'.json'``. Defaults to ``'.pkl'``.
 
+            hash_cache (bool | FileHashCache | None):
+                If specified, product hashes are looked up in a persistent
+                :class:`ubelt.util_hash.FileHashCache` keyed on file stat
+                information, which avoids rehashing unchanged products.
+                See :func:`ubelt.util_hash.hash_file`. Defaults to None.
+
+            lock (bool):
+                If True, :func:`CacheStamp.renew` holds an exclusive advisory
+                file lock while it writes the certificate. To compute the
+                product in only one of several processes, check and renew the
+                stamp inside :func:`CacheStamp.locked`. Defaults to False.
+
             cfgstr (str | None): DEPRECATED.
         """
         self.cacher = Cacher(fname, cfgstr=cfgstr, dpath=dpath,
                              verbose=verbose, enabled=enabled, depends=depends,
-                             meta=meta, ext=ext)
+                             meta=meta, ext=ext, lock=lock)
         self.product = product
         self.hasher = hasher
         self.expires = expires
         self.hash_prefix = hash_prefix
+        self.hash_cache = hash_cache
 
         # The user can modify these if they want to disable size or mtime
         # checks for expiration. Not sure if I want to expose it at the
@@ -837,6 +2625,28 @@ class CacheStamp(object):
         """
         return self.cacher.clear()
 
+    def locked(self):
+        """
+        A context manager that holds an exclusive advisory lock for this
+        stamp.
+
+        Returns:
+            _FileLock
+
+        Example:
+            >>> import ubelt as ub
+            >>> dpath = ub.Path.appdir('ubelt/tests/cache-stamp-locked').ensuredir()
+            >>> stamp = ub.CacheStamp('foo', dpath=dpath, depends='a')
+            >>> stamp.clear()
+            >>> with stamp.locked():
+            >>>     # Only one process at a time can reach this point, so the
+            >>>     # others see the renewed stamp once they get the lock.
+            >>>     if stamp.expired():
+            >>>         stamp.renew()
+            >>> assert not stamp.expired()
+        """
+        return self.cacher.locked()
+
     def _get_certificate(self, cfgstr=None):
         """
         Returns the stamp certificate if it exists
@@ -909,7 +2719,8 @@ class CacheStamp(object):
             from ubelt.util_hash import hash_file
             products = self._rectify_products(product)
             product_file_hash = [
-                hash_file(p, hasher=self.hasher, base='hex')
+                hash_file(p, hasher=self.hasher, base='hex',
+                          cache=self.hash_cache)
                 for p in products
             ]
         return product_file_hash
@@ -1013,6 +2824,148 @@ class CacheStamp(object):
             return 'disabled'
 
         certificate = self._get_certificate(cfgstr=cfgstr)
+        err = self._expired_certificate(certificate)
+        if err:
+            return err
+
+        products = self._rectify_products(product)
+        if products is None:
+            # We don't have a product to check, so assume not expired
+            return False
+
+        product_stats = [_stat_or_none(p) for p in products]
+        err = self._expired_product_stats(certificate, product_stats)
+        if err:
+            return err
+
+        if self._expire_checks['hash']:
+            product_file_hash = self._product_file_hash(products)
+            err = self._expired_product_hash(certificate, product_file_hash)
+            if err:
+                return err
+
+        # All tests passed, we are not expired
+        return False
+
+    @classmethod
+    def expired_many(cls, stamps, workers=0):
+        """
+        Check if many stamps are expired at once.
+
+        This gives the same result as calling :func:`CacheStamp.expired` on
+        each stamp, but the certificates are loaded, the products are
+        stat-ed, and the products are hashed in parallel. Products shared by
+        multiple stamps are only stat-ed and hashed once, and products are
+        only hashed for stamps that pass all of the cheaper checks (use the
+        ``hash_cache`` argument of the stamps to avoid rehashing files that
+        have not changed since the last check).
+
+        Args:
+            stamps (Iterable[CacheStamp]): the stamps to check
+
+            workers (int):
+                number of parallel threads. If 0, the checks are done
+                serially. Defaults to 0.
+
+        Returns:
+            Dict[CacheStamp, bool | str]:
+                maps each stamp to the result of :func:`CacheStamp.expired`,
+                i.e. the reason it is expired, or False if it is valid.
+
+        Example:
+            >>> import ubelt as ub
+            >>> dpath = ub.Path.appdir('ubelt/tests/cache-stamp-many')
+            >>> dpath.delete().ensuredir()
+            >>> shared = dpath / 'shared.txt'
+            >>> shared.write_text('shared')
+            >>> stamps = []
+            >>> for i in range(4):
+            >>>     product = dpath / 'product{}.txt'.format(i)
+            >>>     product.write_text(str(i))
+            >>>     stamp = ub.CacheStamp('stamp{}'.format(i), dpath=dpath,
+            >>>                           product=[product, shared],
+            >>>                           depends='v1', verbose=0)
+            >>>     stamps.append(stamp)
+            >>> stamps[0].renew()
+            >>> stamps[1].renew()
+            >>> stamps[2].renew()
+            >>> (dpath / 'product2.txt').write_text('changed')
+            >>> reasons = ub.CacheStamp.expired_many(stamps, workers=4)
+            >>> print(list(reasons.values()))
+            [False, False, 'size_diff', 'no_cert']
+            >>> assert reasons == {s: s.expired() for s in stamps}
+        """
+        from collections import OrderedDict
+        from ubelt.util_futures import Executor
+        stamps = list(stamps)
+        reasons = OrderedDict((stamp, None) for stamp in stamps)
+        with Executor(mode='thread', max_workers=workers) as executor:
+            # Load the certificates
+            certificates = {}
+            jobs = []
+            for stamp in reasons.keys():
+                if stamp.cacher.enabled:
+                    jobs.append((stamp, executor.submit(stamp._get_certificate)))
+                else:
+                    reasons[stamp] = 'disabled'
+            stamp_products = {}
+            for stamp, job in jobs:
+                certificate = job.result()
+                certificates[stamp] = certificate
+                err = stamp._expired_certificate(certificate)
+                if err:
+                    reasons[stamp] = err
+                else:
+                    products = stamp._rectify_products()
+                    if products is None:
+                        reasons[stamp] = False
+                    else:
+                        stamp_products[stamp] = products
+
+            # Stat each unique product
+            unique_paths = list(OrderedDict.fromkeys(
+                p for products in stamp_products.values() for p in products))
+            path_to_stat = dict(zip(unique_paths, executor.map(
+                _stat_or_none, unique_paths)))
+            needs_hash = []
+            for stamp, products in stamp_products.items():
+                product_stats = [path_to_stat[p] for p in products]
+                err = stamp._expired_product_stats(certificates[stamp],
+                                                   product_stats)
+                if err:
+                    reasons[stamp] = err
+                elif stamp._expire_checks['hash']:
+                    needs_hash.append(stamp)
+                else:
+                    reasons[stamp] = False
+
+            # Hash each unique product for the stamps that need it
+            hash_jobs = {}
+            for stamp in needs_hash:
+                if stamp.hasher is not None:
+                    for p in stamp_products[stamp]:
+                        key = (p, stamp.hasher, stamp.hash_cache)
+                        if key not in hash_jobs:
+                            hash_jobs[key] = executor.submit(
+                                _hash_product_worker, *key)
+            for stamp in needs_hash:
+                if stamp.hasher is None:
+                    product_file_hash = None
+                else:
+                    product_file_hash = [
+                        hash_jobs[(p, stamp.hasher, stamp.hash_cache)].result()
+                        for p in stamp_products[stamp]]
+                reasons[stamp] = stamp._expired_product_hash(
+                    certificates[stamp], product_file_hash)
+        return reasons
+
+    def _expired_certificate(self, certificate):
+        """
+        Check if the certificate itself is missing or expired.
+
+        Returns:
+            str | None: the reason the stamp is expired, if it is.
+        """
         if certificate is None:
             # We don't have a certificate, so we are expired
             err = 'no_cert'
@@ -1033,58 +2986,73 @@ class CacheStamp(object):
                     print('[cacher] stamp expired {}'.format(err))
                 return err
 
-        products = self._rectify_products(product)
-        if products is None:
-            # We don't have a product to check, so assume not expired
-            return False
-        elif not all(map(exists, products)):
+    def _expired_product_stats(self, certificate, product_stats):
+        """
+        Check if the products are missing or their size or mtime changed, or
+        if the certificate hashes do not match the expected prefixes.
+
+        Args:
+            certificate (dict): the existing certificate
+            product_stats (List[os.stat_result | None]):
+                the stat of each product, or None if it does not exist.
+
+        Returns:
+            str | None: the reason the stamp is expired, if it is.
+        """
+        if any(stat is None for stat in product_stats):
             # We are expired if the expected product does not exist
             err = 'missing_products'
             if self.cacher.verbose > 0:  # pragma: nobranch
                 print('[cacher] stamp expired {}'.format(err))
             return err
-        else:
-            # First test to see if the size or mtime of the files has changed
-            # as a potentially quicker check. If sizes or mtimes do not exist
-            # in the certificate (old ubelt version), then ignore them.
-            product_file_stats = self._product_file_stats()
-            sizes = certificate.get('size', None)
-            if sizes is not None and self._expire_checks['size']:
-                if sizes != product_file_stats['size']:
-                    # The sizes are different, we are expired
-                    err =  'size_diff'
-                    if self.cacher.verbose > 0:  # pragma: nobranch
-                        print('[cacher] stamp expired {}'.format(err))
-                    return err
-            mtimes = certificate.get('mtime', None)
-            if mtimes is not None and self._expire_checks['mtime']:
-                if mtimes != product_file_stats['mtime']:
-                    # The sizes are different, we are expired
-                    err = 'mtime_diff'
-                    if self.cacher.verbose > 0:  # pragma: nobranch
-                        print('[cacher] stamp expired {}'.format(err))
-                    return err
 
-            err = self._check_certificate_hashes(certificate)
-            if err:
+        # First test to see if the size or mtime of the files has changed
+        # as a potentially quicker check. If sizes or mtimes do not exist
+        # in the certificate (old ubelt version), then ignore them.
+        sizes = certificate.get('size', None)
+        if sizes is not None and self._expire_checks['size']:
+            if sizes != [stat.st_size for stat in product_stats]:
+                # The sizes are different, we are expired
+                err =  'size_diff'
+                if self.cacher.verbose > 0:  # pragma: nobranch
+                    print('[cacher] stamp expired {}'.format(err))
+                return err
+        mtimes = certificate.get('mtime', None)
+        if mtimes is not None and self._expire_checks['mtime']:
+            if mtimes != [stat.st_mtime for stat in product_stats]:
+                # The sizes are different, we are expired
+                err = 'mtime_diff'
+                if self.cacher.verbose > 0:  # pragma: nobranch
+                    print('[cacher] stamp expired {}'.format(err))
                 return err
 
-            # We are expired if the hash of the existing product data
-            # does not match the expected hash in the certificate
-            if self._expire_checks['hash']:
-                certificate_hash = certificate.get('hash', None)
-                product_file_hash = self._product_file_hash(products)
-                if product_file_hash != certificate_hash:
-                    if self.cacher.verbose > 0:
-                        print('invalid hash value (expected "{}", got "{}")'.format(
-                            product_file_hash, certificate_hash))
-                    # The hash is different, we are expired
-                    err = 'hash_diff'
-                    if self.cacher.verbose > 0:
-                        print('[cacher] stamp expired {}'.format(err))
-                    return err
+        err = self._check_certificate_hashes(certificate)
+        if err:
+            return err
 
-        # All tests passed, we are not expired
+    def _expired_product_hash(self, certificate, product_file_hash):
+        """
+        Check if the hash of the products changed.
+
+        Args:
+            certificate (dict): the existing certificate
+            product_file_hash (List[str] | None): the current product hashes
+
+        Returns:
+            str | bool: the reason the stamp is expired, or False
+        """
+        # We are expired if the hash of the existing product data
+        # does not match the expected hash in the certificate
+        certificate_hash = certificate.get('hash', None)
+        if product_file_hash != certificate_hash:
+            if self.cacher.verbose > 0:
+                print('invalid hash value (expected "{}", got "{}")'.format(
+                    product_file_hash, certificate_hash))
+            # The hash is different, we are expired
+            err = 'hash_diff'
+            if self.cacher.verbose > 0:
+                print('[cacher] stamp expired {}'.format(err))
+            return err
         return False
 
     def _check_certificate_hashes(self, certificate):
@@ -1226,6 +3194,14 @@ class CacheStamp(object):
                 name='product', type='CacheStamp.renew arg',
                 deprecate='1.1.0', error='1.3.0', remove='1.4.0',
             )
+        if self.cacher.lock:
+            with self.cacher.locked(cfgstr):
+                certificate = self._renew(cfgstr, product)
+        else:
+            certificate = self._renew(cfgstr, product)
+        return certificate
+
+    def _renew(self, cfgstr=None, product=None):
         certificate = self._new_certificate(cfgstr, product)
         err = self._check_certificate_hashes(certificate)
         if err:
@@ -1234,6 +3210,660 @@ class CacheStamp(object):
         return certificate
 
 
+class CacheDir(object):
+    """
+    Bounds the size, number of entries, and age of the files in a cache
+    directory, such as the one used by :class:`Cacher`.
+
+    Each top-level file in the directory is an entry. Sidecar files (e.g. the
+    ``.meta`` file written by :class:`Cacher`) belong to the entry they are
+    named after, and are counted and removed with it. Hidden files are
+    ignored. Subdirectories are not entries, because they usually belong to
+    a different application.
+
+    When and how often each entry is used is recorded in a hidden SQLite
+    index in the directory. :class:`Cacher` updates it on each save and load
+    when it is given a ``budget``, and then evicts entries to stay within the
+    limits. Entries that were not written by a :class:`Cacher` are added to
+    the index by :func:`CacheDir.sync`, using their modification time as the
+    last access time.
+
+    Attributes:
+        dpath (str | PathLike): the cache directory
+        max_bytes (int | None): maximum total size of all entries
+        max_entries (int | None): maximum number of entries
+        max_age (float | None): entries that have not been accessed for this
+            many seconds are removed.
+        policy (str): which entries to remove first, either ``'lru'`` (least
+            recently used) or ``'lfu'`` (least frequently used).
+
+    Example:
+        >>> import ubelt as ub
+        >>> dpath = ub.Path.appdir('ubelt/tests/cache-dir').delete().ensuredir()
+        >>> budget = ub.CacheDir(dpath, max_entries=2)
+        >>> for i in range(3):
+        >>>     cacher = ub.Cacher('data', depends=str(i), dpath=dpath,
+        >>>                        budget=budget, verbose=0)
+        >>>     cacher.save(i)
+        >>> # The least recently used entry was evicted
+        >>> print(sorted(p.name for p in dpath.ls()
+        >>>              if not p.name.startswith('.')))
+        ['data_1.pkl', 'data_1.pkl.meta', 'data_2.pkl', 'data_2.pkl.meta']
+        >>> budget.close()
+    """
+    # Name of the hidden SQLite database that records access information
+    INDEX_FNAME = '.ubelt_cache_index.sqlite'
+
+    # Suffixes of files that belong to the entry they are named after
+    SIDECAR_SUFFIXES = ('.meta', '.buffers', '.lock')
+
+    def __init__(self, dpath, max_bytes=None, max_entries=None, max_age=None,
+                 policy='lru'):
+        """
+        Args:
+            dpath (str | PathLike): the cache directory
+
+            max_bytes (int | str | None):
+                maximum total size of all entries, either a number of bytes
+                or a string like ``'10GB'``. Defaults to no limit.
+
+            max_entries (int | None):
+                maximum number of entries. Defaults to no limit.
+
+            max_age (float | str | datetime.timedelta | None):
+                Entries that have not been accessed for this many seconds (or
+                for a duration like ``'30d'``) are removed. Defaults to no
+                limit.
+
+            policy (str):
+                Either ``'lru'`` to remove the least recently used entries
+                first or ``'lfu'`` to remove the least frequently used
+                entries first. Defaults to ``'lru'``.
+        """
+        import threading
+        import datetime as datetime_mod
+        if policy not in {'lru', 'lfu'}:
+            raise KeyError('policy must be lru or lfu, not {}'.format(policy))
+        if isinstance(max_bytes, str):
+            max_bytes = _parse_bytes(max_bytes)
+        if isinstance(max_age, str):
+            max_age = _parse_seconds(max_age)
+        elif isinstance(max_age, datetime_mod.timedelta):
+            max_age = max_age.total_seconds()
+        self.dpath = dpath
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.policy = policy
+        # sqlite connections cannot be shared between threads
+        self._local = threading.local()
+        # Maps the name of an entry to the (atime, hits) of deferred touches
+        self._deferred = {}
+        self._deferred_lock = threading.Lock()
+
+    @classmethod
+    def coerce(cls, data, dpath):
+        """
+        Args:
+            data (CacheDir | dict | None):
+                an existing instance, or keyword arguments for a new one.
+            dpath (str | PathLike): the directory to use for a new instance
+
+        Returns:
+            CacheDir | None
+        """
+        if data is None or isinstance(data, cls):
+            return data
+        return cls(dpath, **data)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            import sqlite3
+            os.makedirs(self.dpath, exist_ok=True)
+            index_fpath = join(self.dpath, self.INDEX_FNAME)
+            conn = sqlite3.connect(index_fpath, timeout=60)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            with conn:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS entries (
+                        name TEXT PRIMARY KEY,
+                        size INTEGER NOT NULL,
+                        atime REAL NOT NULL,
+                        hits INTEGER NOT NULL
+                    )
+                    """)
+            self._local.conn = conn
+        return conn
+
+    def _entry_files(self, name):
+        """
+        The paths of the files that belong to an entry
+        """
+        fpath = join(self.dpath, name)
+        return [fpath] + [fpath + suffix for suffix in self.SIDECAR_SUFFIXES]
+
+    def _entry_size(self, name):
+        total = 0
+        for fpath in self._entry_files(name):
+            try:
+                total += os.stat(fpath).st_size
+            except OSError:
+                pass
+        return total
+
+    def add(self, fpath):
+        """
+        Record that an entry was written (or overwritten).
+
+        Args:
+            fpath (str | PathLike): path to the main file of the entry
+        """
+        import time
+        self._flush_touches()
+        name = basename(fpath)
+        conn = self._connect()
+        with conn:
+            # Overwriting an entry keeps its number of hits
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO entries (name, size, atime, hits)
+                VALUES (?, ?, ?, COALESCE(
+                    (SELECT hits FROM entries WHERE name=?), 0))
+                """, (name, self._entry_size(name), time.time(), name))
+
+    def touch(self, fpath, defer=False):
+        """
+        Record that an entry was read.
+
+        Args:
+            fpath (str | PathLike): path to the main file of the entry
+
+            defer (bool):
+                If True, only record the access in memory. Deferred accesses
+                are written to the index in a single transaction the next
+                time this instance uses it (e.g. on a save, a load from disk,
+                :func:`CacheDir.evict`, or :func:`CacheDir.close`), which
+                makes this cheap enough to call on in-memory cache hits.
+                Defaults to False.
+        """
+        import time
+        name = basename(fpath)
+        if defer:
+            now = time.time()
+            with self._deferred_lock:
+                prev = self._deferred.get(name, None)
+                hits = 1 if prev is None else prev[1] + 1
+                self._deferred[name] = (now, hits)
+            return
+        self._flush_touches()
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(
+                'UPDATE entries SET atime=?, hits=hits + 1 WHERE name=?',
+                (time.time(), name))
+        if cursor.rowcount == 0:
+            # Entries written before the budget was used are added lazily
+            self.add(fpath)
+
+    def _flush_touches(self):
+        """
+        Write the deferred touches to the index.
+        """
+        if not self._deferred:
+            return
+        with self._deferred_lock:
+            deferred, self._deferred = self._deferred, {}
+        missing = []
+        conn = self._connect()
+        with conn:
+            for name, (atime, hits) in deferred.items():
+                cursor = conn.execute(
+                    """
+                    UPDATE entries SET atime=MAX(atime, ?), hits=hits + ?
+                    WHERE name=?
+                    """, (atime, hits, name))
+                if cursor.rowcount == 0:
+                    missing.append(name)
+        for name in missing:
+            # Entries written before the budget was used are added lazily
+            self.add(join(self.dpath, name))
+
+    def discard(self, fpath):
+        """
+        Forget an entry, e.g. because it was deleted.
+
+        Args:
+            fpath (str | PathLike): path to the main file of the entry
+        """
+        with self._deferred_lock:
+            self._deferred.pop(basename(fpath), None)
+        conn = self._connect()
+        with conn:
+            conn.execute('DELETE FROM entries WHERE name=?', (basename(fpath),))
+
+    def _order_columns(self):
+        if self.policy == 'lfu':
+            return ('hits', 'atime', 'name')
+        else:
+            return ('atime', 'name')
+
+    def entries(self):
+        """
+        The recorded entries, in the order they would be evicted.
+
+        Returns:
+            List[Dict[str, Any]]: the name, size, last access time, and number
+                of hits of each entry.
+        """
+        self._flush_touches()
+        order = ', '.join(self._order_columns())
+        conn = self._connect()
+        rows = conn.execute(
+            'SELECT name, size, atime, hits FROM entries ORDER BY ' + order)
+        return [{'name': name, 'size': size, 'atime': atime, 'hits': hits}
+                for name, size, atime, hits in rows]
+
+    def _scan(self):
+        """
+        Find the entries and the orphaned sidecar files in the directory.
+
+        Returns:
+            Tuple[Set[str], List[str]]:
+                the names of the entries and the paths of the sidecar files
+                whose entry no longer exists.
+        """
+        names = set()
+        sidecar_names = []
+        with os.scandir(self.dpath) as it:
+            for item in it:
+                if item.name.startswith('.') or not item.is_file():
+                    continue
+                if item.name.endswith(self.SIDECAR_SUFFIXES):
+                    sidecar_names.append(item.name)
+                else:
+                    names.add(item.name)
+        orphans = []
+        for name in sidecar_names:
+            suffix = '.' + name.rsplit('.', 1)[1]
+            # Lock files are left alone, because they might be held
+            if suffix != '.lock' and name[:-len(suffix)] not in names:
+                orphans.append(join(self.dpath, name))
+        return names, orphans
+
+    def _new_rows(self, names):
+        """
+        Index rows for files that are not in the index, using their
+        modification time as the last access time.
+
+        Args:
+            names (Iterable[str]): names of the entries to add
+
+        Returns:
+            List[Tuple[str, int, float]]: the name, size, and access time
+        """
+        new_rows = []
+        for name in names:
+            try:
+                stat = os.stat(join(self.dpath, name))
+            except OSError:
+                continue
+            atime = max(stat.st_atime, stat.st_mtime)
+            new_rows.append((name, self._entry_size(name), atime))
+        return new_rows
+
+    def _synced_entries(self):
+        """
+        The entries the index would have after :func:`CacheDir.sync`, in the
+        order they would be evicted, without changing the index or creating
+        it if it does not exist.
+
+        Returns:
+            List[Dict[str, Any]]
+        """
+        import sqlite3
+        import pathlib
+        names, _ = self._scan()
+        index_fpath = join(self.dpath, self.INDEX_FNAME)
+        rows = []
+        if exists(index_fpath):
+            # Open read only, so the index is not modified
+            index_path = pathlib.Path(os.path.abspath(index_fpath))
+            uri = index_path.as_uri() + '?mode=ro'
+            conn = sqlite3.connect(uri, uri=True, timeout=60)
+            try:
+                rows = conn.execute(
+                    'SELECT name, size, atime, hits FROM entries').fetchall()
+            finally:
+                conn.close()
+        entries = [{'name': name, 'size': size, 'atime': atime, 'hits': hits}
+                   for name, size, atime, hits in rows if name in names]
+        known = {entry['name'] for entry in entries}
+        for name, size, atime in self._new_rows(names - known):
+            entries.append(
+                {'name': name, 'size': size, 'atime': atime, 'hits': 0})
+        with self._deferred_lock:
+            deferred = dict(self._deferred)
+        for entry in entries:
+            if entry['name'] in deferred:
+                atime, hits = deferred[entry['name']]
+                entry['atime'] = max(entry['atime'], atime)
+                entry['hits'] += hits
+        columns = self._order_columns()
+        entries.sort(key=lambda entry: [entry[c] for c in columns])
+        return entries
+
+    def sync(self, dry=False):
+        """
+        Make the index agree with the files on disk. Entries that no longer
+        exist are forgotten, and files that are not in the index are added.
+        Orphaned sidecar files, whose entry no longer exists, are removed.
+
+        Args:
+            dry (bool):
+                if True, report the orphaned sidecar files, but do not remove
+                them or change (or create) the index.
+
+        Returns:
+            List[str]: paths of the removed orphan sidecar files
+        """
+        names, removed = self._scan()
+        if dry:
+            return removed
+        for fpath in removed:
+            os.remove(fpath)
+
+        self._flush_touches()
+        conn = self._connect()
+        known = {row[0] for row in conn.execute('SELECT name FROM entries')}
+        new_rows = self._new_rows(names - known)
+        with conn:
+            conn.executemany(
+                'DELETE FROM entries WHERE name=?',
+                [(name,) for name in known - names])
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO entries (name, size, atime, hits)
+                VALUES (?, ?, ?, 0)
+                """, new_rows)
+        return removed
+
+    def evict(self, keep=None, dry=False):
+        """
+        Remove entries until the directory is within its limits.
+
+        Args:
+            keep (List[str | PathLike] | None):
+                paths of entries that must not be removed.
+
+            dry (bool):
+                if True, report what would be removed, but do not remove it.
+
+        Returns:
+            List[str]: paths of the main files of the removed entries
+        """
+        entries = self.entries()
+        to_remove = self._select_evictions(entries, keep)
+        removed = [join(self.dpath, name) for name in to_remove]
+        if not dry and to_remove:
+            for name in to_remove:
+                for fpath in self._entry_files(name):
+                    if fpath.endswith('.lock'):
+                        continue
+                    try:
+                        os.remove(fpath)
+                    except FileNotFoundError:
+                        pass
+            conn = self._connect()
+            with conn:
+                conn.executemany('DELETE FROM entries WHERE name=?',
+                                 [(name,) for name in to_remove])
+        return removed
+
+    def _select_evictions(self, entries, keep=None):
+        """
+        Choose the entries to remove to be within the limits.
+
+        Args:
+            entries (List[Dict[str, Any]]): entries in eviction order
+            keep (List[str | PathLike] | None): entries that must be kept
+
+        Returns:
+            List[str]: the names of the entries to remove
+        """
+        import time
+        keep_names = {basename(fpath) for fpath in (keep or [])}
+        total_bytes = sum(entry['size'] for entry in entries)
+        num_entries = len(entries)
+        if self.max_age is not None:
+            min_atime = time.time() - self.max_age
+        else:
+            min_atime = None
+
+        to_remove = []
+        for entry in entries:
+            if entry['name'] in keep_names:
+                continue
+            is_expired = min_atime is not None and entry['atime'] < min_atime
+            is_over = (
+                (self.max_entries is not None and
+                 num_entries > self.max_entries) or
+                (self.max_bytes is not None and total_bytes > self.max_bytes))
+            if is_expired or is_over:
+                to_remove.append(entry['name'])
+                num_entries -= 1
+                total_bytes -= entry['size']
+        return to_remove
+
+    def _needs_eviction(self):
+        """
+        Quickly check if any limit is exceeded using only aggregates of the
+        index, so eviction can be checked after every save.
+
+        Returns:
+            bool
+        """
+        import time
+        self._flush_touches()
+        conn = self._connect()
+        num, total, min_atime = conn.execute(
+            'SELECT COUNT(*), SUM(size), MIN(atime) FROM entries').fetchone()
+        if self.max_entries is not None and num > self.max_entries:
+            return True
+        if self.max_bytes is not None and (total or 0) > self.max_bytes:
+            return True
+        if self.max_age is not None and min_atime is not None:
+            if min_atime < time.time() - self.max_age:
+                return True
+        return False
+
+    def gc(self, dry=False):
+        """
+        Synchronize the index with the directory, then evict entries.
+
+        Args:
+            dry (bool):
+                if True, report what would be removed, but do not remove
+                anything or change (or create) the index.
+
+        Returns:
+            List[str]: paths of the main files of the removed entries
+        """
+        if dry:
+            entries = self._synced_entries()
+            return [join(self.dpath, name)
+                    for name in self._select_evictions(entries)]
+        self.sync()
+        return self.evict()
+
+    def total_bytes(self):
+        """
+        Returns:
+            int: the total size of all recorded entries
+        """
+        self._flush_touches()
+        conn = self._connect()
+        total = conn.execute('SELECT SUM(size) FROM entries').fetchone()[0]
+        return total or 0
+
+    def close(self):
+        """
+        Write any deferred touches and close the database connection owned by
+        the calling thread
+        """
+        self._flush_touches()
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def __len__(self):
+        self._flush_touches()
+        conn = self._connect()
+        return conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+
+def _parse_bytes(text):
+    """
+    Parse a human readable number of bytes
+
+    Args:
+        text (str): a number with an optional unit, e.g. "10GB"
+
+    Returns:
+        int
+
+    Example:
+        >>> from ubelt.util_cache import _parse_bytes
+        >>> assert _parse_bytes('123') == 123
+        >>> assert _parse_bytes('1.5KB') == 1500
+        >>> assert _parse_bytes('2 GiB') == 2 * 2 ** 30
+        >>> assert _parse_bytes('10m') == 10 * 10 ** 6
+    """
+    import re
+    units = {
+        '': 1, 'b': 1,
+        'k': 10 ** 3, 'kb': 10 ** 3, 'kib': 2 ** 10,
+        'm': 10 ** 6, 'mb': 10 ** 6, 'mib': 2 ** 20,
+        'g': 10 ** 9, 'gb': 10 ** 9, 'gib': 2 ** 30,
+        't': 10 ** 12, 'tb': 10 ** 12, 'tib': 2 ** 40,
+    }
+    match = re.fullmatch(r'\s*([0-9.]+)\s*([a-zA-Z]*)\s*', text)
+    if match is None or match.group(2).lower() not in units:
+        raise ValueError('Cannot parse bytes from {!r}'.format(text))
+    return int(float(match.group(1)) * units[match.group(2).lower()])
+
+
+def _parse_seconds(text):
+    """
+    Parse a human readable duration
+
+    Args:
+        text (str): a number with an optional unit, e.g. "30d"
+
+    Returns:
+        float
+
+    Example:
+        >>> from ubelt.util_cache import _parse_seconds
+        >>> assert _parse_seconds('90') == 90
+        >>> assert _parse_seconds('1.5h') == 5400
+        >>> assert _parse_seconds('2w') == 2 * 7 * 24 * 3600
+    """
+    import re
+    units = {'': 1, 's': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+    match = re.fullmatch(r'\s*([0-9.]+)\s*([a-zA-Z]*)\s*', text)
+    if match is None or match.group(2).lower() not in units:
+        raise ValueError('Cannot parse a duration from {!r}'.format(text))
+    return float(match.group(1)) * units[match.group(2).lower()]
+
+
+def _cache_gc_cli(argv=None):
+    """
+    The ``python -m ubelt cache-gc`` command line interface.
+
+    Args:
+        argv (List[str] | None): command line arguments
+
+    Returns:
+        int: exit code
+
+    Example:
+        >>> import ubelt as ub
+        >>> from ubelt.util_cache import _cache_gc_cli
+        >>> dpath = ub.Path.appdir('ubelt/tests/cache-gc-cli').delete().ensuredir()
+        >>> for i in range(3):
+        >>>     (dpath / 'file{}.pkl'.format(i)).write_text('x' * 10)
+        >>> _cache_gc_cli([str(dpath), '--max-bytes', '25', '--dry'])
+        >>> assert len(list(dpath.glob('*.pkl'))) == 3
+        >>> _cache_gc_cli([str(dpath), '--max-bytes', '25'])
+        >>> assert len(list(dpath.glob('*.pkl'))) == 2
+    """
+    import argparse
+    from ubelt.util_platform import platform_cache_dir
+    parser = argparse.ArgumentParser(
+        prog='python -m ubelt cache-gc',
+        description=(
+            'Remove the least recently (or frequently) used files from a '
+            'Cacher directory until it is within the given limits.'))
+    parser.add_argument(
+        'dpath', nargs='?', default=join(platform_cache_dir(), 'ubelt'),
+        help='The cache directory. Defaults to the ubelt cache directory.')
+    parser.add_argument('--max-bytes', type=_parse_bytes, default=None,
+                        help='Maximum total size, e.g. 10GB')
+    parser.add_argument('--max-entries', type=int, default=None,
+                        help='Maximum number of entries')
+    parser.add_argument('--max-age', type=_parse_seconds, default=None,
+                        help='Remove entries not accessed within this '
+                        'duration, e.g. 30d')
+    parser.add_argument('--policy', choices=['lru', 'lfu'], default='lru')
+    parser.add_argument('--dry', action='store_true',
+                        help='Only report what would be removed')
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.dpath):
+        print('Cache directory {} does not exist'.format(args.dpath))
+        return 1
+    cache_dir = CacheDir(args.dpath, max_bytes=args.max_bytes,
+                         max_entries=args.max_entries, max_age=args.max_age,
+                         policy=args.policy)
+    try:
+        removed = cache_dir.gc(dry=args.dry)
+        verb = 'Would remove' if args.dry else 'Removed'
+        for fpath in removed:
+            print('{} {}'.format(verb, fpath))
+        print('{} {} entries'.format(verb, len(removed)))
+        if not args.dry:
+            print('The cache uses {} in {} entries'.format(
+                _byte_str(cache_dir.total_bytes()), len(cache_dir)))
+    finally:
+        cache_dir.close()
+    return 0
+
+
+def _no_sidecars(fpath):
+    return []
+
+
+def _stat_or_none(fpath):
+    """
+    Returns:
+        os.stat_result | None: the stat of the file, or None if it does not
+            exist.
+    """
+    try:
+        return os.stat(fpath)
+    except OSError:
+        return None
+
+
+def _hash_product_worker(fpath, hasher, hash_cache):
+    from ubelt.util_hash import hash_file
+    return hash_file(fpath, hasher=hasher, base='hex', cache=hash_cache)
+
+
 def _localnow():
     # Might be nice to have a util_time function add in tzinfo
     import datetime as datetime_mod
@@ -3,14 +3,163 @@ from os import PathLike
 from typing import Callable
 from typing import Any
 from typing import Sequence
+from typing import Iterable
 import datetime
+import concurrent.futures
 import os
 from collections.abc import Generator
+from typing import Dict
+from typing import Tuple
+from typing import IO
+from typing import Type
+from types import TracebackType
+from ubelt.util_hash import FileHashCache
+
+
+class _CacherBackends:
+    backends: Dict[str, Dict[str, Callable | None]]
+    ext_to_backend: Dict[str, str]
+
+    def __init__(self) -> None:
+        ...
+
+    def available(self) -> List[str]:
+        ...
+
+    def __contains__(self, name: str) -> bool:
+        ...
+
+    def register(self,
+                 name: str,
+                 load: Callable[[str, Cacher], object],
+                 dump: Callable[[str, object, Cacher], Any],
+                 exts: List[str] | None = None,
+                 sidecars: Callable[[str], List[str]] | None = None,
+                 load_file: Callable[[IO[bytes], Cacher], object] | None = None,
+                 dump_file: Callable[[IO[bytes], object, Cacher], Any] | None = None) -> None:
+        ...
+
+    def lookup(self, name: str) -> Dict[str, Callable | None]:
+        ...
+
+
+class _FileLock:
+    fpath: str
+    count: int
+
+    def __init__(self, fpath: str) -> None:
+        ...
+
+    @classmethod
+    def coerce(cls, fpath: str | PathLike) -> _FileLock:
+        ...
+
+    def acquire(self) -> None:
+        ...
+
+    def release(self) -> None:
+        ...
+
+    def __enter__(self) -> _FileLock:
+        ...
+
+    def __exit__(self, ex_type: Type[BaseException] | None,
+                 ex_value: BaseException | None,
+                 ex_traceback: TracebackType | None) -> None:
+        ...
+
+
+class _CacherMemory:
+    max_bytes: int | None
+    max_entries: int | None
+
+    def __init__(self,
+                 max_bytes: int | None = ...,
+                 max_entries: int | None = None) -> None:
+        ...
+
+    def get(self, fpath: str) -> Tuple[bool, object, Tuple | None]:
+        ...
+
+    def put(self,
+            fpath: str,
+            data: object,
+            stamp: Tuple | None = None) -> None:
+        ...
+
+    def discard(self, fpath: str) -> None:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+    def info(self) -> Dict[str, int]:
+        ...
+
+
+class _CacherWriter:
+    max_pending: int
+
+    def __init__(self, max_pending: int = 8) -> None:
+        ...
+
+    def submit(self,
+               fpath: str,
+               func: Callable[[], Any],
+               data: object,
+               serialized: bool = False) -> concurrent.futures.Future:
+        ...
+
+    def lookup(
+        self, fpath: str
+    ) -> Tuple[object, bool, concurrent.futures.Future] | None:
+        ...
+
+    def wait(self, fpath: str) -> None:
+        ...
+
+    def flush(self, timeout: float | None = None) -> bool:
+        ...
+
+
+class _CacherSQLiteStore:
+    FNAME: str
+    fpath: str | PathLike
+
+    def __init__(self, fpath: str | PathLike) -> None:
+        ...
+
+    @classmethod
+    def coerce(cls, dpath: str | PathLike) -> _CacherSQLiteStore:
+        ...
+
+    def contains(self, name: str) -> bool:
+        ...
+
+    def get(self, name: str) -> bytes | None:
+        ...
+
+    def get_many(self,
+                 names: List[str],
+                 chunksize: int = 500) -> Dict[str, bytes]:
+        ...
+
+    def put_many(self, rows: Iterable[Tuple[str, str, bytes, str]]) -> None:
+        ...
+
+    def delete(self, name: str) -> None:
+        ...
+
+    def names(self, fname: str) -> List[str]:
+        ...
 
 
 class Cacher:
     VERBOSE: int
     FORCE_DISABLE: bool
+    backends: _CacherBackends
+    memory_tier: _CacherMemory
+    writer: _CacherWriter
     dpath: str | PathLike | None
     fname: str
     depends: str | List[str] | None
@@ -23,6 +172,12 @@ class Cacher:
     hasher: str
     log: Callable[[str], Any]
     backend: str
+    compress: str | None
+    lock: bool
+    budget: CacheDir | None
+    memory: _CacherMemory | None
+    dedup: bool
+    store: str
 
     def __init__(self,
                  fname: str,
@@ -37,7 +192,13 @@ class Cacher:
                  hasher: str = 'sha1',
                  protocol: int = ...,
                  cfgstr: str | None = None,
-                 backend: str = 'auto') -> None:
+                 backend: str = 'auto',
+                 compress: str | bool | None = None,
+                 lock: bool = False,
+                 budget: CacheDir | dict | None = None,
+                 memory: bool | _CacherMemory = False,
+                 dedup: bool = False,
+                 store: str = 'files') -> None:
         ...
 
     @property
@@ -56,6 +217,13 @@ class Cacher:
     def clear(self, cfgstr: str | None = None) -> None:
         ...
 
+    def prune_blobs(self, grace: float = 60.0, dry: bool = False) -> List[str]:
+        ...
+
+    @classmethod
+    def flush(cls, timeout: float | None = None) -> bool:
+        ...
+
     def tryload(self,
                 cfgstr: str | None = None,
                 on_error: str = 'raise') -> None | object:
@@ -64,7 +232,22 @@ class Cacher:
     def load(self, cfgstr: str | None = None) -> object:
         ...
 
-    def save(self, data: object, cfgstr: str | None = None) -> None:
+    def save(self,
+             data: object,
+             cfgstr: str | None = None,
+             background: bool = False,
+             serialized: bool = False) -> None | concurrent.futures.Future:
+        ...
+
+    def save_many(
+            self,
+            items: Dict[Any, object] | Iterable[Tuple[Any, object]]) -> None:
+        ...
+
+    def load_many(self, depends_list: Iterable[Any]) -> List[object | None]:
+        ...
+
+    def locked(self, cfgstr: str | None = None) -> _FileLock:
         ...
 
     def ensure(self, func: Callable, *args, **kwargs):
@@ -80,6 +263,7 @@ class CacheStamp:
     hasher: str
     expires: str | int | datetime.datetime | datetime.timedelta | None
     hash_prefix: None | str | List[str]
+    hash_cache: bool | FileHashCache | None
 
     def __init__(self,
                  fname: str,
@@ -95,7 +279,9 @@ class CacheStamp:
                  hash_prefix: None | str | List[str] = None,
                  expires: str | int | datetime.datetime | datetime.timedelta
                  | None = None,
-                 ext: str = '.pkl') -> None:
+                 ext: str = '.pkl',
+                 hash_cache: bool | FileHashCache | None = None,
+                 lock: bool = False) -> None:
         ...
 
     @property
@@ -105,12 +291,76 @@ class CacheStamp:
     def clear(self):
         ...
 
+    def locked(self) -> _FileLock:
+        ...
+
     def expired(self,
                 cfgstr: Any | None = None,
                 product: Any | None = None) -> bool | str:
         ...
 
+    @classmethod
+    def expired_many(cls,
+                     stamps: Iterable[CacheStamp],
+                     workers: int = 0) -> Dict[CacheStamp, bool | str]:
+        ...
+
     def renew(self,
               cfgstr: None | str = None,
               product: None | str | List = None) -> None | dict:
         ...
+
+
+class CacheDir:
+    INDEX_FNAME: str
+    SIDECAR_SUFFIXES: Tuple[str, ...]
+    dpath: str | PathLike
+    max_bytes: int | None
+    max_entries: int | None
+    max_age: float | None
+    policy: str
+
+    def __init__(self,
+                 dpath: str | PathLike,
+                 max_bytes: int | str | None = None,
+                 max_entries: int | None = None,
+                 max_age: float | str | datetime.timedelta | None = None,
+                 policy: str = 'lru') -> None:
+        ...
+
+    @classmethod
+    def coerce(cls, data: CacheDir | dict | None,
+               dpath: str | PathLike) -> CacheDir | None:
+        ...
+
+    def add(self, fpath: str | PathLike) -> None:
+        ...
+
+    def touch(self, fpath: str | PathLike, defer: bool = False) -> None:
+        ...
+
+    def discard(self, fpath: str | PathLike) -> None:
+        ...
+
+    def entries(self) -> List[Dict[str, Any]]:
+        ...
+
+    def sync(self, dry: bool = False) -> List[str]:
+        ...
+
+    def evict(self,
+              keep: List[str | PathLike] | None = None,
+              dry: bool = False) -> List[str]:
+        ...
+
+    def gc(self, dry: bool = False) -> List[str]:
+        ...
+
+    def total_bytes(self) -> int:
+        ...
+
+    def close(self) -> None:
+        ...
+
+    def __len__(self) -> int:
+        ...
@@ -102,7 +102,7 @@ I'm biased because I wrote it, but subprocess-tee is the only other package I kn
 # )
 # logger = logging.getLogger(__name__)
 
-__all__ = ['cmd']
+__all__ = ['cmd', 'cmd_many', 'acmd']
 
 POSIX: bool = 'posix' in sys.builtin_module_names
 WIN32: bool = sys.platform == 'win32'
@@ -152,9 +152,8 @@ class CmdOutput(dict):
 
 def cmd(command, shell=False, detach=False, verbose=0, tee=None, cwd=None,
         env=None, tee_backend='auto', check=False, system=False, timeout=None,
-        capture=True,
+        capture=True, text=True, stdout_callback=None, stderr_callback=None,
         # Do we support these?
-        # universal_newlines=True,
         # stdout='unused', stderr='unused'
         ):
     """
@@ -194,8 +193,12 @@ def cmd(command, shell=False, detach=False, verbose=0, tee=None, cwd=None,
             environment passed to Popen
 
         tee_backend (str): backend for tee output.
-            Valid choices are: "auto", "select" (POSIX only), and "thread".
-            Defaults to "auto".
+            Valid choices are: "auto", "poll" (POSIX only), "select" (POSIX
+            only), and "thread". The "select" and "thread" backends read and
+            write one line at a time. The "poll" backend reads all available
+            output in large chunks and writes each chunk at once, which is
+            much faster for commands that print many lines. Defaults to
+            "auto", which is currently "thread".
 
         check (bool):
             if True, check that the return code was zero before returning,
@@ -216,6 +219,21 @@ def cmd(command, shell=False, detach=False, verbose=0, tee=None, cwd=None,
             if True, the stdout/stderr are captured and returned in the
             information dictionary. Ignored if detach or system is True.
 
+        text (bool):
+            if True, the output is decoded to text with universal newlines,
+            otherwise it is returned (and passed to callbacks) as bytes.
+            Defaults to True.
+
+        stdout_callback (Callable[[str | bytes], Any] | None):
+            If specified, called with each chunk of stdout as soon as it is
+            read. Chunks are not split on lines. Combined with
+            ``capture=False`` the output is streamed without being retained,
+            which allows processing large outputs in constant memory. Cannot
+            be used with detach or system.
+
+        stderr_callback (Callable[[str | bytes], Any] | None):
+            The same as ``stdout_callback``, but for stderr.
+
     Returns:
         dict | CmdOutput:
             info - information about command status.
@@ -320,6 +338,18 @@ def cmd(command, shell=False, detach=False, verbose=0, tee=None, cwd=None,
         >>> assert fpath1.read_text() == ''
         >>> assert fpath2.read_text().strip() == 'writing2'
 
+    Example:
+        >>> # Stream large binary output to a file without keeping it in memory
+        >>> import ubelt as ub
+        >>> import sys
+        >>> fpath = ub.Path.appdir('ubelt', 'test').ensuredir() / 'cmdout.bin'
+        >>> script = 'import sys; sys.stdout.buffer.write(bytes(range(256)) * 4096)'
+        >>> with open(fpath, 'wb') as file:
+        >>>     info = ub.cmd([sys.executable, '-c', script], text=False,
+        >>>                   capture=False, stdout_callback=file.write)
+        >>> assert info['out'] is None
+        >>> assert fpath.read_bytes() == bytes(range(256)) * 4096
+
     Example:
         >>> # Can also use ub.cmd to call os.system
         >>> import pytest
@@ -340,50 +370,25 @@ def cmd(command, shell=False, detach=False, verbose=0, tee=None, cwd=None,
 
     import subprocess
     # TODO: stdout, stderr - experimental - custom file to pipe stdout/stderr to
-    # Determine if command is specified as text or a tuple
-    if isinstance(command, str):
-        command_text = command
-        command_tup = None
-    elif isinstance(command, os.PathLike):
-        command_text = os.fspath(command)
-        command_tup = None
-    else:
-        import shlex
-        command_parts = []
-        # Allow the user to specify paths as part of the command
-        for part in command:
-            if isinstance(part, os.PathLike):
-                part = os.fspath(part)
-            command_parts.append(part)
-        command_tup = list(command_parts)
-        command_text = ' '.join(list(map(shlex.quote, command_tup)))
-
-    # Inputs can either be text or tuple based. On UNIX we ensure conversion
-    # to text if shell is True, and to tuple if shell is False. On windows,
-    # the input is text if shell is True, but can be either if shell is
-    # False as noted in [SO_33560364]_.
-    if shell or system:
-        # When shell=True, args is sent to the shell (e.g. bin/sh) as text
-        args = command_text
-    else:
-        # When shell=False, args is a list of executable and arguments
-        if command_tup is None:
-            if sys.platform.startswith('win32'):  # nocover
-                # On windows when shell=False, args can be a str | List[str]
-                # as noted in [SO_33560364]
-                args = command_text
-            else:
-                # On linux when shell=False, args must be a List[str]
-                import shlex
-                args = shlex.split(command_text)
-        else:
-            args = command_tup
+    command_text, args = _rectify_command(command, shell=shell or system)
 
     if tee is None:
         tee = verbose > 0
 
-    if tee and tee_backend not in {'auto', 'thread', 'select'}:
-        raise ValueError('tee_backend must be select, thread, or auto')
+    has_callback = stdout_callback is not None or stderr_callback is not None
+    if has_callback and (detach or system):
+        raise ValueError(
+            'stdout_callback and stderr_callback cannot be used with detach '
+            'or system')
+
+    valid_backends = {'auto', 'thread', 'select', 'poll'}
+    if (tee or has_callback) and tee_backend not in valid_backends:
+        raise ValueError('tee_backend must be poll, select, thread, or auto')
+
+    # Output is read in chunks when there are callbacks, bytes are teed, or
+    # the poll backend is used.
+    streaming = not (detach or system) and (has_callback or (
+        tee and capture and (not text or tee_backend == 'poll')))
 
     # note: we use ``tee`` as a proxy for "show"
     # we may upgrade show to an actual argument
@@ -397,28 +402,23 @@ def cmd(command, shell=False, detach=False, verbose=0, tee=None, cwd=None,
         tee = False
 
     if verbose > 1:
-        import platform
-        import getpass
-        from ubelt import shrinkuser
-        if verbose > 2:
-            try:
-                log('┌─── START CMD ───')
-            except Exception:  # nocover
-                log('+=== START CMD ===')
-        cwd_ = os.getcwd() if cwd is None else cwd
-        compname = platform.node()
-        username = getpass.getuser()
-        cwd_ = shrinkuser(cwd_)
-        ps1 = '[ubelt.cmd] {}@{}:{}$ '.format(username, compname, cwd_)
-        log(ps1 + command_text)
+        _log_command_start(command_text, cwd, verbose, log)
 
     # Create a new process to execute the command
     def make_proc():
         # delay the creation of the process until we validate all args
         popen_kwargs = {'cwd': cwd, 'env': env, 'shell': shell}
-        popen_kwargs['universal_newlines'] = True
-
-        if capture:
+        # When streaming, the raw bytes are read and decoded by us
+        popen_kwargs['universal_newlines'] = text and not streaming
+
+        if streaming:
+            for key, callback in [('stdout', stdout_callback),
+                                  ('stderr', stderr_callback)]:
+                if capture or callback is not None:
+                    popen_kwargs[key] = subprocess.PIPE
+                elif not show:
+                    popen_kwargs[key] = subprocess.DEVNULL
+        elif capture:
             popen_kwargs['stdout'] = subprocess.PIPE
             popen_kwargs['stderr'] = subprocess.PIPE
         elif not show:
@@ -451,7 +451,15 @@ def cmd(command, shell=False, detach=False, verbose=0, tee=None, cwd=None,
         if verbose > 1:  # nocover
             log('...detaching')
     else:
-        if tee:
+        if streaming:
+            proc = make_proc()
+            with proc:
+                out, err = _stream_output(
+                    proc, text=text, capture=capture, tee=show,
+                    stdout_callback=stdout_callback,
+                    stderr_callback=stderr_callback, backend=tee_backend,
+                    timeout=timeout, command_text=command_text)
+        elif tee:
             # tee means both capture and show are true.
             # We logging stdout and stderr, while simultaneously piping it to
             # another stream.
@@ -515,11 +523,7 @@ def cmd(command, shell=False, detach=False, verbose=0, tee=None, cwd=None,
 
     if not detach:
         if verbose > 2:
-            # https://en.wikipedia.org/wiki/Box-drawing_character
-            try:
-                log('└─── END CMD ───')
-            except Exception:  # nocover
-                log('L___ END CMD ___')
+            _log_command_end(log)
 
         if check:
             if info['ret'] != 0:
@@ -528,6 +532,616 @@ def cmd(command, shell=False, detach=False, verbose=0, tee=None, cwd=None,
     return info
 
 
+def cmd_many(commands, max_concurrent=None, shell=False, cwd=None, env=None,
+             timeout=None, check=False):
+    """
+    Executes many commands in subprocesses, with at most ``max_concurrent``
+    running at once, and yields the result of each as it finishes.
+
+    Unlike running :func:`cmd` in a :class:`ubelt.util_futures.JobPool`, this
+    does not use a thread per process (and a thread per pipe to read its
+    output). The output pipes of all running processes are read in a single
+    :mod:`selectors` loop in the calling thread. On Windows, where pipes
+    cannot be selected, this falls back to running :func:`cmd` in a thread
+    pool.
+
+    Args:
+        commands (Iterable[str | List[str] | Dict]):
+            The commands to run. Each item is anything accepted by
+            :func:`cmd`, or a dictionary with a "command" key and optional
+            "shell", "cwd", "env", "timeout", and "check" keys that override
+            the values given to this function for that command.
+
+        max_concurrent (int | None):
+            The maximum number of processes to run at once. Defaults to the
+            number of CPUs.
+
+        shell (bool):
+            if True, processes are run in a shell. Defaults to False.
+
+        cwd (str | PathLike | None):
+            Path to run the commands. Defaults to current working directory if
+            unspecified.
+
+        env (Dict[str, str] | None):
+            environment passed to Popen
+
+        timeout (float | None):
+            If a process does not complete in ``timeout`` seconds after it
+            starts, it is killed and a :class:`subprocess.TimeoutExpired` is
+            raised.
+
+        check (bool):
+            if True, raise a :class:`subprocess.CalledProcessError` when a
+            process finishes with a non-zero return code. Defaults to False.
+
+    Yields:
+        CmdOutput:
+            The captured standard out, standard error, and return code of a
+            finished process, in the order they finish. The "index" key is the
+            position of its command in ``commands``.
+
+    Raises:
+        ValueError - on an invalid configuration
+        subprocess.TimeoutExpired - if a timeout limit is exceeded
+        subprocess.CalledProcessError - if check and a return value is non zero
+
+    Note:
+        If an error is raised, or the generator is closed before it finishes,
+        all processes that are still running are killed.
+
+    Example:
+        >>> import ubelt as ub
+        >>> commands = ['echo {}'.format(i) for i in range(5)]
+        >>> results = list(ub.cmd_many(commands, max_concurrent=2))
+        >>> results = sorted(results, key=lambda info: info['index'])
+        >>> print([info['out'].strip() for info in results])
+        ['0', '1', '2', '3', '4']
+
+    Example:
+        >>> import ubelt as ub
+        >>> import subprocess
+        >>> import pytest
+        >>> import sys
+        >>> commands = [
+        >>>     {'command': [sys.executable, '-c', 'import os; print(os.getcwd())'],
+        >>>      'cwd': ub.Path.appdir('ubelt/tests/cmd_many').ensuredir()},
+        >>>     {'command': 'exit 3', 'shell': True},
+        >>> ]
+        >>> results = sorted(ub.cmd_many(commands), key=lambda info: info['index'])
+        >>> assert results[0]['out'].strip().endswith('cmd_many')
+        >>> assert results[1]['ret'] == 3
+        >>> with pytest.raises(subprocess.CalledProcessError):
+        >>>     list(ub.cmd_many(commands, check=True))
+    """
+    defaults = {'shell': shell, 'cwd': cwd, 'env': env, 'timeout': timeout,
+                'check': check}
+    jobs = []
+    for index, item in enumerate(commands):
+        options = defaults.copy()
+        if isinstance(item, dict):
+            item = item.copy()
+            if 'command' not in item:
+                raise ValueError('command dictionaries require a "command" key')
+            command = item.pop('command')
+            unknown = set(item) - set(defaults)
+            if unknown:
+                raise ValueError('unknown command options: {}'.format(
+                    sorted(unknown)))
+            options.update(item)
+        else:
+            command = item
+        jobs.append(_ManyCmdJob(index, command, **options))
+
+    if max_concurrent is None:
+        max_concurrent = os.cpu_count() or 1
+    max_concurrent = max(1, max_concurrent)
+
+    if WIN32:  # nocover
+        yield from _cmd_many_threads(jobs, max_concurrent)
+    else:
+        yield from _cmd_many_select(jobs, max_concurrent)
+
+
+class _ManyCmdJob(object):
+    """
+    The state of one process run by :func:`cmd_many`.
+    """
+
+    def __init__(self, index, command, shell=False, cwd=None, env=None,
+                 timeout=None, check=False):
+        self.index = index
+        self.command_text, self.args = _rectify_command(command, shell=shell)
+        self.shell = shell
+        self.cwd = cwd
+        self.env = env
+        self.timeout = timeout
+        self.check = check
+        self.proc = None
+        self.deadline = None
+        self.encoding = None
+        self.chunks = {'out': [], 'err': []}
+        self.num_open = 0
+
+    def start(self, selector):
+        """
+        Starts the process and registers its output pipes.
+
+        Args:
+            selector (selectors.BaseSelector): selector to register with
+        """
+        import locale
+        import selectors
+        import subprocess
+        from time import monotonic as _time
+        self.proc = subprocess.Popen(
+            self.args, cwd=self.cwd, env=self.env, shell=self.shell,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if self.timeout is not None:
+            self.deadline = _time() + self.timeout
+        # The pipes are read as bytes and decoded when the job finishes with
+        # the same encoding that text mode would use.
+        self.encoding = locale.getpreferredencoding(False)
+        selector.register(self.proc.stdout, selectors.EVENT_READ,
+                          (self, 'out'))
+        selector.register(self.proc.stderr, selectors.EVENT_READ,
+                          (self, 'err'))
+        self.num_open = 2
+
+    def text(self, key):
+        """
+        Returns:
+            str: the captured stdout ("out") or stderr ("err")
+        """
+        data = b''.join(self.chunks[key])
+        return _decode_output(data, self.encoding)
+
+    def output(self):
+        """
+        Returns:
+            CmdOutput
+        """
+        info = CmdOutput(**{
+            'out': self.text('out'),
+            'err': self.text('err'),
+            'ret': self.proc.returncode,
+            'proc': self.proc,
+            'cwd': self.cwd,
+            'command': self.command_text,
+            'index': self.index,
+        })
+        # For subprocess compatibility
+        info.args = self.args
+        return info
+
+    def kill(self):
+        """
+        Kills the process if it is still running and closes its pipes.
+        """
+        if self.proc is not None:
+            if self.proc.poll() is None:
+                self.proc.kill()
+                self.proc.wait()
+            self.proc.stdout.close()
+            self.proc.stderr.close()
+
+
+def _cmd_many_select(jobs, max_concurrent):
+    """
+    The POSIX implementation of :func:`cmd_many`, which reads the output of
+    all running processes in a single selector loop.
+
+    Args:
+        jobs (List[_ManyCmdJob]): the commands to run
+        max_concurrent (int): the maximum number of running processes
+
+    Yields:
+        CmdOutput
+    """
+    import collections
+    import selectors
+    import subprocess
+    import time
+    from time import monotonic as _time
+    # Interval to poll processes that closed their pipes but are still running
+    poll_interval = 0.001
+    pending = collections.deque(jobs)
+    running = []
+    selector = selectors.DefaultSelector()
+    try:
+        while pending or running:
+            while pending and len(running) < max_concurrent:
+                job = pending.popleft()
+                running.append(job)
+                job.start(selector)
+
+            wait = None
+            deadlines = [job.deadline for job in running
+                         if job.deadline is not None]
+            if deadlines:
+                wait = max(0, min(deadlines) - _time())
+            if any(job.num_open == 0 for job in running):
+                wait = poll_interval if wait is None else min(wait, poll_interval)
+
+            if selector.get_map():
+                for key, _ in selector.select(wait):
+                    job, name = key.data
+                    chunk = os.read(key.fd, 65536)
+                    if chunk:
+                        job.chunks[name].append(chunk)
+                    else:
+                        selector.unregister(key.fileobj)
+                        key.fileobj.close()
+                        job.num_open -= 1
+            else:
+                time.sleep(wait)
+
+            now = _time()
+            finished = []
+            for job in running:
+                if job.num_open == 0 and job.proc.poll() is not None:
+                    finished.append(job)
+                elif job.deadline is not None and now >= job.deadline:
+                    # Following the standard library implementation of
+                    # :func:`subprocess.run`, we kill (not terminate) the
+                    # process when the timeout expires.
+                    job.kill()
+                    raise subprocess.TimeoutExpired(
+                        job.command_text, job.timeout, job.text('out'),
+                        job.text('err'))
+            for job in finished:
+                running.remove(job)
+                info = job.output()
+                if job.check and info['ret'] != 0:
+                    raise subprocess.CalledProcessError(
+                        info['ret'], info['command'], info['out'], info['err'])
+                yield info
+    finally:
+        selector.close()
+        for job in running:
+            job.kill()
+
+
+def _cmd_many_threads(jobs, max_concurrent):  # nocover
+    """
+    The Windows implementation of :func:`cmd_many`, which runs :func:`cmd` in
+    a thread pool.
+
+    Args:
+        jobs (List[_ManyCmdJob]): the commands to run
+        max_concurrent (int): the maximum number of running processes
+
+    Yields:
+        CmdOutput
+    """
+    from ubelt.util_futures import JobPool
+    pool = JobPool(mode='thread', max_workers=max_concurrent)
+    with pool:
+        for job in jobs:
+            future = pool.submit(cmd, job.args, shell=job.shell, cwd=job.cwd,
+                                 env=job.env, timeout=job.timeout,
+                                 check=job.check)
+            future.index = job.index
+        for future in pool.as_completed():
+            info = future.result()
+            info['index'] = future.index
+            yield info
+
+
+async def acmd(command, shell=False, verbose=0, tee=None, cwd=None,
+               env=None, check=False, timeout=None, capture=True):
+    """
+    Executes a command in a subprocess without blocking the event loop.
+
+    This is the :mod:`asyncio` version of :func:`cmd`. The command is
+    specified in the same way and the result is the same :class:`CmdOutput`,
+    except the "proc" is an :class:`asyncio.subprocess.Process`. The output
+    is read by the event loop, so many commands can be awaited concurrently
+    (e.g. with :func:`asyncio.gather`) without a thread pool.
+
+    Args:
+        command (str | List[str]):
+            command string, tuple of executable and args, or shell command.
+
+        shell (bool):
+            if True, process is run in shell. Defaults to False.
+
+        verbose (int):
+            verbosity mode. Can be 0, 1, 2, or 3. Defaults to 0.
+
+        tee (bool | None):
+            if True, simultaneously writes to stdout while capturing output
+            from the command. If not specified, defaults to True if verbose >
+            0.
+
+        cwd (str | PathLike | None):
+            Path to run command. Defaults to current working directory if
+            unspecified.
+
+        env (Dict[str, str] | None):
+            environment passed to the subprocess
+
+        check (bool):
+            if True, check that the return code was zero before returning,
+            otherwise raise a :class:`subprocess.CalledProcessError`.
+            Defaults to False.
+
+        timeout (float | None):
+            If the process does not complete in ``timeout`` seconds, it is
+            killed and a :class:`subprocess.TimeoutExpired` is raised.
+
+        capture (bool):
+            if True, the stdout/stderr are captured and returned in the
+            information dictionary.
+
+    Returns:
+        CmdOutput: the captured standard out, standard error, and the return
+        code.
+
+    Raises:
+        subprocess.TimeoutExpired - if the timeout limit is exceeded
+        subprocess.CalledProcessError - if check and the return value is non zero
+
+    Note:
+        If the awaiting task is cancelled, the process is killed.
+
+    Example:
+        >>> import asyncio
+        >>> import ubelt as ub
+        >>> async def main():
+        >>>     return await asyncio.gather(
+        >>>         ub.acmd('echo first'),
+        >>>         ub.acmd(['echo', 'second']),
+        >>>         ub.acmd('echo third && exit 2', shell=True),
+        >>>     )
+        >>> run = getattr(asyncio, 'run', None) or asyncio.get_event_loop().run_until_complete
+        >>> infos = run(main())
+        >>> print([info['out'].strip() for info in infos])
+        ['first', 'second', 'third']
+        >>> print([info['ret'] for info in infos])
+        [0, 0, 2]
+    """
+    import asyncio
+    import subprocess
+    log = print
+    command_text, args = _rectify_command(command, shell=shell)
+    if not shell and isinstance(args, str):  # nocover
+        # create_subprocess_exec requires the executable and its arguments
+        import shlex
+        args = shlex.split(args, posix=not WIN32)
+
+    if tee is None:
+        tee = verbose > 0
+    # note: we use ``tee`` as a proxy for "show"
+    show = tee
+    if show and not capture:
+        tee = False
+
+    if verbose > 1:
+        _log_command_start(command_text, cwd, verbose, log)
+
+    if capture:
+        stdout = stderr = subprocess.PIPE
+    elif not show:
+        stdout = stderr = subprocess.DEVNULL
+    else:
+        stdout = stderr = None
+    popen_kwargs = {'stdout': stdout, 'stderr': stderr, 'cwd': cwd,
+                    'env': env}
+    if shell:
+        proc = await asyncio.create_subprocess_shell(
+            command_text, **popen_kwargs)
+    else:
+        proc = await asyncio.create_subprocess_exec(*args, **popen_kwargs)
+
+    import locale
+    encoding = locale.getpreferredencoding(False)
+    chunks = {'out': [], 'err': []}
+
+    async def _read_stream(stream, key, tee_stream):
+        if tee_stream is not None:
+            decoder = _TextChunkDecoder(encoding)
+        while True:
+            chunk = await stream.read(65536)
+            if not chunk:
+                break
+            chunks[key].append(chunk)
+            if tee_stream is not None:
+                tee_stream.write(decoder.decode(chunk))
+                tee_stream.flush()
+        if tee_stream is not None:
+            tee_stream.write(decoder.flush())
+            tee_stream.flush()
+
+    async def _communicate():
+        if capture:
+            await asyncio.gather(
+                _read_stream(proc.stdout, 'out', sys.stdout if tee else None),
+                _read_stream(proc.stderr, 'err', sys.stderr if tee else None))
+        return await proc.wait()
+
+    def _captured(key):
+        if not capture:
+            return None
+        return _decode_output(b''.join(chunks[key]), encoding)
+
+    try:
+        if timeout is None:
+            ret = await _communicate()
+        else:
+            ret = await asyncio.wait_for(_communicate(), timeout)
+    except asyncio.TimeoutError:
+        # Following the standard library implementation of
+        # :func:`subprocess.run`, we kill (not terminate) the process when the
+        # timeout expires.
+        await _kill_async_proc(proc)
+        raise subprocess.TimeoutExpired(
+            command_text, timeout, _captured('out'), _captured('err'))
+    except BaseException:
+        # Including cancellation of the awaiting task
+        await _kill_async_proc(proc)
+        raise
+
+    info = CmdOutput(**{
+        'out': _captured('out'),
+        'err': _captured('err'),
+        'ret': ret,
+        'proc': proc,
+        'cwd': cwd,
+        'command': command_text,
+    })
+    # For subprocess compatibility
+    info.args = args
+
+    if verbose > 2:
+        _log_command_end(log)
+
+    if check:
+        if info['ret'] != 0:
+            raise subprocess.CalledProcessError(
+                info['ret'], info['command'], info['out'], info['err'])
+    return info
+
+
+async def _kill_async_proc(proc):
+    """
+    Kills an :class:`asyncio.subprocess.Process` if it is still running and
+    waits for it to exit.
+    """
+    if proc.returncode is None:
+        try:
+            proc.kill()
+        except ProcessLookupError:  # nocover
+            pass
+        await proc.wait()
+
+
+def _log_command_start(command_text, cwd, verbose, log):
+    """
+    Logs the command, as if it were typed in a terminal, when verbose > 1.
+    """
+    import platform
+    import getpass
+    from ubelt import shrinkuser
+    if verbose > 2:
+        try:
+            log('┌─── START CMD ───')
+        except Exception:  # nocover
+            log('+=== START CMD ===')
+    cwd_ = os.getcwd() if cwd is None else cwd
+    compname = platform.node()
+    username = getpass.getuser()
+    cwd_ = shrinkuser(cwd_)
+    ps1 = '[ubelt.cmd] {}@{}:{}$ '.format(username, compname, cwd_)
+    log(ps1 + command_text)
+
+
+def _log_command_end(log):
+    """
+    Logs the end of a command when verbose > 2.
+    """
+    # https://en.wikipedia.org/wiki/Box-drawing_character
+    try:
+        log('└─── END CMD ───')
+    except Exception:  # nocover
+        log('L___ END CMD ___')
+
+
+def _decode_output(data, encoding=None, errors=None):
+    r"""
+    Decodes the captured output of a process like
+    :func:`subprocess.Popen.communicate` does when ``universal_newlines`` is
+    True.
+
+    Args:
+        data (bytes): the raw output
+
+        encoding (str | None):
+            Defaults to the preferred encoding of the locale.
+
+        errors (str | None): Defaults to "strict".
+
+    Returns:
+        str
+
+    Example:
+        >>> from ubelt.util_cmd import _decode_output
+        >>> _decode_output(b'a\r\nb\rc\n', 'utf-8')
+        'a\nb\nc\n'
+    """
+    if encoding is None:
+        import locale
+        encoding = locale.getpreferredencoding(False)
+    if errors is None:
+        errors = 'strict'
+    text = data.decode(encoding, errors)
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def _rectify_command(command, shell=False):
+    """
+    Converts a command into the text that would be typed in a terminal and
+    the args that are passed to :class:`subprocess.Popen`.
+
+    Args:
+        command (str | PathLike | List[str | PathLike]): the command
+
+        shell (bool): if True, the args are the command text.
+
+    Returns:
+        Tuple[str, str | List[str]]: command_text, args
+
+    Example:
+        >>> from ubelt.util_cmd import _rectify_command
+        >>> import sys
+        >>> command_text, args = _rectify_command(['echo', 'a b'])
+        >>> print(command_text)
+        echo 'a b'
+        >>> if not sys.platform.startswith('win32'):
+        >>>     assert _rectify_command('echo "a b"') == ('echo "a b"', ['echo', 'a b'])
+        >>> assert _rectify_command('echo hi', shell=True) == ('echo hi', 'echo hi')
+    """
+    # Determine if command is specified as text or a tuple
+    if isinstance(command, str):
+        command_text = command
+        command_tup = None
+    elif isinstance(command, os.PathLike):
+        command_text = os.fspath(command)
+        command_tup = None
+    else:
+        import shlex
+        command_parts = []
+        # Allow the user to specify paths as part of the command
+        for part in command:
+            if isinstance(part, os.PathLike):
+                part = os.fspath(part)
+            command_parts.append(part)
+        command_tup = list(command_parts)
+        command_text = ' '.join(list(map(shlex.quote, command_tup)))
+
+    # Inputs can either be text or tuple based. On UNIX we ensure conversion
+    # to text if shell is True, and to tuple if shell is False. On windows,
+    # the input is text if shell is True, but can be either if shell is
+    # False as noted in [SO_33560364]_.
+    if shell:
+        # When shell=True, args is sent to the shell (e.g. bin/sh) as text
+        args = command_text
+    else:
+        # When shell=False, args is a list of executable and arguments
+        if command_tup is None:
+            if sys.platform.startswith('win32'):  # nocover
+                # On windows when shell=False, args can be a str | List[str]
+                # as noted in [SO_33560364]
+                args = command_text
+            else:
+                # On linux when shell=False, args must be a List[str]
+                import shlex
+                args = shlex.split(command_text)
+        else:
+            args = command_tup
+    return command_text, args
+
+
 def _textio_iterlines(stream):
     """
     Iterates over lines in a TextIO stream until an EOF is encountered.
@@ -883,6 +1497,292 @@ def _tee_output(proc, stdout=None, stderr=None, backend='thread',
     return out, err
 
 
+class _TextChunkDecoder(object):
+    r"""
+    Incrementally decodes chunks of process output with universal newlines,
+    which gives the same text as :func:`_decode_output` on the joined chunks.
+
+    Example:
+        >>> from ubelt.util_cmd import _TextChunkDecoder
+        >>> decoder = _TextChunkDecoder('utf-8')
+        >>> data = 'a\r\nb\rc\N{SNOWMAN}\n'.encode('utf-8')
+        >>> parts = [decoder.decode(data[i:i + 1]) for i in range(len(data))]
+        >>> parts.append(decoder.flush())
+        >>> assert ''.join(parts) == 'a\nb\nc\N{SNOWMAN}\n'
+    """
+
+    def __init__(self, encoding=None, errors=None):
+        """
+        Args:
+            encoding (str | None):
+                Defaults to the preferred encoding of the locale.
+            errors (str | None): Defaults to "strict".
+        """
+        import codecs
+        if encoding is None:
+            import locale
+            encoding = locale.getpreferredencoding(False)
+        self._decoder = codecs.getincrementaldecoder(encoding)(
+            errors or 'strict')
+        self._held = ''
+
+    def decode(self, chunk):
+        """
+        Args:
+            chunk (bytes): the next chunk of output
+
+        Returns:
+            str: the text that can be decoded so far
+        """
+        text = self._held + self._decoder.decode(chunk)
+        # A trailing carriage return might be part of a CRLF
+        if text.endswith('\r'):
+            self._held = '\r'
+            text = text[:-1]
+        else:
+            self._held = ''
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+
+    def flush(self):
+        """
+        Returns:
+            str: the remaining text after the last chunk
+        """
+        text = self._held + self._decoder.decode(b'', final=True)
+        self._held = ''
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def _proc_iterchunks_poll(proc, timeout=None):
+    """
+    Iterates over chunks of raw output from the piped streams of a process as
+    they are read. UNIX only.
+
+    The pipes are made non-blocking, and each time one is ready up to 1 MiB of
+    its available output is read and yielded as a single chunk. The read is
+    bounded so a fast producer cannot make the chunks (and memory use) grow
+    without limit, and so the timeout is checked between chunks.
+
+    Args:
+        proc (subprocess.Popen): the process being run
+
+        timeout (None | float): amount of time to allow before stopping
+
+    Yields:
+        Tuple[str, bytes]:
+            "out" or "err" and the chunk, or TimeoutExpired twice if the
+            timeout expires.
+    """
+    import selectors
+    import subprocess
+    from time import monotonic as _time
+    if timeout is not None:
+        deadline = _time() + timeout
+    with selectors.DefaultSelector() as selector:
+        for key, stream in [('out', proc.stdout), ('err', proc.stderr)]:
+            if stream is not None:
+                os.set_blocking(stream.fileno(), False)
+                selector.register(stream, selectors.EVENT_READ, key)
+        while selector.get_map():
+            wait = None
+            if timeout is not None:
+                wait = deadline - _time()
+                if wait <= 0:
+                    yield subprocess.TimeoutExpired, subprocess.TimeoutExpired
+                    return  # nocover
+            for selkey, _ in selector.select(wait):
+                try:
+                    chunk = os.read(selkey.fd, 1 << 20)
+                except BlockingIOError:  # nocover
+                    continue
+                if chunk:
+                    yield selkey.data, chunk
+                else:
+                    selector.unregister(selkey.fileobj)
+
+
+def _proc_iterchunks_thread(proc, timeout=None):
+    """
+    Iterates over chunks of raw output from the piped streams of a process as
+    they are read. Each stream is read in its own thread.
+
+    Args:
+        proc (subprocess.Popen): the process being run
+
+        timeout (None | float): amount of time to allow before stopping
+
+    Yields:
+        Tuple[str, bytes]:
+            "out" or "err" and the chunk, or TimeoutExpired twice if the
+            timeout expires.
+    """
+    import queue
+    import subprocess
+    import threading
+    from time import monotonic as _time
+    out_queue = queue.Queue()
+
+    def _read_worker(key, fd):
+        while True:
+            try:
+                chunk = os.read(fd, 65536)
+            except OSError:  # nocover
+                # The stream was closed because the process was killed
+                chunk = b''
+            out_queue.put((key, chunk))
+            if not chunk:
+                break
+
+    num_open = 0
+    for key, stream in [('out', proc.stdout), ('err', proc.stderr)]:
+        if stream is not None:
+            thread = threading.Thread(target=_read_worker,
+                                      args=(key, stream.fileno()))
+            thread.daemon = True
+            thread.start()
+            num_open += 1
+
+    if timeout is not None:
+        deadline = _time() + timeout
+    while num_open:
+        wait = None
+        if timeout is not None:
+            wait = max(0, deadline - _time())
+        try:
+            key, chunk = out_queue.get(timeout=wait)
+        except queue.Empty:
+            yield subprocess.TimeoutExpired, subprocess.TimeoutExpired
+            return  # nocover
+        if chunk:
+            yield key, chunk
+        else:
+            num_open -= 1
+
+
+def _stream_output(proc, text=True, capture=True, tee=False,
+                   stdout_callback=None, stderr_callback=None,
+                   backend='auto', timeout=None, command_text=None):
+    """
+    Reads the output of a process in chunks as it arrives, and passes each
+    chunk to the callbacks and optionally the tee streams. Then waits for the
+    process to exit, which may happen after it closes its output streams.
+
+    Only the streams that the process was created with
+    ``stdout=subprocess.PIPE`` or ``stderr=subprocess.PIPE`` are read, and
+    they must be in binary mode.
+
+    Args:
+        proc (subprocess.Popen): the process being run
+
+        text (bool): if True, decode the chunks and the captured output
+
+        capture (bool): if True, return the output
+
+        tee (bool): if True, write the output to sys.stdout and sys.stderr
+
+        stdout_callback (Callable | None): called with each stdout chunk
+
+        stderr_callback (Callable | None): called with each stderr chunk
+
+        backend (str): poll, select, thread, or auto. The "poll" and "select"
+            backends are the same here.
+
+        timeout (None | float): time before raising a timeout error
+
+        command_text (str): used only to construct a TimeoutExpired error.
+
+    Returns:
+        Tuple[str | bytes | None, str | bytes | None]:
+            recorded stdout and stderr
+    """
+    import subprocess
+    from time import monotonic as _time
+    if timeout is not None:
+        deadline = _time() + timeout
+    if backend == 'auto':
+        backend = 'poll' if POSIX else 'thread'
+    if backend in {'poll', 'select'}:
+        if not POSIX:  # nocover
+            raise NotImplementedError(
+                '{} is only available on posix'.format(backend))
+        _proc_iterchunks = _proc_iterchunks_poll
+    elif backend == 'thread':
+        _proc_iterchunks = _proc_iterchunks_thread
+    else:  # nocover
+        raise AssertionError(
+            'Invalid backend, but the check should have already a happened')
+
+    encoding = None
+    if text:
+        import locale
+        encoding = locale.getpreferredencoding(False)
+    captured = {'out': [], 'err': []}
+    decoders = {}
+    if text:
+        decoders = {'out': _TextChunkDecoder(encoding),
+                    'err': _TextChunkDecoder(encoding)}
+    callbacks = {'out': stdout_callback, 'err': stderr_callback}
+    tee_streams = {'out': sys.stdout, 'err': sys.stderr} if tee else {}
+
+    def _emit(key, data):
+        if not data:
+            return
+        tee_stream = tee_streams.get(key, None)
+        if tee_stream is not None:
+            if text:
+                tee_stream.write(data)
+            else:
+                buffer = getattr(tee_stream, 'buffer', None)
+                if buffer is not None:
+                    tee_stream.flush()
+                    buffer.write(data)
+                else:
+                    tee_stream.write(data.decode('utf-8', 'backslashreplace'))
+            tee_stream.flush()
+        callback = callbacks[key]
+        if callback is not None:
+            callback(data)
+
+    def _finish(key):
+        if not capture:
+            return None
+        data = b''.join(captured[key])
+        if text:
+            return _decode_output(data, encoding)
+        return data
+
+    def _timeout_error():
+        # Following the standard library implementation of
+        # :func:`subprocess.run`, we kill (not terminate) the process
+        # when the timeout expires.
+        proc.kill()
+        proc.wait()
+        return subprocess.TimeoutExpired(
+            command_text, timeout, _finish('out'), _finish('err'))
+
+    for key, chunk in _proc_iterchunks(proc, timeout=timeout):
+        if key is subprocess.TimeoutExpired:
+            raise _timeout_error()
+        if capture:
+            captured[key].append(chunk)
+        if text:
+            chunk = decoders[key].decode(chunk)
+        _emit(key, chunk)
+
+    for key, decoder in decoders.items():
+        _emit(key, decoder.flush())
+
+    # The process can keep running after it closes its output streams
+    try:
+        if timeout is None:
+            proc.wait()
+        else:
+            proc.wait(max(0, deadline - _time()))
+    except subprocess.TimeoutExpired:
+        raise _timeout_error()
+    return _finish('out'), _finish('err')
+
+
 # Stub for possible object oriented interface
 # class Command:
 #     """
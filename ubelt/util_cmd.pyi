@@ -1,6 +1,11 @@
 from typing import List
 from os import PathLike
 from typing import Dict
+from typing import Iterable
+from typing import Generator
+from typing import Tuple
+from typing import Callable
+from typing import Any
 
 __pitch__: str
 POSIX: bool
@@ -36,5 +41,58 @@ def cmd(command: str | List[str],
         check: bool = False,
         system: bool = False,
         timeout: float | None = None,
-        capture: bool = True) -> dict | CmdOutput:
+        capture: bool = True,
+        text: bool = True,
+        stdout_callback: Callable[[str | bytes], Any] | None = None,
+        stderr_callback: Callable[[str | bytes], Any] | None = None
+) -> dict | CmdOutput:
     ...
+
+
+def cmd_many(
+    commands: Iterable[str | List[str] | Dict],
+    max_concurrent: int | None = None,
+    shell: bool = False,
+    cwd: str | PathLike | None = None,
+    env: Dict[str, str] | None = None,
+    timeout: float | None = None,
+    check: bool = False
+) -> Generator[CmdOutput, None, None]:
+    ...
+
+
+def _rectify_command(command: str | PathLike | List[str | PathLike],
+                     shell: bool = False) -> Tuple[str, str | List[str]]:
+    ...
+
+
+async def acmd(command: str | List[str],
+               shell: bool = False,
+               verbose: int = 0,
+               tee: bool | None = None,
+               cwd: str | PathLike | None = None,
+               env: Dict[str, str] | None = None,
+               check: bool = False,
+               timeout: float | None = None,
+               capture: bool = True) -> CmdOutput:
+    ...
+
+
+def _decode_output(data: bytes,
+                   encoding: str | None = None,
+                   errors: str | None = None) -> str:
+    ...
+
+
+class _TextChunkDecoder:
+
+    def __init__(self,
+                 encoding: str | None = None,
+                 errors: str | None = None) -> None:
+        ...
+
+    def decode(self, chunk: bytes) -> str:
+        ...
+
+    def flush(self) -> str:
+        ...
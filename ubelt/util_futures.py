@@ -222,6 +222,121 @@ class SerialExecutor(object):
             yield f.result()
 
 
+class _BatchCall(object):
+    """
+    Calls a function on each item in a chunk of arguments, so a chunk can be
+    sent to a worker as a single task.
+
+    Exceptions are returned (not raised) for each item, so the results of the
+    other items in the chunk are not lost.
+
+    Example:
+        >>> from ubelt.util_futures import _BatchCall
+        >>> outcomes, elapsed = _BatchCall(divmod)([(7, 2), (1, 0)])
+        >>> print(outcomes[0])
+        (True, (3, 1))
+        >>> assert isinstance(outcomes[1][1], ZeroDivisionError)
+    """
+
+    def __init__(self, func):
+        self.func = func
+
+    def __call__(self, arglist):
+        """
+        Args:
+            arglist (List[Tuple]): positional arguments for each call
+
+        Returns:
+            Tuple[List[Tuple[bool, Any]], float]:
+                The success flag and result (or exception) of each call, and
+                the number of seconds spent in the calls.
+        """
+        from time import perf_counter
+        func = self.func
+        outcomes = []
+        start = perf_counter()
+        for args in arglist:
+            try:
+                outcomes.append((True, func(*args)))
+            except Exception as ex:
+                outcomes.append((False, ex))
+        elapsed = perf_counter() - start
+        return outcomes, elapsed
+
+
+class _ChunkSizer(object):
+    """
+    Chooses how many tasks to send to a worker at once.
+
+    The time per task is measured by the workers. Chunks are sized so each
+    takes about ``target_seconds``, which amortizes the overhead of sending a
+    task to a worker, but there are always at least 4 chunks per worker to
+    balance the load. Before any task is measured, the number of tasks is
+    split into 4 chunks per worker, similar to :func:`multiprocessing.Pool.map`.
+
+    Example:
+        >>> from ubelt.util_futures import _ChunkSizer
+        >>> sizer = _ChunkSizer(max_workers=2, target_seconds=0.5)
+        >>> sizer.chunksize(1000), sizer.chunksize()
+        (125, 1)
+        >>> sizer.update(num_items=16, elapsed=0.25)
+        >>> sizer.chunksize(), sizer.chunksize(1000), sizer.chunksize(100)
+        (32, 32, 13)
+        >>> sizer.update(num_items=1, elapsed=1.0)
+        >>> sizer.chunksize(1000)
+        1
+    """
+
+    def __init__(self, max_workers, target_seconds=0.02):
+        """
+        Args:
+            max_workers (int | None):
+                number of workers. If None, the number of CPUs is used.
+            target_seconds (float): desired duration of a chunk
+        """
+        if max_workers is None:
+            import os
+            max_workers = os.cpu_count()
+        self.max_workers = max(1, max_workers or 1)
+        self.target_seconds = target_seconds
+        self.item_seconds = None
+
+    def update(self, num_items, elapsed):
+        """
+        Record the measured duration of a chunk.
+
+        Args:
+            num_items (int): number of tasks in the chunk
+            elapsed (float): seconds spent running the chunk
+        """
+        if num_items:
+            item_seconds = elapsed / num_items
+            if self.item_seconds is None:
+                self.item_seconds = item_seconds
+            else:
+                # Exponential moving average, so the size adapts to changes
+                self.item_seconds = 0.7 * self.item_seconds + 0.3 * item_seconds
+
+    def chunksize(self, num_items=None):
+        """
+        Args:
+            num_items (int | None): number of remaining tasks, if known
+
+        Returns:
+            int: the number of tasks to put in the next chunk
+        """
+        balanced = None
+        if num_items is not None:
+            balanced = -(-num_items // (4 * self.max_workers))
+        if self.item_seconds is None:
+            size = 1 if balanced is None else balanced
+        else:
+            size = int(self.target_seconds / max(self.item_seconds, 1e-7))
+            if balanced is not None:
+                size = min(size, balanced)
+        return max(1, size)
+
+
 # See ../dev/experimental/async_executor_poc.py for
 # work ona potential AsyncIOExecutor class
 
@@ -294,9 +409,21 @@ class Executor(object):
         >>> jobs = [executor.submit(sum, [i + 1, i]) for i in range(10)]
         >>> print([job.result() for job in jobs])
         [1, 3, 5, 7, 9, 11, 13, 15, 17, 19]
+
+    Example:
+        >>> # The initializer runs once in each worker
+        >>> import ubelt as ub
+        >>> import os
+        >>> dpath = ub.Path.appdir('ubelt/tests/futures/init').ensuredir()
+        >>> with ub.Executor(mode='process', max_workers=2,
+        >>>                  initializer=os.chdir,
+        >>>                  initargs=(dpath,)) as executor:
+        >>>     job = executor.submit(os.getcwd)
+        >>>     assert os.path.samefile(job.result(), dpath)
     """
 
-    def __init__(self, mode='thread', max_workers=0):
+    def __init__(self, mode='thread', max_workers=0, initializer=None,
+                 initargs=()):
         """
         Args:
             mode (str):
@@ -305,20 +432,36 @@ class Executor(object):
 
             max_workers (int):
                 number of workers. If 0, serial is forced. Defaults to 0.
+
+            initializer (Callable | None):
+                If specified, called with ``initargs`` at the start of each
+                worker thread or process (e.g. to load a model once instead of
+                in every task). In serial mode it is called immediately.
+
+            initargs (Tuple): arguments for the ``initializer``.
         """
         from concurrent import futures
+        pool_kwargs = {}
+        if initializer is not None:
+            pool_kwargs['initializer'] = initializer
+            pool_kwargs['initargs'] = initargs
         if mode == 'serial' or max_workers == 0:
             backend = SerialExecutor()
+            if initializer is not None:
+                initializer(*initargs)
         elif mode == 'thread':
-            backend = futures.ThreadPoolExecutor(max_workers=max_workers)
+            backend = futures.ThreadPoolExecutor(max_workers=max_workers,
+                                                 **pool_kwargs)
         elif mode == 'process':
-            backend = futures.ProcessPoolExecutor(max_workers=max_workers)
+            backend = futures.ProcessPoolExecutor(max_workers=max_workers,
+                                                  **pool_kwargs)
         # elif mode == 'asyncio':
         #     # Experimental
         #     backend = AsyncIOExecutor()
         else:
             raise KeyError(mode)
         self.backend = backend
+        self._sizer = _ChunkSizer(max_workers)
 
     def __enter__(self):
         self.backend.__enter__()
@@ -357,6 +500,26 @@ class Executor(object):
         """
         Calls the map function of the underlying backend.
 
+        Args:
+            fn (Callable[..., Any]):
+                A callable that will take as many arguments as there are passed
+                iterables.
+
+            *iterables: the arguments for each call
+
+            timeout (float | None):
+                The maximum number of seconds to wait for all results.
+
+            chunksize (int | str):
+                The number of calls sent to a worker as one task. Larger
+                chunks reduce the overhead of communicating with worker
+                processes. If "auto", the size of each chunk is chosen from the
+                measured time of earlier calls. Ignored in serial mode, and
+                for integers in thread mode. Defaults to 1.
+
+        Yields:
+            Any: the result of each call, in order
+
         CommandLine:
             xdoctest -m ubelt.util_futures Executor.map
 
@@ -375,15 +538,108 @@ class Executor(object):
             >>> # xdoctest: +IGNORE_WANT
             >>> print('results = {!r}'.format(results))
             results = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
+
+        Example:
+            >>> # Many tiny tasks are sent to processes in chunks
+            >>> import ubelt as ub
+            >>> with ub.Executor(mode='process', max_workers=2) as executor:
+            ...     results = list(executor.map(abs, range(-1000, 0), chunksize='auto'))
+            >>> assert results == list(range(1000, 0, -1))
         """
         # Hack for python2
         chunksize = kwargs.pop('chunksize', 1)
         timeout = kwargs.pop('timeout', None)
         if len(kwargs) != 0:  # nocover
             raise ValueError('Unknown arguments {}'.format(kwargs))
+        if chunksize == 'auto':
+            if isinstance(self.backend, SerialExecutor):
+                chunksize = 1
+            else:
+                return self._map_batched(fn, iterables, timeout=timeout)
         return self.backend.map(fn, *iterables, timeout=timeout,
                                 chunksize=chunksize)
 
+    def _map_batched(self, fn, iterables, timeout=None):
+        """
+        Map that sends the calls to the workers in chunks sized by the
+        measured time per call, and keeps a bounded number of chunks in
+        flight.
+
+        Args:
+            fn (Callable[..., Any]): function to call
+            iterables (Tuple[Iterable, ...]): the arguments for each call
+            timeout (float | None): maximum seconds to wait for all results
+
+        Yields:
+            Any: the result of each call, in order
+        """
+        import collections
+        import itertools
+        from time import monotonic
+        if timeout is not None:
+            end_time = monotonic() + timeout
+        try:
+            num_remaining = min(len(items) for items in iterables)
+        except TypeError:
+            num_remaining = None
+        args_iter = zip(*iterables)
+        call = _BatchCall(fn)
+        sizer = self._sizer
+        max_pending = 2 * sizer.max_workers
+        pending = collections.deque()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < max_pending:
+                    size = sizer.chunksize(num_remaining)
+                    chunk = list(itertools.islice(args_iter, size))
+                    if chunk:
+                        if num_remaining is not None:
+                            num_remaining -= len(chunk)
+                        pending.append(self.backend.submit(call, chunk))
+                    else:
+                        exhausted = True
+                if not pending:
+                    break
+                batch = pending.popleft()
+                if timeout is None:
+                    outcomes, elapsed = batch.result()
+                else:
+                    outcomes, elapsed = batch.result(end_time - monotonic())
+                sizer.update(len(outcomes), elapsed)
+                for success, value in outcomes:
+                    if not success:
+                        raise value
+                    yield value
+        finally:
+            for batch in pending:
+                batch.cancel()
+
+
+def _resolve_batch_jobs(item_jobs, sizer, batch):
+    """
+    Sets the result of each job in a finished chunk from
+    :func:`JobPool.submit_batch`.
+
+    Args:
+        item_jobs (List[concurrent.futures.Future]): the future of each job
+        sizer (_ChunkSizer): records the measured time per job
+        batch (concurrent.futures.Future): the future of the chunk
+    """
+    try:
+        outcomes, elapsed = batch.result()
+    except BaseException as ex:
+        # The chunk failed as a whole, e.g. the worker process died
+        for job in item_jobs:
+            job.set_exception(ex)
+        return
+    sizer.update(len(outcomes), elapsed)
+    for job, (success, value) in zip(item_jobs, outcomes):
+        if success:
+            job.set_result(value)
+        else:
+            job.set_exception(value)
+
 
 class JobPool(object):
     """
@@ -412,7 +668,8 @@ class JobPool(object):
         >>>     final.append(info)
         >>> print('final = {!r}'.format(final))
     """
-    def __init__(self, mode='thread', max_workers=0, transient=False):
+    def __init__(self, mode='thread', max_workers=0, transient=False,
+                 initializer=None, initargs=()):
         """
         Args:
             mode (str):
@@ -426,8 +683,15 @@ class JobPool(object):
                 if True, references to jobs will be discarded as they are
                 returned by :func:`as_completed`. Otherwise the ``jobs`` attribute
                 holds a reference to all jobs ever submitted. Default to False.
+
+            initializer (Callable | None):
+                called with ``initargs`` at the start of each worker
+                (see :class:`Executor`).
+
+            initargs (Tuple): arguments for the ``initializer``.
         """
-        self.executor = Executor(mode=mode, max_workers=max_workers)
+        self.executor = Executor(mode=mode, max_workers=max_workers,
+                                 initializer=initializer, initargs=initargs)
         self.transient = transient
         self.jobs = []
 
@@ -455,6 +719,74 @@ class JobPool(object):
         self.jobs.append(job)
         return job
 
+    def submit_batch(self, func, *iterables, chunksize='auto'):
+        """
+        Submit one job per item of the zipped iterables, but send them to the
+        workers in chunks, which is much faster than :func:`JobPool.submit`
+        for many small jobs in process mode.
+
+        Args:
+            func (Callable[..., Any]):
+                A callable that will take as many arguments as there are passed
+                iterables.
+
+            *iterables: the arguments for each job
+
+            chunksize (int | str):
+                The number of jobs sent to a worker as one task. If "auto",
+                the size is chosen from the time per job measured by earlier
+                batches in this pool, or otherwise the jobs are split into 4
+                chunks per worker. Ignored in serial mode. Defaults to "auto".
+
+        Returns:
+            List[concurrent.futures.Future]:
+                A future for each job, in the same order as the arguments.
+                These are also managed by the pool.
+
+        Example:
+            >>> import ubelt as ub
+            >>> pool = ub.JobPool('process', max_workers=2)
+            >>> jobs = pool.submit_batch(divmod, range(100), [7] * 100)
+            >>> assert [job.result() for job in jobs] == [divmod(i, 7) for i in range(100)]
+            >>> assert len(list(pool.as_completed())) == 100
+            >>> # Errors are raised by the future of the job that failed
+            >>> jobs = pool.submit_batch(divmod, [1, 2], [1, 0])
+            >>> assert jobs[0].result() == (1, 0)
+            >>> assert isinstance(jobs[1].exception(), ZeroDivisionError)
+            >>> pool.shutdown()
+        """
+        import functools
+        import itertools
+        if chunksize != 'auto' and not (isinstance(chunksize, int) and
+                                        chunksize >= 1):
+            raise ValueError(
+                'chunksize must be "auto" or a positive integer, '
+                'not {!r}'.format(chunksize))
+        args_list = list(zip(*iterables))
+        if isinstance(self.executor.backend, SerialExecutor):
+            jobs = [self.executor.submit(func, *args) for args in args_list]
+            self.jobs.extend(jobs)
+            return jobs
+        sizer = self.executor._sizer
+        if chunksize == 'auto':
+            chunksize = sizer.chunksize(len(args_list))
+        call = _BatchCall(func)
+        jobs = []
+        args_iter = iter(args_list)
+        while True:
+            chunk = list(itertools.islice(args_iter, chunksize))
+            if not chunk:
+                break
+            item_jobs = [concurrent.futures.Future() for _ in chunk]
+            for job in item_jobs:
+                job.set_running_or_notify_cancel()
+            batch = self.executor.submit(call, chunk)
+            batch.add_done_callback(functools.partial(
+                _resolve_batch_jobs, item_jobs, sizer))
+            jobs.extend(item_jobs)
+        self.jobs.extend(jobs)
+        return jobs
+
     def shutdown(self):
         self.jobs = None
         return self.executor.shutdown()
@@ -47,10 +47,42 @@ class SerialExecutor:
         ...
 
 
+class _BatchCall:
+    func: Callable
+
+    def __init__(self, func: Callable) -> None:
+        ...
+
+    def __call__(self,
+                 arglist: List[Tuple]) -> Tuple[List[Tuple[bool, Any]], float]:
+        ...
+
+
+class _ChunkSizer:
+    max_workers: int
+    target_seconds: float
+    item_seconds: float | None
+
+    def __init__(self,
+                 max_workers: int | None,
+                 target_seconds: float = 0.02) -> None:
+        ...
+
+    def update(self, num_items: int, elapsed: float) -> None:
+        ...
+
+    def chunksize(self, num_items: int | None = None) -> int:
+        ...
+
+
 class Executor:
     backend: SerialExecutor | ThreadPoolExecutor | ProcessPoolExecutor
 
-    def __init__(self, mode: str = 'thread', max_workers: int = 0) -> None:
+    def __init__(self,
+                 mode: str = 'thread',
+                 max_workers: int = 0,
+                 initializer: Callable | None = None,
+                 initargs: Tuple = ...) -> None:
         ...
 
     def __enter__(self):
@@ -67,10 +99,17 @@ class Executor:
     def shutdown(self):
         ...
 
-    def map(self, fn, *iterables, **kwargs):
+    def map(self, fn: Callable[..., Any], *iterables,
+            **kwargs) -> Generator[Any, None, None]:
         ...
 
 
+def _resolve_batch_jobs(item_jobs: List[concurrent.futures.Future],
+                        sizer: _ChunkSizer,
+                        batch: concurrent.futures.Future) -> None:
+    ...
+
+
 class JobPool:
     executor: Executor
     jobs: List[Future]
@@ -79,7 +118,9 @@ class JobPool:
     def __init__(self,
                  mode: str = 'thread',
                  max_workers: int = 0,
-                 transient: bool = False) -> None:
+                 transient: bool = False,
+                 initializer: Callable | None = None,
+                 initargs: Tuple = ...) -> None:
         ...
 
     def __len__(self):
@@ -89,6 +130,13 @@ class JobPool:
                **kwargs) -> concurrent.futures.Future:
         ...
 
+    def submit_batch(
+            self,
+            func: Callable[..., Any],
+            *iterables,
+            chunksize: int | str = 'auto') -> List[concurrent.futures.Future]:
+        ...
+
     def shutdown(self):
         ...
 
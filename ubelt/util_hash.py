@@ -64,7 +64,8 @@ import math
 from collections import OrderedDict
 from ubelt.util_const import NoParam
 
-__all__ = ['hash_data', 'hash_file']
+__all__ = ['Hasher', 'hash_data', 'hash_file', 'hash_file_tree',
+           'hash_files']
 
 # incremented when we make a change that modifies hashes
 HASH_VERSION = 2  # type: int
@@ -400,6 +401,15 @@ class HashableExtensions(object):
         _hash_dispatch.__is_base__ = True
         self._hash_dispatch = singledispatch(_hash_dispatch)
 
+        # Maps exact types to the result of dispatch (or to the error message
+        # for unhashable types). These are cleared whenever a new function is
+        # registered or an abstract base class gains a new virtual subclass.
+        import abc
+        self._lookup_cache = {}  # type: Dict[type, Callable]
+        self._lookup_errors = {}  # type: Dict[type, str]
+        self._lookup_cache_token = None
+        self._get_cache_token = abc.get_cache_token
+
     def _evaluate_lazy_queue(self):
         for func in self._lazy_queue:
             func()
@@ -498,6 +508,8 @@ class HashableExtensions(object):
         def _decor_closure(hash_func):
             for hash_type in hash_types:
                 self._hash_dispatch.register(hash_type)(hash_func)
+            self._lookup_cache.clear()
+            self._lookup_errors.clear()
             return hash_func
         return _decor_closure
 
@@ -568,6 +580,19 @@ class HashableExtensions(object):
             self._evaluate_lazy_queue()
 
         query_hash_type = data.__class__
+        cache_token = self._get_cache_token()
+        if cache_token != self._lookup_cache_token:
+            # The set of virtual subclasses of an ABC changed
+            self._lookup_cache.clear()
+            self._lookup_errors.clear()
+            self._lookup_cache_token = cache_token
+        try:
+            return self._lookup_cache[query_hash_type]
+        except KeyError:
+            pass
+        msg = self._lookup_errors.get(query_hash_type, None)
+        if msg is not None:
+            raise TypeError(msg)
         # TODO: recognize some special dunder method instead
         # of strictly using this registry.
         hash_func = self._hash_dispatch.dispatch(query_hash_type)
@@ -577,7 +602,9 @@ class HashableExtensions(object):
                 msg = f'{base_msg} with mro: {query_hash_type.__mro__}'
             except AttributeError:
                 msg = base_msg
+            self._lookup_errors[query_hash_type] = msg
             raise TypeError(msg)
+        self._lookup_cache[query_hash_type] = hash_func
         return hash_func
 
     def add_iterable_check(self, func):
@@ -628,7 +655,8 @@ class HashableExtensions(object):
                 msg = 'directly hashing ndarrays with dtype=object is unstable'
                 raise TypeError(msg)
             else:
-                # tobytes() views the array in 1D (via ravel())
+                # The chunks are equivalent to tobytes(), which views the
+                # array in 1D (via ravel()), but avoid copying the data.
                 # encode the shape as well
                 # See: [util_hash.Note.1]
                 header = b''.join(_hashable_sequence(
@@ -637,7 +665,7 @@ class HashableExtensions(object):
                 dtype = b''.join(_hashable_sequence(
                     data.dtype.descr, extensions=self,
                     types=_COMPATIBLE_HASHABLE_SEQUENCE_TYPES_DEFAULT))
-                hashable = header + dtype + data.tobytes()
+                hashable = _NDArrayChunks(header + dtype, data)
             prefix = b'NDARR'
             return prefix, hashable
 
@@ -668,6 +696,7 @@ class HashableExtensions(object):
             * uuid.UUID
             * collections.OrderedDict
             * dict (caveat: will be sorted, so must be sortable)
+            * bytearray, memoryview, and array.array
 
         CommandLine:
             xdoctest -m ubelt.util_hash HashableExtensions._register_builtin_class_extensions:0
@@ -747,6 +776,7 @@ class HashableExtensions(object):
         # Some of the stdlib modules dont need to be imported and
         # cause extra import time overhead.
         import uuid
+        import array
         import pathlib
         import numbers
         import decimal
@@ -859,6 +889,48 @@ class HashableExtensions(object):
             return prefix, hashable
 
         self.register(pathlib.Path)(lambda x: (b'PATH', str(x).encode('utf-8')))
+
+        @self.register((bytearray, memoryview))
+        def _convert_buffer(data):
+            """
+            Mutable byte buffers and memoryviews are hashed like the bytes of
+            their contents without making a copy.
+
+            Example:
+                >>> import ubelt as ub
+                >>> assert ub.hash_data(bytearray(b'abc')) == ub.hash_data(b'abc')
+                >>> assert ub.hash_data(memoryview(b'abc')) == ub.hash_data(b'abc')
+                >>> view = memoryview(b'abcdef')[::2]
+                >>> assert ub.hash_data(view) == ub.hash_data(b'ace')
+            """
+            view = memoryview(data)
+            hashable = None
+            if view.c_contiguous:
+                try:
+                    hashable = _HashableChunks([view.cast('B')])
+                except (TypeError, ValueError):
+                    # casting is not supported for all formats
+                    pass
+            if hashable is None:
+                hashable = view.tobytes()
+            prefix = b'TXT'
+            return prefix, hashable
+
+        @self.register(array.array)
+        def _convert_array(data):
+            """
+            Example:
+                >>> import ubelt as ub
+                >>> import array
+                >>> a1 = array.array('i', [1, 2, 3])
+                >>> a2 = array.array('I', [1, 2, 3])
+                >>> assert ub.hash_data(a1) != ub.hash_data(a2)
+                >>> assert ub.hash_data(a1) == ub.hash_data(array.array('i', [1, 2, 3]))
+            """
+            prefix = b'ARRAY'
+            hashable = _HashableChunks([
+                data.typecode.encode('ascii'), memoryview(data).cast('B')])
+            return prefix, hashable
         # other data structures
 
     def _register_agressive_extensions(self):  # nocover
@@ -914,9 +986,10 @@ class _HashTracer(object):
     def update(self, item):
         """
         Args:
-            item (bytes):
+            item (bytes | bytearray):
         """
-        self.sequence.append(item)
+        # copy because the caller may reuse a mutable buffer
+        self.sequence.append(bytes(item))
 
     def hexdigest(self):
         """
@@ -926,10 +999,14 @@ class _HashTracer(object):
         return b''.join(self.sequence)
 
 
-def _hashable_sequence(data, types=False, extensions=None):
+def _hashable_sequence(data, types=False, extensions=None, version=1):
     r"""
     Extracts the sequence of bytes that would be hashed by hash_data
 
+    Note:
+        For ``version=2`` the sequence is batched, so the boundaries between
+        items do not correspond to individual update calls.
+
     Example:
         >>> data = [2, (3, 4)]
         >>> result1 = (b''.join(_hashable_sequence(data, types=False)))
@@ -938,10 +1015,125 @@ def _hashable_sequence(data, types=False, extensions=None):
         >>> assert result2 == b'_[_INT\x02_,__[_INT\x03_,_INT\x04_,__]__]_'
     """
     hasher = _HashTracer()
-    _update_hasher(hasher, data, types=types, extensions=extensions)
+    update_hasher = _rectify_hash_data_version(version)
+    update_hasher(hasher, data, types=types, extensions=extensions)
     return hasher.sequence
 
 
+# Approximate number of bytes of a non-contiguous ndarray that are copied into
+# a contiguous block at a time when it is hashed.
+_NDARRAY_BLOCKSIZE = 1 << 20
+
+
+class _HashableChunks(object):
+    """
+    The hashable representation of an object as a sequence of buffers.
+
+    A hashable extension can return this instead of ``bytes`` so large
+    buffers are passed to ``hasher.update`` one at a time instead of being
+    copied into a single bytes object. Hashing the chunks in order is
+    equivalent to hashing their concatenation, which can be materialized with
+    ``bytes(chunks)``.
+
+    Attributes:
+        chunks (List[bytes | bytearray | memoryview]):
+            C-contiguous buffer-protocol objects
+
+    Example:
+        >>> from ubelt.util_hash import _HashableChunks
+        >>> chunks = _HashableChunks([b'abc', bytearray(b'de')])
+        >>> assert bytes(chunks) == b'abcde'
+        >>> assert len(chunks) == 5
+        >>> assert b'_' + chunks + b'_' == b'_abcde_'
+    """
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def __iter__(self):
+        return iter(self.chunks)
+
+    def __len__(self):
+        return sum(memoryview(chunk).nbytes for chunk in self.chunks)
+
+    def __bytes__(self):
+        return b''.join(self)
+
+    def __add__(self, other):
+        return bytes(self) + other
+
+    def __radd__(self, other):
+        return other + bytes(self)
+
+
+class _NDArrayChunks(_HashableChunks):
+    """
+    The hashable chunks of an ndarray, which are equivalent to
+    ``header + data.tobytes()``.
+
+    A C-contiguous array is viewed as a single flat uint8 buffer without
+    copying. Otherwise the array is copied in contiguous blocks of rows, so at
+    most about ``blocksize`` bytes are copied at a time.
+
+    Example:
+        >>> # xdoctest: +REQUIRES(module:numpy)
+        >>> from ubelt.util_hash import _NDArrayChunks
+        >>> import numpy as np
+        >>> data = np.arange(24).reshape(2, 3, 4)
+        >>> for arr in [data, data.T, data[:, ::2], data[0, 0, 0]]:
+        >>>     chunks = _NDArrayChunks(b'head', arr, blocksize=8)
+        >>>     assert bytes(chunks) == b'head' + arr.tobytes()
+        >>>     assert len(chunks) == 4 + arr.nbytes
+    """
+
+    def __init__(self, header, data, blocksize=_NDARRAY_BLOCKSIZE):
+        self.header = header
+        self.data = data
+        self.blocksize = blocksize
+
+    def __iter__(self):
+        yield self.header
+        yield from self._iter_blocks(self.data)
+
+    def __len__(self):
+        return len(self.header) + self.data.nbytes
+
+    def _iter_blocks(self, arr):
+        if arr.flags['C_CONTIGUOUS']:
+            # reshape is a view for contiguous arrays, and viewing the data
+            # as uint8 gives a buffer that any dtype can be passed through.
+            yield arr.reshape(-1).view('uint8')
+        else:
+            # A non-contiguous array always has at least one dimension
+            row_nbytes = arr[0:1].nbytes
+            if row_nbytes > self.blocksize and arr.ndim > 1:
+                for row in arr:
+                    yield from self._iter_blocks(row)
+            else:
+                step = max(1, self.blocksize // max(1, row_nbytes))
+                for start in range(0, len(arr), step):
+                    block = arr[start:start + step].copy(order='C')
+                    yield block.reshape(-1).view('uint8')
+
+
+def _update_hashable_chunks(hasher, prefix, chunks, suffix=b''):
+    """
+    Feed ``prefix + chunks + suffix`` to the hasher without concatenating the
+    chunks.
+
+    Args:
+        hasher (Hasher): instance of a hashlib algorithm
+        prefix (bytes): bytes to hash before the chunks
+        chunks (_HashableChunks): the chunks to hash
+        suffix (bytes): bytes to hash after the chunks
+    """
+    hasher.update(prefix)
+    for chunk in chunks:
+        hasher.update(chunk)
+    if suffix:
+        hasher.update(suffix)
+
+
 def _convert_to_hashable(data, types=True, extensions=None):
     r"""
     Converts ``data`` into a hashable byte representation if an appropriate
@@ -977,9 +1169,20 @@ def _convert_to_hashable(data, types=True, extensions=None):
         >>> assert _convert_to_hashable(+0.) == (b'FLT', b'\x00/\x01')
     """
     # HANDLE MOST COMMON TYPES FIRST
-    if data is None:
+    cls = data.__class__
+    if cls is str:
+        hashable = data.encode('utf-8')
+        prefix = b'TXT'
+    elif cls is int:
+        hashable = _int_to_bytes(data)
+        prefix = b'INT'
+    elif cls is bytes:
+        hashable = data
+        prefix = b'TXT'
+    elif data is None:
         hashable = b'NONE'
         prefix = b'NULL'
+    # THEN HANDLE SUBCLASSES OF COMMON TYPES
     elif isinstance(data, bytes):
         hashable = data
         prefix = b'TXT'
@@ -1020,6 +1223,9 @@ _SEP = b'_,_'
 _ITER_PREFIX = b'_[_'
 _ITER_SUFFIX = b'_]_'
 
+# Exact types that are always hashed directly and skip the iterable checks
+_LEAF_TYPES = {str, int, bytes, float, type(None)}
+
 
 def _update_hasher(hasher, data, types=True, extensions=None):
     """
@@ -1050,6 +1256,9 @@ def _update_hasher(hasher, data, types=True, extensions=None):
     # Determine if the data should be hashed directly or iterated through
     if isinstance(data, (tuple, list, zip)):
         needs_iteration = True
+    elif data.__class__ in _LEAF_TYPES:
+        # Builtin scalars are never iterated over
+        needs_iteration = False
     else:
         needs_iteration = any(check(data) for check in
                               extensions.iterable_checks)
@@ -1070,8 +1279,11 @@ def _update_hasher(hasher, data, types=True, extensions=None):
             for item in iter_:
                 prefix, hashable = _convert_to_hashable(item, types,
                                                         extensions=extensions)
-                binary_data = prefix + hashable + _SEP
-                hasher.update(binary_data)
+                if isinstance(hashable, _HashableChunks):
+                    _update_hashable_chunks(hasher, prefix, hashable, _SEP)
+                else:
+                    binary_data = prefix + hashable + _SEP
+                    hasher.update(binary_data)
             hasher.update(_ITER_SUFFIX)
         except TypeError:
             # need to use recursive calls
@@ -1091,8 +1303,196 @@ def _update_hasher(hasher, data, types=True, extensions=None):
     else:
         prefix, hashable = _convert_to_hashable(data, types,
                                                 extensions=extensions)
-        binary_data = prefix + hashable
-        hasher.update(binary_data)
+        if isinstance(hashable, _HashableChunks):
+            _update_hashable_chunks(hasher, prefix, hashable)
+        else:
+            binary_data = prefix + hashable
+            hasher.update(binary_data)
+
+
+# Number of bytes the version 2 encoder accumulates before it calls update
+_V2_BATCH_SIZE = 1 << 16
+
+
+def _update_hasher_v2(hasher, data, types=True, extensions=None):
+    r"""
+    Version 2 of the :func:`_update_hasher` encoding.
+
+    The encoding is similar to version 1, but every item in a sequence is
+    followed by a separator (version 1 omits the separator after the first
+    nested item, see the note in :func:`_update_hasher`). Builtin containers
+    (list, tuple, dict, OrderedDict, set) are always traversed structurally
+    instead of being flattened to bytes by an extension, and the same
+    ``types`` setting is used at every level of nesting.
+
+    The traversal is iterative, and the encoded bytes are accumulated in a
+    reusable buffer that is only passed to the hasher once it grows beyond
+    ``_V2_BATCH_SIZE``, which avoids most per-item overhead.
+
+    Args:
+        hasher (Hasher): instance of a hashlib algorithm
+        data (object): ordered data with structure
+        types (bool): include type prefixes in the hash
+        extensions (HashableExtensions | None): overrides global extensions
+
+    Example:
+        >>> from ubelt.util_hash import _update_hasher_v2
+        >>> hasher = hashlib.sha512()
+        >>> data = [1, 2, ['a', 2, 'c']]
+        >>> _update_hasher_v2(hasher, data)
+        >>> print(hasher.hexdigest()[0:8])
+        a5f5acfe
+
+    Example:
+        >>> from ubelt.util_hash import _hashable_sequence
+        >>> data = [[1], [2]]
+        >>> print(b''.join(_hashable_sequence(data, version=1)))
+        >>> print(b''.join(_hashable_sequence(data, version=2)))
+        b'_[__[_\x01_,__]__[_\x02_,__]__,__]_'
+        b'_[__[_\x01_,__]__,__[_\x02_,__]__,__]_'
+    """
+    if extensions is None:
+        extensions = _HASHABLE_EXTENSIONS
+
+    if extensions._lazy_queue:
+        extensions._evaluate_lazy_queue()
+    iterable_checks = extensions.iterable_checks
+
+    if types:
+        TXT, INT, FLT, NULL = b'TXT', b'INT', b'FLT', b'NULL'
+        DICT, ODICT, SET = b'DICT', b'ODICT', b'SET'
+    else:
+        TXT = INT = FLT = NULL = DICT = ODICT = SET = b''
+
+    buf = bytearray()
+    write = buf.extend
+    update = hasher.update
+
+    # Each stack entry is an iterator over the members of an open container.
+    # The bottom entry wraps the input itself and is never closed with a
+    # suffix or separator.
+    stack = [iter((data,))]
+    while stack:
+        for item in stack[-1]:
+            cls = item.__class__
+            # Fast path for the most common leaf types
+            if cls is str:
+                write(TXT)
+                write(item.encode('utf-8'))
+            elif cls is int:
+                write(INT)
+                # equivalent to _int_to_bytes without the function call
+                write(item.to_bytes((item.bit_length() + 8) // 8, 'big',
+                                    signed=True))
+            elif cls is bytes:
+                write(TXT)
+                write(item)
+            elif item is None:
+                write(NULL)
+                write(b'NONE')
+            elif cls is float:
+                write(FLT)
+                try:
+                    a, b = item.as_integer_ratio()
+                except (ValueError, OverflowError):
+                    write(str(item).encode('utf-8'))
+                else:
+                    write(_int_to_bytes(a))
+                    write(b'/')
+                    write(_int_to_bytes(b))
+            else:
+                # Containers are traversed structurally
+                members = None
+                if isinstance(item, (list, tuple, zip)):
+                    members = item
+                elif isinstance(item, OrderedDict):
+                    write(ODICT)
+                    members = item.items()
+                elif isinstance(item, dict):
+                    write(DICT)
+                    try:
+                        members = sorted(item.items())
+                    except TypeError:
+                        from ubelt.util_list import argsort
+                        sortx = argsort(item, key=str)
+                        members = [(k, item[k]) for k in sortx]
+                elif isinstance(item, set):
+                    write(SET)
+                    try:
+                        members = sorted(item)
+                    except TypeError:
+                        from ubelt.util_list import argsort
+                        item_ = list(item)
+                        sortx = argsort(item_, key=str)
+                        members = [item_[k] for k in sortx]
+                elif any(check(item) for check in iterable_checks):
+                    members = item
+                if members is not None:
+                    write(_ITER_PREFIX)
+                    stack.append(iter(members))
+                    break
+                prefix, hashable = _convert_to_hashable(
+                    item, types, extensions=extensions)
+                write(prefix)
+                if len(hashable) > _V2_BATCH_SIZE:
+                    # Dont copy large leafs into the buffer
+                    update(buf)
+                    buf.clear()
+                    if isinstance(hashable, _HashableChunks):
+                        _update_hashable_chunks(hasher, b'', hashable)
+                    else:
+                        update(hashable)
+                elif isinstance(hashable, _HashableChunks):
+                    for chunk in hashable:
+                        write(chunk)
+                else:
+                    write(hashable)
+            if len(stack) > 1:
+                write(_SEP)
+            if len(buf) > _V2_BATCH_SIZE:
+                update(buf)
+                buf.clear()
+        else:
+            stack.pop()
+            if stack:
+                # A nested container was exhausted
+                write(_ITER_SUFFIX)
+                if len(stack) > 1:
+                    write(_SEP)
+    if buf:
+        update(buf)
+
+
+# Maps the ``version`` argument of :func:`hash_data` to an encoder
+_HASH_DATA_ENCODERS = {
+    1: _update_hasher,
+    2: _update_hasher_v2,
+}
+
+
+def _rectify_hash_data_version(version):
+    """
+    Lookup the function that implements a version of the hash_data encoding
+
+    Args:
+        version (int): the requested encoding version
+
+    Returns:
+        Callable
+
+    Example:
+        >>> from ubelt.util_hash import _rectify_hash_data_version
+        >>> assert _rectify_hash_data_version(1) is _update_hasher
+        >>> assert _rectify_hash_data_version(2) is _update_hasher_v2
+        >>> import pytest
+        >>> with pytest.raises(ValueError):
+        ...     _rectify_hash_data_version(0)
+    """
+    try:
+        return _HASH_DATA_ENCODERS[version]
+    except (KeyError, TypeError):
+        raise ValueError('unknown hash_data version: {!r}. Valid versions '
+                         'are {}'.format(version, list(_HASH_DATA_ENCODERS)))
 
 
 def _convert_hexstr_base(hexstr, base):
@@ -1176,7 +1576,7 @@ def _digest_hasher(hasher, base):
 
 # @profile
 def hash_data(data, hasher=NoParam, base=NoParam, types=False, convert=False,
-              extensions=None):
+              extensions=None, version=1):
     """
     Get a unique hash depending on the state of the data.
 
@@ -1208,6 +1608,13 @@ def hash_data(data, hasher=NoParam, base=NoParam, types=False, convert=False,
             a custom :class:`HashableExtensions` instance that can overwrite or
             define how different types of objects are hashed.
 
+        version (int):
+            The version of the protocol used to encode ``data`` into bytes.
+            Version 1 is the default and its output will not change. Version 2
+            is about 1.5-3x faster on large nested structures of builtins and
+            fixes a missing separator between nested items, but produces
+            different hashes than version 1. Defaults to 1.
+
     Note:
         The types allowed are specified by the  HashableExtensions object. By
         default ubelt will register:
@@ -1231,6 +1638,13 @@ def hash_data(data, hasher=NoParam, base=NoParam, types=False, convert=False,
         60b758587f599663931057e6ebdf185a...
         >>> print(ub.hash_data([1, 2, (3, '4')], base='abc',  hasher='sha512')[:32])
         hsrgqvfiuxvvhcdnypivhhthmrolkzej
+
+    Example:
+        >>> # The version 2 protocol is faster, but gives different results
+        >>> import ubelt as ub
+        >>> data = {'a': [1, 2, (3, '4')], 'b': {'c': None}}
+        >>> print(ub.hash_data(data, version=1)[0:8])
+        >>> print(ub.hash_data(data, version=2)[0:8])
     """
     if convert and not isinstance(data, str):  # nocover
         import json
@@ -1243,15 +1657,17 @@ def hash_data(data, hasher=NoParam, base=NoParam, types=False, convert=False,
 
     base = _rectify_base(base)
     hasher = _rectify_hasher(hasher)()
+    update_hasher = _rectify_hash_data_version(version)
     # Feed the data into the hasher
-    _update_hasher(hasher, data, types=types, extensions=extensions)
+    update_hasher(hasher, data, types=types, extensions=extensions)
     # Get the hashed representation
     text = _digest_hasher(hasher, base)
     return text
 
 
 def hash_file(fpath, blocksize=1048576, stride=1, maxbytes=None,
-              hasher=NoParam, base=NoParam):
+              hasher=NoParam, base=NoParam, cache=None, mode='linear',
+              chunksize=None, workers=0):
     r"""
     Hashes the data in a file on disk.
 
@@ -1287,6 +1703,26 @@ def hash_file(fpath, blocksize=1048576, stride=1, maxbytes=None,
             Valid keys are 'dec', 'hex', 'abc', and 'alphanum', 10, 16, 26, 32.
             Defaults to 'hex'.
 
+        cache (bool | FileHashCache | None):
+            If specified, consult a persistent :class:`FileHashCache` keyed on
+            the path and stat information of the file before hashing it and
+            store the result afterwards. If True, the default cache in the
+            ubelt application cache directory is used. Defaults to None.
+
+        mode (str):
+            Either 'linear' or 'tree'. In 'linear' mode the file is hashed
+            sequentially and the result agrees with standard hashing programs.
+            In 'tree' mode fixed size chunks of the file are hashed in
+            parallel and combined into a root hash (see
+            :func:`hash_file_tree`). The result of 'tree' mode will NOT match
+            the output of programs like sha256sum. Defaults to 'linear'.
+
+        chunksize (int | None):
+            The size of each chunk in 'tree' mode. Defaults to 2 ** 26.
+
+        workers (int):
+            number of parallel workers in 'tree' mode. Defaults to 0.
+
     Returns:
         str: the hash text
 
@@ -1369,6 +1805,19 @@ def hash_file(fpath, blocksize=1048576, stride=1, maxbytes=None,
         print(f'our_result={our_result}')
         assert our_result == std_result
     """
+    if cache is not None and cache is not False:
+        return _hash_file_cached(fpath, cache, blocksize=blocksize,
+                                 stride=stride, maxbytes=maxbytes,
+                                 hasher=hasher, base=base, mode=mode,
+                                 chunksize=chunksize, workers=workers)
+    if mode == 'tree':
+        if stride != 1 or maxbytes is not None:
+            raise ValueError('stride and maxbytes are not supported in tree mode')
+        tree = hash_file_tree(fpath, chunksize=chunksize, workers=workers,
+                              blocksize=blocksize, hasher=hasher, base=base)
+        return tree['root']
+    elif mode != 'linear':
+        raise KeyError('unknown hash_file mode={!r}'.format(mode))
     # TODO: add logic such that you can update an existing hasher
     base = _rectify_base(base)
     hasher = _rectify_hasher(hasher)()
@@ -1412,17 +1861,775 @@ def hash_file(fpath, blocksize=1048576, stride=1, maxbytes=None,
     return text
 
 
+class FileHashCache(object):
+    """
+    A persistent on-disk cache of file hashes.
+
+    Entries are stored in a SQLite database and are keyed on the real path of
+    the file, the hashing parameters, and the size, modification time (in
+    nanoseconds), and inode of the file. A cached hash is only returned if the
+    stat information of the file on disk matches the stat information recorded
+    when the hash was computed.
+
+    The size of the database is bounded by ``max_bytes``. When it is exceeded,
+    the least recently used entries are evicted until the database uses less
+    than 90% of it. The size is the number of bytes in the pages of the
+    database that are in use, which includes the indexes. Pages freed by
+    eviction are reused, but the database file itself does not shrink.
+    Optionally, the number of entries can also be bounded by ``max_entries``.
+
+    Note:
+        This trades correctness for speed. A modification that preserves the
+        size, mtime, and inode of a file will not be detected. Only use this
+        if you trust the modification times of the files you are hashing.
+
+    Attributes:
+        fpath (str | PathLike): path to the SQLite database
+        max_bytes (int | None): maximum size of the database in bytes
+        max_entries (int | None): maximum number of cached hashes
+
+    Example:
+        >>> import ubelt as ub
+        >>> from ubelt.util_hash import FileHashCache
+        >>> dpath = ub.Path.appdir('ubelt/tests/test-hash-cache').delete().ensuredir()
+        >>> cache = FileHashCache(dpath / 'hashcache.sqlite')
+        >>> fpath = dpath / 'data.txt'
+        >>> fpath.write_text('foobar')
+        >>> # The first call computes the hash and populates the cache
+        >>> print(ub.hash_file(fpath, hasher='sha1', cache=cache))
+        8843d7f92416211de9ebb963ff4ce28125932878
+        >>> assert len(cache) == 1
+        >>> # Subsequent calls read the hash from the cache
+        >>> print(ub.hash_file(fpath, hasher='sha1', cache=cache))
+        8843d7f92416211de9ebb963ff4ce28125932878
+        >>> cache.close()
+    """
+    # Number of inserts between checks for eviction
+    _EVICT_INTERVAL = 256
+
+    def __init__(self, fpath=None, max_bytes=256 * 2 ** 20, max_entries=None):
+        """
+        Args:
+            fpath (str | PathLike | None):
+                path to the SQLite database. If None, a database in the ubelt
+                application cache directory is used.
+
+            max_bytes (int | None): maximum size of the database in bytes.
+                Defaults to 256 MiB, which holds roughly a million hashes.
+
+            max_entries (int | None): maximum number of cached hashes.
+                Defaults to no limit.
+        """
+        import threading
+        if fpath is None:
+            from ubelt.util_path import Path
+            dpath = Path.appdir('ubelt', 'hashcache', type='cache')
+            fpath = dpath.ensuredir() / 'file_hashes.sqlite'
+        self.fpath = fpath
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        # sqlite connections cannot be shared between threads
+        self._local = threading.local()
+        self._num_inserts = 0
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            import sqlite3
+            import os
+            conn = sqlite3.connect(os.fspath(self.fpath), timeout=60)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            with conn:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS file_hashes (
+                        path TEXT NOT NULL,
+                        hasher TEXT NOT NULL,
+                        stride INTEGER NOT NULL,
+                        maxbytes INTEGER NOT NULL,
+                        blocksize INTEGER NOT NULL,
+                        size INTEGER NOT NULL,
+                        mtime_ns INTEGER NOT NULL,
+                        ino INTEGER NOT NULL,
+                        hexdigest TEXT NOT NULL,
+                        atime REAL NOT NULL,
+                        PRIMARY KEY (path, hasher, stride, maxbytes, blocksize)
+                    )
+                    """)
+                conn.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS file_hashes_atime
+                    ON file_hashes (atime)
+                    """)
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _key(fpath, hasher_name, stride, maxbytes, blocksize):
+        import os
+        # The blocksize only influences the hash when a stride is used
+        blocksize = blocksize if stride > 1 else 0
+        maxbytes = -1 if maxbytes is None else maxbytes
+        return (os.path.realpath(fpath), hasher_name, stride, maxbytes,
+                blocksize)
+
+    def lookup(self, fpath, stat, hasher_name, stride=1, maxbytes=None,
+               blocksize=1048576):
+        """
+        Lookup a cached hash
+
+        Args:
+            fpath (str | PathLike): path to the file
+            stat (os.stat_result): the current stat information of the file
+            hasher_name (str): the name of the hash algorithm
+            stride (int): the stride passed to :func:`hash_file`
+            maxbytes (int | None): the maxbytes passed to :func:`hash_file`
+            blocksize (int): the blocksize passed to :func:`hash_file`
+
+        Returns:
+            str | None: the cached hex digest if it is valid, otherwise None.
+        """
+        import time
+        key = self._key(fpath, hasher_name, stride, maxbytes, blocksize)
+        conn = self._connect()
+        row = conn.execute(
+            """
+            SELECT size, mtime_ns, ino, hexdigest FROM file_hashes
+            WHERE path=? AND hasher=? AND stride=? AND maxbytes=? AND blocksize=?
+            """, key).fetchone()
+        if row is None:
+            return None
+        size, mtime_ns, ino, hexdigest = row
+        if (size, mtime_ns, ino) != (stat.st_size, stat.st_mtime_ns, stat.st_ino):
+            return None
+        with conn:
+            conn.execute(
+                """
+                UPDATE file_hashes SET atime=?
+                WHERE path=? AND hasher=? AND stride=? AND maxbytes=? AND blocksize=?
+                """, (time.time(),) + key)
+        return hexdigest
+
+    def store(self, fpath, stat, hasher_name, hexdigest, stride=1,
+              maxbytes=None, blocksize=1048576):
+        """
+        Record the hash of a file
+
+        Args:
+            fpath (str | PathLike): path to the file
+            stat (os.stat_result): the stat information of the hashed file
+            hasher_name (str): the name of the hash algorithm
+            hexdigest (str): the hash of the file in hex
+            stride (int): the stride passed to :func:`hash_file`
+            maxbytes (int | None): the maxbytes passed to :func:`hash_file`
+            blocksize (int): the blocksize passed to :func:`hash_file`
+        """
+        import time
+        key = self._key(fpath, hasher_name, stride, maxbytes, blocksize)
+        row = key + (stat.st_size, stat.st_mtime_ns, stat.st_ino, hexdigest,
+                     time.time())
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO file_hashes
+                (path, hasher, stride, maxbytes, blocksize, size, mtime_ns,
+                 ino, hexdigest, atime)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, row)
+        self._num_inserts += 1
+        if self._num_inserts % self._EVICT_INTERVAL == 0:
+            self.evict()
+
+    def nbytes(self):
+        """
+        The number of bytes used by the database, excluding free pages.
+
+        Returns:
+            int
+        """
+        conn = self._connect()
+        page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+        page_count = conn.execute('PRAGMA page_count').fetchone()[0]
+        freelist_count = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        return (page_count - freelist_count) * page_size
+
+    def _evict_oldest(self, num):
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(
+                """
+                DELETE FROM file_hashes WHERE rowid IN (
+                    SELECT rowid FROM file_hashes ORDER BY atime, rowid LIMIT ?
+                )
+                """, (num,))
+        return cursor.rowcount
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the database uses less
+        than 90% of ``max_bytes`` and at most ``max_entries`` entries remain.
+
+        Returns:
+            int: the number of removed entries
+        """
+        import math
+        num_removed = 0
+        if self.max_entries is not None:
+            num_excess = len(self) - self.max_entries
+            if num_excess > 0:
+                num_removed += self._evict_oldest(num_excess)
+        if self.max_bytes is not None:
+            nbytes = self.nbytes()
+            if nbytes > self.max_bytes:
+                target = 0.9 * self.max_bytes
+                # Deleting rows frees pages unevenly, so estimate the number of
+                # rows to remove from the average row size and check again.
+                for _ in range(16):
+                    num_rows = len(self)
+                    if nbytes <= target or num_rows == 0:
+                        break
+                    num_excess = math.ceil(
+                        (nbytes - target) / (nbytes / num_rows))
+                    num_removed += self._evict_oldest(num_excess)
+                    nbytes = self.nbytes()
+        return num_removed
+
+    def clear(self):
+        """
+        Remove all entries from the cache
+        """
+        conn = self._connect()
+        with conn:
+            conn.execute('DELETE FROM file_hashes')
+
+    def close(self):
+        """
+        Close the database connection owned by the calling thread
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def __len__(self):
+        conn = self._connect()
+        return conn.execute('SELECT COUNT(*) FROM file_hashes').fetchone()[0]
+
+
+_DEFAULT_FILE_HASH_CACHE = None
+
+
+def _rectify_file_hash_cache(cache):
+    """
+    Args:
+        cache (bool | FileHashCache):
+
+    Returns:
+        FileHashCache
+    """
+    global _DEFAULT_FILE_HASH_CACHE
+    if cache is True:
+        if _DEFAULT_FILE_HASH_CACHE is None:
+            _DEFAULT_FILE_HASH_CACHE = FileHashCache()
+        cache = _DEFAULT_FILE_HASH_CACHE
+    return cache
+
+
+def _hasher_cache_name(hasher):
+    """
+    Returns a stable name for a hasher, or None if results of the hasher
+    cannot be cached.
+
+    Example:
+        >>> from ubelt.util_hash import _hasher_cache_name
+        >>> assert _hasher_cache_name(NoParam) == 'sha512'
+        >>> assert _hasher_cache_name('sha1') == 'sha1'
+        >>> assert _hasher_cache_name(hashlib.sha256) == 'sha256'
+        >>> assert _hasher_cache_name(hashlib.sha256()) is None
+    """
+    if hasattr(hasher, 'hexdigest'):
+        # Existing hasher instances might have a prior state
+        return None
+    hasher_cls = _rectify_hasher(hasher)
+    return getattr(hasher_cls(), 'name', None)
+
+
+def _hash_file_cached(fpath, cache, blocksize=1048576, stride=1,
+                      maxbytes=None, hasher=NoParam, base=NoParam,
+                      mode='linear', chunksize=None, workers=0):
+    """
+    Implementation of :func:`hash_file` that consults a :class:`FileHashCache`
+    """
+    import os
+    hash_kw = dict(blocksize=blocksize, stride=stride, maxbytes=maxbytes,
+                   hasher=hasher, mode=mode, chunksize=chunksize,
+                   workers=workers)
+    hasher_name = _hasher_cache_name(hasher)
+    if hasher_name is None:
+        return hash_file(fpath, base=base, **hash_kw)
+    if mode == 'tree':
+        # Tree hashes are stored as a distinct algorithm
+        if chunksize is None:
+            chunksize = _DEFAULT_TREE_CHUNKSIZE
+        hasher_name = 'tree-{}-{}'.format(hasher_name, chunksize)
+    cache = _rectify_file_hash_cache(cache)
+    base = _rectify_base(base)
+    kw = dict(stride=stride, maxbytes=maxbytes, blocksize=blocksize)
+    stat = os.stat(fpath)
+    hexdigest = cache.lookup(fpath, stat, hasher_name, **kw)
+    if hexdigest is None:
+        hexdigest = hash_file(fpath, base='hex', **hash_kw)
+        # Only record the hash if the file did not change while hashing it
+        stat2 = os.stat(fpath)
+        if ((stat.st_size, stat.st_mtime_ns, stat.st_ino) ==
+                (stat2.st_size, stat2.st_mtime_ns, stat2.st_ino)):
+            cache.store(fpath, stat, hasher_name, hexdigest, **kw)
+    text = _convert_hexstr_base(hexdigest, base)
+    return text
+
+
+# Files at least this large are read via mmap in :func:`hash_files`, smaller
+# files are read with positional reads.
+_MMAP_THRESHOLD = 1 << 22
+
+
+def _hash_file_worker(fpath, blocksize=1048576, stride=1, maxbytes=None,
+                      hasher=NoParam, base=NoParam):
+    """
+    Hashes a single file for :func:`hash_files`.
+
+    Produces the same result as :func:`hash_file`, but avoids the buffered
+    file object. Large files are memory-mapped and fed to the hasher as
+    zero-copy views, while small files are read with :func:`os.pread`.
+
+    Example:
+        >>> import ubelt as ub
+        >>> from ubelt.util_hash import _hash_file_worker
+        >>> dpath = ub.Path.appdir('ubelt/tests/test-hash').ensuredir()
+        >>> fpath = dpath / 'tmp_worker.txt'
+        >>> fpath.write_text('abcdefghijklmnop')
+        >>> for maxbytes in [None, 0, 3, 100]:
+        >>>     got = _hash_file_worker(fpath, blocksize=3, maxbytes=maxbytes)
+        >>>     want = ub.hash_file(fpath, blocksize=3, maxbytes=maxbytes)
+        >>>     assert got == want
+    """
+    if stride > 1:
+        # Strided hashing is rare and depends on the blocksize, defer to the
+        # reference implementation.
+        return hash_file(fpath, blocksize=blocksize, stride=stride,
+                         maxbytes=maxbytes, hasher=hasher, base=base)
+    import os
+    base = _rectify_base(base)
+    hasher = _rectify_hasher(hasher)()
+    with open(fpath, 'rb') as file:
+        fd = file.fileno()
+        size = os.fstat(fd).st_size
+        if maxbytes is not None:
+            size = min(size, maxbytes)
+        if size >= _MMAP_THRESHOLD:
+            import mmap
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mem:
+                with memoryview(mem) as view:
+                    for start in range(0, size, blocksize):
+                        stop = min(start + blocksize, size)
+                        with view[start:stop] as chunk:
+                            hasher.update(chunk)
+        elif hasattr(os, 'pread'):
+            offset = 0
+            while offset < size:
+                buf = os.pread(fd, min(blocksize, size - offset), offset)
+                if not buf:
+                    break
+                hasher.update(buf)
+                offset += len(buf)
+        else:  # nocover
+            # Windows does not have pread
+            remain = size
+            while remain > 0:
+                buf = file.read(min(blocksize, remain))
+                if not buf:
+                    break
+                hasher.update(buf)
+                remain -= len(buf)
+    text = _digest_hasher(hasher, base)
+    return text
+
+
+# Default number of bytes in each chunk of :func:`hash_file_tree`
+_DEFAULT_TREE_CHUNKSIZE = 1 << 26
+
+
+def _hash_file_range(fpath, start, stop, blocksize=1048576, hasher=NoParam):
+    """
+    Hashes the bytes in ``[start, stop)`` of a file.
+
+    Returns:
+        str: the hex digest of the range
+    """
+    hasher = _rectify_hasher(hasher)()
+    with open(fpath, 'rb') as file:
+        file.seek(start)
+        remain = stop - start
+        while remain > 0:
+            buf = file.read(min(blocksize, remain))
+            if not buf:
+                break
+            hasher.update(buf)
+            remain -= len(buf)
+    return hasher.hexdigest()
+
+
+def _combine_chunk_digests(chunk_digests, chunksize, hasher=NoParam):
+    """
+    Combines the hex digests of each chunk into the root of a hash tree.
+
+    Returns:
+        str: the hex digest of the root
+    """
+    hasher = _rectify_hasher(hasher)()
+    hasher.update(b'_TREE_' + _int_to_bytes(chunksize) + _SEP)
+    for hexdigest in chunk_digests:
+        hasher.update(bytes.fromhex(hexdigest))
+    return hasher.hexdigest()
+
+
+def hash_file_tree(fpath, chunksize=None, workers=0, backend='thread',
+                   blocksize=1048576, hasher=NoParam, base=NoParam,
+                   indices=None):
+    r"""
+    Hashes fixed size chunks of a file in parallel and combines them into a
+    single root hash.
+
+    This splits the work of hashing a single large file over multiple
+    workers. The hex digest of each chunk is returned alongside the root hash,
+    so if the file changes, the modified regions can be located by comparing
+    chunk digests. The ``indices`` argument can be used to rehash only
+    specific chunks.
+
+    Note:
+        The root hash depends on the ``chunksize`` and it will NOT match the
+        output of standard hashing programs (e.g. sha256sum). Use
+        :func:`hash_file` for that.
+
+    Args:
+        fpath (PathLike):
+            location of the file to be hashed.
+
+        chunksize (int | None):
+            The number of bytes in each chunk. Defaults to 2 ** 26.
+
+        workers (int):
+            number of parallel workers. If 0, chunks are hashed serially.
+            Defaults to 0.
+
+        backend (str):
+            The backend parallelism mechanism passed to :class:`Executor`.
+            Can be either thread, process, or serial. Defaults to 'thread'.
+
+        blocksize (int):
+            Amount of data to read and hash at a time within each chunk.
+            Defaults to 2 ** 20.
+
+        hasher (str | Hasher | NoParamType):
+            string code or a hash algorithm from hashlib. Defaults to
+            'sha512'.
+
+        base (List[str] | int | str | NoParamType):
+            list of symbols or shorthand key used to encode the root hash.
+            Defaults to 'hex'.
+
+        indices (List[int] | None):
+            if specified, only hash the chunks with these indices. In this
+            case the root hash is not computed.
+
+    Returns:
+        Dict[str, Any]: A dictionary with the keys:
+            root (str | None): the root hash
+            chunks (List[str]): the hex digest of each requested chunk
+            chunksize (int): the number of bytes in each chunk
+            size (int): the number of bytes in the file
+
+    Example:
+        >>> import ubelt as ub
+        >>> dpath = ub.Path.appdir('ubelt/tests/test-hash-tree').ensuredir()
+        >>> fpath = dpath / 'data.bin'
+        >>> fpath.write_bytes(b'a' * 100 + b'b' * 100 + b'c' * 50)
+        >>> tree1 = ub.hash_file_tree(fpath, chunksize=100, hasher='sha1', workers=2)
+        >>> print(tree1['root'])
+        8df15269082c12de11cbfbac7db8653126ddd949
+        >>> # Each chunk digest is the hash of that region of the file
+        >>> print(tree1['chunks'][0])
+        7f9000257a4918d7072655ea468540cdcbd42e0c
+        >>> assert tree1['chunks'][0] == ub.hash_data(b'a' * 100, hasher='sha1')
+        >>> assert ub.hash_file(fpath, mode='tree', chunksize=100, hasher='sha1') == tree1['root']
+        >>> # Modify part of the file and find the changed chunk
+        >>> fpath.write_bytes(b'a' * 100 + b'B' * 100 + b'c' * 50)
+        >>> tree2 = ub.hash_file_tree(fpath, chunksize=100, hasher='sha1')
+        >>> changed = [idx for idx, (h1, h2) in enumerate(zip(tree1['chunks'], tree2['chunks'])) if h1 != h2]
+        >>> print(changed)
+        [1]
+        >>> # Rehash only the chunk we are interested in
+        >>> tree3 = ub.hash_file_tree(fpath, chunksize=100, hasher='sha1', indices=changed)
+        >>> assert tree3['chunks'] == [tree2['chunks'][1]]
+        >>> assert tree3['root'] is None
+    """
+    import os
+    from functools import partial
+    from ubelt.util_futures import Executor
+    if chunksize is None:
+        chunksize = _DEFAULT_TREE_CHUNKSIZE
+    if chunksize <= 0:
+        raise ValueError('chunksize must be positive')
+    if hasattr(hasher, 'hexdigest'):
+        # Each chunk needs an independent hasher in the initial state
+        hasher = hasher.copy
+    size = os.stat(fpath).st_size
+    num_chunks = (size + chunksize - 1) // chunksize
+    if indices is None:
+        chunk_indices = range(num_chunks)
+    else:
+        chunk_indices = list(indices)
+    starts = [idx * chunksize for idx in chunk_indices]
+    stops = [min(start + chunksize, size) for start in starts]
+    worker = partial(_hash_file_range, blocksize=blocksize, hasher=hasher)
+    with Executor(mode=backend, max_workers=workers) as executor:
+        chunk_digests = list(executor.map(
+            worker, [fpath] * len(starts), starts, stops))
+    if indices is None:
+        root_hex = _combine_chunk_digests(chunk_digests, chunksize,
+                                          hasher=hasher)
+        root = _convert_hexstr_base(root_hex, _rectify_base(base))
+    else:
+        root = None
+    tree = {
+        'root': root,
+        'chunks': chunk_digests,
+        'chunksize': chunksize,
+        'size': size,
+    }
+    return tree
+
+
+def hash_files(fpaths, workers=0, backend='thread', blocksize=1048576,
+               stride=1, maxbytes=None, hasher=NoParam, base=NoParam):
+    r"""
+    Hashes the data in multiple files on disk concurrently.
+
+    The hash for each file is the same as the one computed by
+    :func:`hash_file` with the same arguments.
+
+    Args:
+        fpaths (Iterable[PathLike]):
+            locations of the files to be hashed.
+
+        workers (int):
+            number of parallel workers. If 0, files are hashed serially.
+            Defaults to 0.
+
+        backend (str):
+            The backend parallelism mechanism passed to :class:`Executor`.
+            Can be either thread, process, or serial. Because hashlib releases
+            the GIL when hashing large buffers, threads are typically
+            sufficient. Defaults to 'thread'.
+
+        blocksize (int):
+            Amount of data to hash at a time. Defaults to 2 ** 20.
+
+        stride (int):
+            strides > 1 skip data to hash. See :func:`hash_file`.
+            Defaults to 1.
+
+        maxbytes (int | None):
+            if specified, only hash the leading `maxbytes` of data in each
+            file.
+
+        hasher (str | Hasher | NoParamType):
+            string code or a hash algorithm from hashlib. If a hasher instance
+            is given, each file is hashed with a copy of it (this is not
+            supported by the process backend). Defaults to 'sha512'.
+
+        base (List[str] | int | str | NoParamType):
+            list of symbols or shorthand key. Defaults to 'hex'.
+
+    Returns:
+        Dict[PathLike, str]: mapping from each input path to its hash text in
+            the order the paths were given.
+
+    Example:
+        >>> import ubelt as ub
+        >>> dpath = ub.Path.appdir('ubelt/tests/test-hash-files').ensuredir()
+        >>> fpaths = []
+        >>> for i in range(10):
+        >>>     fpath = dpath / f'file_{i}.txt'
+        >>>     fpath.write_text('data' * i)
+        >>>     fpaths.append(fpath)
+        >>> results = ub.hash_files(fpaths, workers=4, hasher='sha1')
+        >>> assert list(results.keys()) == fpaths
+        >>> for fpath, hashstr in results.items():
+        >>>     assert hashstr == ub.hash_file(fpath, hasher='sha1')
+        >>> print(results[fpaths[0]])
+        da39a3ee5e6b4b0d3255bfef95601890afd80709
+    """
+    from functools import partial
+    from ubelt.util_futures import Executor
+    fpaths = list(fpaths)
+    if hasattr(hasher, 'hexdigest'):
+        # Each file needs an independent hasher in the initial state
+        hasher = hasher.copy
+    worker = partial(_hash_file_worker, blocksize=blocksize, stride=stride,
+                     maxbytes=maxbytes, hasher=hasher, base=base)
+    chunksize = 1
+    if backend == 'process' and workers > 0:
+        # Reduce IPC overhead when hashing many small files
+        chunksize = max(1, len(fpaths) // (workers * 4))
+    with Executor(mode=backend, max_workers=workers) as executor:
+        hashes = list(executor.map(worker, fpaths, chunksize=chunksize))
+    results = dict(zip(fpaths, hashes))
+    return results
+
+
 # Give the hash_data function itself a reference to the default extensions
 # register method so the user can modify them without accessing this module
 hash_data.extensions = _HASHABLE_EXTENSIONS
 hash_data.register = _HASHABLE_EXTENSIONS.register
 
 
-# class Hasher:
-#     """
-#     TODO
-#     """
-#     def __init__(self, hasher):
-#         ...
-#     hash_data = ...
-#     hash_file = ...
+class Hasher(object):
+    """
+    Incrementally hashes a sequence of objects.
+
+    Each call to :func:`Hasher.update` feeds one item of a sequence to the
+    underlying hash algorithm. The resulting hash is the same as calling
+    :func:`hash_data` on a list of all items, but the items never need to be
+    in memory at the same time. This makes it possible to hash a generator of
+    records or a large collection of arrays.
+
+    Attributes:
+        types (bool): if True, data types are included in the hash
+        extensions (HashableExtensions | None): custom hashable extensions
+        version (int): the :func:`hash_data` encoding version
+
+    Example:
+        >>> import ubelt as ub
+        >>> records = ({'id': idx, 'name': str(idx)} for idx in range(100))
+        >>> hasher = ub.Hasher('sha256')
+        >>> for record in records:
+        >>>     hasher.update(record)
+        >>> print(hasher.hexdigest()[0:8])
+        >>> # The result is the same as hashing the list all at once
+        >>> records = [{'id': idx, 'name': str(idx)} for idx in range(100)]
+        >>> assert hasher.hexdigest() == ub.hash_data(records, hasher='sha256')
+
+    Example:
+        >>> import ubelt as ub
+        >>> # Files can be streamed into the hash as if they were bytes
+        >>> dpath = ub.Path.appdir('ubelt/tests/test-hasher').ensuredir()
+        >>> fpath = dpath / 'data.txt'
+        >>> fpath.write_text('file contents')
+        >>> hasher = ub.Hasher(types=True, version=2)
+        >>> hasher.update('header')
+        >>> hasher.update_file(fpath)
+        >>> want = ub.hash_data(['header', b'file contents'], types=True, version=2)
+        >>> assert hasher.hexdigest() == want
+        >>> assert hasher.hexdigest(base='abc') == ub.hash_data(
+        >>>     ['header', b'file contents'], types=True, version=2, base='abc')
+    """
+
+    def __init__(self, hasher=NoParam, types=False, extensions=None,
+                 version=1):
+        """
+        Args:
+            hasher (str | Hasher | NoParamType):
+                string code or a hash algorithm from hashlib.
+                Defaults to 'sha512'.
+
+            types (bool):
+                If True data types are included in the hash, otherwise only the
+                raw data is hashed. Defaults to False.
+
+            extensions (HashableExtensions | None):
+                a custom :class:`HashableExtensions` instance that can
+                overwrite or define how different types of objects are hashed.
+
+            version (int):
+                The :func:`hash_data` encoding version. Defaults to 1.
+        """
+        self.types = types
+        self.extensions = extensions
+        self.version = version
+        self._update_hasher = _rectify_hash_data_version(version)
+        self._hasher = _rectify_hasher(hasher)()
+        self._hasher.update(_ITER_PREFIX)
+        # Version 1 does not write a separator after the first item that
+        # needs to be iterated over. See the note in :func:`_update_hasher`.
+        self._v1_nested_seen = False
+
+    def update(self, obj):
+        """
+        Add the next item in the sequence to the hash.
+
+        Args:
+            obj (object): ordered data with structure
+        """
+        hasher = self._hasher
+        if self.version == 1 and not self._v1_nested_seen:
+            try:
+                prefix, hashable = _convert_to_hashable(
+                    obj, self.types, extensions=self.extensions)
+            except TypeError:
+                self._update_hasher(hasher, obj, types=self.types,
+                                    extensions=self.extensions)
+                self._v1_nested_seen = True
+            else:
+                if isinstance(hashable, _HashableChunks):
+                    _update_hashable_chunks(hasher, prefix, hashable, _SEP)
+                else:
+                    hasher.update(prefix + hashable + _SEP)
+        else:
+            self._update_hasher(hasher, obj, types=self.types,
+                                extensions=self.extensions)
+            hasher.update(_SEP)
+
+    def update_file(self, fpath, blocksize=1048576):
+        """
+        Add the contents of a file as the next item in the sequence.
+
+        This is equivalent to ``self.update(fpath.read_bytes())``, but the file
+        is streamed to the hash algorithm in blocks.
+
+        Args:
+            fpath (PathLike): location of the file to be hashed.
+            blocksize (int): Amount of data to read and hash at a time.
+        """
+        hasher = self._hasher
+        if self.types:
+            hasher.update(b'TXT')
+        with open(fpath, 'rb') as file:
+            buf = file.read(blocksize)
+            while len(buf) > 0:
+                hasher.update(buf)
+                buf = file.read(blocksize)
+        hasher.update(_SEP)
+
+    def hexdigest(self, base=NoParam):
+        """
+        Get the hash of all items seen so far.
+
+        More items can be added after calling this method.
+
+        Args:
+            base (List[str] | str | NoParamType):
+                list of symbols or shorthand key.
+                Valid keys are 'dec', 'hex', 'abc', and 'alphanum', 10, 16,
+                26, 32. Defaults to 'hex'.
+
+        Returns:
+            str: text representing the hashed data
+        """
+        base = _rectify_base(base)
+        hasher = self._hasher.copy()
+        hasher.update(_ITER_SUFFIX)
+        text = _digest_hasher(hasher, base)
+        return text
@@ -5,10 +5,13 @@ from ubelt.util_const import NoParamType
 from typing import Any
 from typing import Callable
 from typing import Tuple
+from typing import Iterable
+from typing import Iterator
 from os import PathLike
+import os
 from typing import Any, TypeVar
 
-Hasher = TypeVar("Hasher")
+_Hasher = TypeVar("_Hasher")
 HASH_VERSION: int
 DEFAULT_ALPHABET: List[str]
 
@@ -59,19 +62,54 @@ class _HashTracer:
     def __init__(self) -> None:
         ...
 
-    def update(self, item: bytes) -> None:
+    def update(self, item: bytes | bytearray) -> None:
         ...
 
     def hexdigest(self) -> bytes:
         ...
 
 
+class _HashableChunks:
+    chunks: List[bytes | bytearray | memoryview]
+
+    def __init__(self, chunks: List[bytes | bytearray | memoryview]) -> None:
+        ...
+
+    def __iter__(self) -> Iterator[Any]:
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+    def __bytes__(self) -> bytes:
+        ...
+
+    def __add__(self, other: bytes) -> bytes:
+        ...
+
+    def __radd__(self, other: bytes) -> bytes:
+        ...
+
+
+class _NDArrayChunks(_HashableChunks):
+    header: bytes
+    data: Any
+    blocksize: int
+
+    def __init__(self,
+                 header: bytes,
+                 data: Any,
+                 blocksize: int = ...) -> None:
+        ...
+
+
 def hash_data(data: object,
-              hasher: str | Hasher | NoParamType = NoParam,
+              hasher: str | _Hasher | NoParamType = NoParam,
               base: List[str] | str | NoParamType = NoParam,
               types: bool = False,
               convert: bool = False,
-              extensions: HashableExtensions | None = None) -> str:
+              extensions: HashableExtensions | None = None,
+              version: int = 1) -> str:
     ...
 
 
@@ -79,6 +117,101 @@ def hash_file(fpath: PathLike,
               blocksize: int = 1048576,
               stride: int = 1,
               maxbytes: int | None = None,
-              hasher: str | Hasher | NoParamType = NoParam,
-              base: List[str] | int | str | NoParamType = NoParam) -> str:
+              hasher: str | _Hasher | NoParamType = NoParam,
+              base: List[str] | int | str | NoParamType = NoParam,
+              cache: bool | FileHashCache | None = None,
+              mode: str = 'linear',
+              chunksize: int | None = None,
+              workers: int = 0) -> str:
+    ...
+
+
+class FileHashCache:
+    fpath: str | PathLike
+    max_bytes: int | None
+    max_entries: int | None
+
+    def __init__(self,
+                 fpath: str | PathLike | None = None,
+                 max_bytes: int | None = ...,
+                 max_entries: int | None = None) -> None:
+        ...
+
+    def lookup(self,
+               fpath: str | PathLike,
+               stat: os.stat_result,
+               hasher_name: str,
+               stride: int = 1,
+               maxbytes: int | None = None,
+               blocksize: int = 1048576) -> str | None:
+        ...
+
+    def store(self,
+              fpath: str | PathLike,
+              stat: os.stat_result,
+              hasher_name: str,
+              hexdigest: str,
+              stride: int = 1,
+              maxbytes: int | None = None,
+              blocksize: int = 1048576) -> None:
+        ...
+
+    def nbytes(self) -> int:
+        ...
+
+    def evict(self) -> int:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+    def close(self) -> None:
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+
+def hash_file_tree(fpath: PathLike,
+                   chunksize: int | None = None,
+                   workers: int = 0,
+                   backend: str = 'thread',
+                   blocksize: int = 1048576,
+                   hasher: str | _Hasher | NoParamType = NoParam,
+                   base: List[str] | int | str | NoParamType = NoParam,
+                   indices: List[int] | None = None) -> Dict[str, Any]:
     ...
+
+
+def hash_files(fpaths: Iterable[PathLike],
+               workers: int = 0,
+               backend: str = 'thread',
+               blocksize: int = 1048576,
+               stride: int = 1,
+               maxbytes: int | None = None,
+               hasher: str | _Hasher | NoParamType = NoParam,
+               base: List[str] | int | str | NoParamType = NoParam) -> Dict[PathLike, str]:
+    ...
+
+
+class Hasher:
+    types: bool
+    extensions: HashableExtensions | None
+    version: int
+
+    def __init__(self,
+                 hasher: str | _Hasher | NoParamType = NoParam,
+                 types: bool = False,
+                 extensions: HashableExtensions | None = None,
+                 version: int = 1) -> None:
+        ...
+
+    def update(self, obj: object) -> None:
+        ...
+
+    def update_file(self, fpath: PathLike, blocksize: int = 1048576) -> None:
+        ...
+
+    def hexdigest(self,
+                  base: List[str] | str | NoParamType = NoParam) -> str:
+        ...
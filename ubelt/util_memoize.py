@@ -1,6 +1,8 @@
 """
 This module exposes decorators for in-memory caching of functional results.
 This is particularly useful when prototyping dynamic programming algorithms.
+Results of :func:`memoize` can also be persisted to disk with
+:class:`ubelt.util_cache.Cacher` so they are reused by other processes.
 
 Either :func:`memoize`, :func:`memoize_method`, and :func:`memoize_property`
 should be used depending on what type of function is being wrapped. The
@@ -52,23 +54,418 @@ from ubelt import util_hash
 __all__ = ['memoize', 'memoize_method', 'memoize_property']
 
 
-def _hashable(item):
+# Returned by _MemoCache.lookup when a key is not cached
+_MISSING = object()
+
+
+def _approx_sizeof(obj, _depth=0, _seen=None):
+    """
+    Approximate the number of bytes used by an object and the builtin
+    containers it holds. Objects with an integer ``nbytes`` attribute (e.g.
+    ndarrays) report that.
+
+    Args:
+        obj (object): the object to measure
+
+    Returns:
+        int: approximate size in bytes
+
+    Example:
+        >>> from ubelt.util_memoize import _approx_sizeof
+        >>> assert _approx_sizeof(b'x' * 1000) > 1000
+        >>> assert _approx_sizeof([b'x' * 1000] * 3) > 1000
+        >>> assert _approx_sizeof({'a': 'b' * 1000}) > 1000
+        >>> # Cycles are only counted once
+        >>> items = []
+        >>> items.append(items)
+        >>> assert _approx_sizeof(items) < 1000
+    """
+    nbytes = getattr(obj, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    size = sys.getsizeof(obj, 0)
+    # Only look a few levels deep to keep this cheap
+    if _depth < 4:
+        if isinstance(obj, (list, tuple, set, frozenset)):
+            for item in obj:
+                size += _approx_sizeof(item, _depth + 1, _seen)
+        elif isinstance(obj, dict):
+            for key, value in obj.items():
+                size += _approx_sizeof(key, _depth + 1, _seen)
+                size += _approx_sizeof(value, _depth + 1, _seen)
+    return size
+
+
+class _Flight(object):
+    """
+    A result that is being computed by one thread while others wait for it.
+    """
+    __slots__ = ('event', 'owner', 'value', 'error')
+
+    def __init__(self, owner):
+        import threading
+        self.event = threading.Event()
+        self.owner = owner
+        self.value = _MISSING
+        self.error = None
+
+
+class _MemoCache(object):
+    """
+    The storage of a memoized function, which can be bounded by the number
+    of results, their age, and their approximate size in bytes.
+
+    When bounded, the least recently used results are evicted first in O(1)
+    time. Results that are older than the ``ttl`` are treated as missing.
+
+    When ``threadsafe`` is True, :func:`_MemoCache.call_once` lets only one
+    thread compute a missing result while other threads wait for it. Hits
+    on an unbounded cache do not take a lock, because reading a dict is
+    atomic, but a bounded cache locks to update its LRU order.
+
+    Attributes:
+        data (Dict): maps each signature key to its result. This is the
+            ``cache`` attribute of the memoized function.
+
+    Example:
+        >>> from ubelt.util_memoize import _MemoCache, _MISSING
+        >>> memo = _MemoCache(maxsize=2)
+        >>> memo.store('a', 1)
+        >>> memo.store('b', 2)
+        >>> assert memo.lookup('a') == 1
+        >>> memo.store('c', 3)
+        >>> # 'b' was the least recently used
+        >>> assert memo.lookup('b') is _MISSING
+        >>> print(memo.info())
+        {'hits': 1, 'misses': 1, 'evictions': 1, 'maxsize': 2, 'currsize': 2, 'nbytes': None}
+
+    Example:
+        >>> from ubelt.util_memoize import _MemoCache
+        >>> from concurrent.futures import ThreadPoolExecutor
+        >>> import time
+        >>> memo = _MemoCache(threadsafe=True)
+        >>> calls = []
+        >>> def slow(x):
+        >>>     calls.append(x)
+        >>>     time.sleep(0.05)
+        >>>     return x * 2
+        >>> with ThreadPoolExecutor(4) as pool:
+        >>>     results = list(pool.map(
+        >>>         lambda _: memo.call_once('k', slow, (3,), {}), range(4)))
+        >>> assert results == [6, 6, 6, 6]
+        >>> assert calls == [3]
+    """
+
+    def __init__(self, maxsize=None, ttl=None, maxbytes=None,
+                 threadsafe=False):
+        """
+        Args:
+            maxsize (int | None): maximum number of results
+            ttl (float | None): maximum age of a result in seconds
+            maxbytes (int | None): maximum approximate size of all results
+            threadsafe (bool): if True, lock updates and de-duplicate
+                concurrent computations of the same result
+        """
+        from collections import OrderedDict
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self.bounded = not (maxsize is None and ttl is None and
+                            maxbytes is None)
+        self.data = OrderedDict() if self.bounded else {}
+        self._times = {} if ttl is not None else None
+        self._sizes = {} if maxbytes is not None else None
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if threadsafe:
+            import threading
+            self._lock = threading.RLock()
+            self._flights = {}
+        else:
+            self._lock = None
+            self._flights = None
+
+    def lookup(self, key):
+        """
+        Args:
+            key (Hashable): the signature key
+
+        Returns:
+            object: the result, or ``_MISSING`` if it is not cached
+        """
+        if self.bounded and self._lock is not None:
+            with self._lock:
+                return self._lookup(key)
+        return self._lookup(key)
+
+    def _lookup(self, key):
+        value = self.data.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return value
+        if self.bounded:
+            if self._times is not None:
+                import time
+                if time.monotonic() - self._times[key] > self.ttl:
+                    self._remove(key)
+                    self.evictions += 1
+                    self.misses += 1
+                    return _MISSING
+            self.data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def store(self, key, value):
+        """
+        Args:
+            key (Hashable): the signature key
+            value (object): the result
+        """
+        if self.bounded and self._lock is not None:
+            with self._lock:
+                self._store(key, value)
+        else:
+            self._store(key, value)
+
+    def _store(self, key, value):
+        data = self.data
+        if not self.bounded:
+            data[key] = value
+            return
+        if not data and self.nbytes:
+            # The data was cleared directly
+            self._reset()
+        if key in data:
+            self._remove(key)
+        data[key] = value
+        if self._times is not None:
+            import time
+            self._times[key] = time.monotonic()
+        if self._sizes is not None:
+            size = _approx_sizeof(value)
+            self._sizes[key] = size
+            self.nbytes += size
+        maxsize = self.maxsize
+        maxbytes = self.maxbytes
+        while data and ((maxsize is not None and len(data) > maxsize) or
+                        (maxbytes is not None and self.nbytes > maxbytes)):
+            old_key = next(iter(data))
+            self._remove(old_key)
+            self.evictions += 1
+
+    def call_once(self, key, func, args, kwargs):
+        """
+        Compute and store a missing result. If the cache is threadsafe and
+        another thread is already computing the result for this key, wait for
+        it instead (if it raises, the same error is raised here).
+
+        Args:
+            key (Hashable): the signature key
+            func (Callable): computes the result
+            args (Tuple): positional arguments for ``func``
+            kwargs (Dict): keyword arguments for ``func``
+
+        Returns:
+            object: the result
+        """
+        if self._lock is None:
+            value = func(*args, **kwargs)
+            self.store(key, value)
+            return value
+        import threading
+        ident = threading.get_ident()
+        with self._lock:
+            flight = self._flights.get(key, None)
+            if flight is None:
+                value = self.data.get(key, _MISSING)
+                if value is not _MISSING:
+                    # Another thread stored the result after our lookup
+                    return value
+                flight = self._flights[key] = _Flight(ident)
+                leader = True
+            else:
+                leader = False
+        if not leader:
+            if flight.owner == ident:
+                # A recursive call with the same arguments, waiting would
+                # deadlock.
+                return func(*args, **kwargs)
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        try:
+            value = func(*args, **kwargs)
+            self.store(key, value)
+            flight.value = value
+            return value
+        except BaseException as ex:
+            flight.error = ex
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.event.set()
+
+    def discard_part(self, part):
+        """
+        Remove the results whose signature key contains the given part.
+
+        Args:
+            part (Tuple): a key part from :func:`_hashable`
+        """
+        if self._lock is not None:
+            with self._lock:
+                self._discard_part(part)
+        else:
+            self._discard_part(part)
+
+    def _discard_part(self, part):
+        for key in list(self.data.keys()):
+            args, kwitems = key
+            if part in args or any(v == part for _, v in kwitems):
+                self._remove(key)
+                self.evictions += 1
+
+    def _remove(self, key):
+        del self.data[key]
+        if self._times is not None:
+            self._times.pop(key, None)
+        if self._sizes is not None:
+            self.nbytes -= self._sizes.pop(key, 0)
+
+    def _reset(self):
+        self.data.clear()
+        if self._times is not None:
+            self._times.clear()
+        if self._sizes is not None:
+            self._sizes.clear()
+        self.nbytes = 0
+
+    def clear(self):
+        """
+        Remove all results and reset the statistics.
+        """
+        if self._lock is not None:
+            with self._lock:
+                self._reset()
+        else:
+            self._reset()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def info(self):
+        """
+        Returns:
+            Dict[str, int | None]:
+                The number of hits, misses, and evictions, the maximum and
+                current number of results, and the approximate size of the
+                results (only measured if ``maxbytes`` is set).
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'maxsize': self.maxsize,
+            'currsize': len(self.data),
+            'nbytes': None if self._sizes is None else self.nbytes,
+        }
+
+
+# Tag the key parts that replace unhashable arguments, so they cannot be
+# equal to a hashable argument
+_HASHED = object()
+_IDENTITY = object()
+
+
+class _IdentityKeys(object):
+    """
+    Keys unhashable objects by their identity while they are alive.
+
+    When an object is garbage collected, ``on_dead`` is called with its key
+    part, so results computed from it can be removed before its id is reused.
+    """
+
+    def __init__(self, on_dead):
+        """
+        Args:
+            on_dead (Callable[[Tuple], None]):
+                called with the key part of each object that dies
+        """
+        self.on_dead = on_dead
+        self._refs = {}
+
+    def key(self, item):
+        """
+        Args:
+            item (object): an unhashable object
+
+        Returns:
+            Tuple | None: the key part for the item, or None if it does not
+                support weak references.
+        """
+        import weakref
+        oid = id(item)
+        ref = self._refs.get(oid, None)
+        if ref is None or ref() is not item:
+            try:
+                ref = weakref.ref(item, functools.partial(self._dead, oid))
+            except TypeError:
+                return None
+            self._refs[oid] = ref
+        return (_IDENTITY, oid)
+
+    def _dead(self, oid, ref):
+        if self._refs.get(oid, None) is ref:
+            del self._refs[oid]
+            self.on_dead((_IDENTITY, oid))
+
+
+def _hashable(item, identity=None):
     """
     Returns the item if it is naturally hashable, otherwise it tries to use
-    ubelt.util_hash.hash_data to make it hashable. Errors if it cannot.
+    ubelt.util_hash.hash_data to make it hashable (or keys it by identity if
+    ``identity`` is given and the item supports weak references). Errors if it
+    cannot.
     """
     try:
         hash(item)
     except TypeError:
-        return util_hash.hash_data(item)
+        if identity is not None:
+            key = identity.key(item)
+            if key is not None:
+                return key
+        return (_HASHED, util_hash.hash_data(item))
     else:
         return item
 
 
-def _make_signature_key(args, kwargs):
+def _make_signature_key(args, kwargs, identity=None):
     """
     Transforms function args into a key that can be used by the cache
 
+    Naturally hashable arguments are used as-is, and only the unhashable
+    arguments are hashed with :func:`ubelt.util_hash.hash_data` (or keyed by
+    identity).
+
+    Args:
+        args (Tuple): positional arguments
+        kwargs (Dict): keyword arguments
+        identity (_IdentityKeys | None):
+            if given, unhashable arguments that support weak references are
+            keyed by their identity instead of their content.
+
+    Returns:
+        Hashable
+
     Example:
         >>> from ubelt.util_memoize import _make_signature_key
         >>> args = (4, [1, 2])
@@ -88,6 +485,12 @@ def _make_signature_key(args, kwargs):
         >>>     def discard(self, item): return None
         >>> with pytest.raises(TypeError):
         >>>     _make_signature_key((Dummy(),), kwargs={})
+        >>> # Only the unhashable arguments are hashed
+        >>> key = _make_signature_key((4, [1, 2]), kwargs={'a': 'b'})
+        >>> assert key[0][0] == 4 and key[1] == (('a', 'b'),)
+        >>> # Hashed arguments are never equal to hashable ones
+        >>> text = key[0][1][1]
+        >>> assert key != _make_signature_key((4, text), kwargs={'a': 'b'})
     """
     kwitems = kwargs.items()
     # TODO: we should check if Python is at least 3.7 and sort by kwargs
@@ -97,16 +500,124 @@ def _make_signature_key(args, kwargs):
         kwitems = sorted(kwitems)
     kwitems = tuple(kwitems)
 
+    key = (args, kwitems)
     try:
-        key = _hashable(args), _hashable(kwitems)
+        hash(key)
     except TypeError:
-        msg = ('Signature is not hashable: '
-               'args={} kwargs{}'.format(args, kwargs))
-        raise TypeError(msg)
+        try:
+            key = (
+                tuple([_hashable(arg, identity) for arg in args]),
+                tuple([(k, _hashable(v, identity)) for k, v in kwitems]),
+            )
+        except TypeError:
+            msg = ('Signature is not hashable: '
+                   'args={} kwargs{}'.format(args, kwargs))
+            raise TypeError(msg)
     return key
 
 
-def memoize(func):
+class _DiskMemo(object):
+    """
+    Stores the results of a memoized function on disk.
+
+    Each result is saved with a :class:`ubelt.util_cache.Cacher` whose name is
+    the qualified name of the function and whose dependencies are a hash of
+    the source code of the function, the user specified ``depends``, and
+    :func:`ubelt.util_hash.hash_data` of the arguments. Unlike the in-memory
+    key, this is stable across processes.
+
+    Example:
+        >>> import ubelt as ub
+        >>> from ubelt.util_memoize import _DiskMemo
+        >>> def func(a, b=1):
+        >>>     return a + b
+        >>> dpath = ub.Path.appdir('ubelt/tests/memoize/diskmemo').delete()
+        >>> memo = _DiskMemo(func, dpath=dpath)
+        >>> assert memo.call((1,), {}) == 2
+        >>> assert memo.cacher((1,), {}).exists()
+        >>> assert not memo.cacher((1,), {'b': 2}).exists()
+    """
+
+    def __init__(self, func, dpath=None, depends=None):
+        """
+        Args:
+            func (Callable): the memoized function
+
+            dpath (str | PathLike | None): where results are stored.
+                Defaults to the ubelt memoize cache directory.
+
+            depends (object): extra data that the results depend on
+        """
+        import re
+        from ubelt.util_path import Path
+        if dpath is None:
+            dpath = Path.appdir('ubelt', 'memoize', type='cache')
+        name = '{}.{}'.format(getattr(func, '__module__', None),
+                              getattr(func, '__qualname__', func.__name__))
+        # Remove characters like the angle brackets in <locals>
+        self.fname = re.sub(r'[^\w.-]', '_', name)
+        self.func = func
+        self.dpath = dpath
+        self.depends = depends
+        self.func_hash = self._hash_source(func)
+
+    @staticmethod
+    def _hash_source(func):
+        """
+        Hash the source code of the function, so results are recomputed when
+        it changes. If the source is unavailable, the bytecode is used.
+        """
+        import inspect
+        try:
+            source = inspect.getsource(func)
+        except (OSError, TypeError):
+            import marshal
+            code = getattr(func, '__code__', None)
+            source = b'' if code is None else marshal.dumps(code)
+        return util_hash.hash_data(source)
+
+    def cacher(self, args, kwargs):
+        """
+        Args:
+            args (Tuple): positional arguments of the call
+            kwargs (Dict): keyword arguments of the call
+
+        Returns:
+            Cacher: stores the result of this call
+        """
+        from ubelt.util_cache import Cacher
+        try:
+            sig_hash = util_hash.hash_data([args, sorted(kwargs.items())])
+        except TypeError:
+            msg = ('Signature cannot be persisted: '
+                   'args={} kwargs{}'.format(args, kwargs))
+            raise TypeError(msg)
+        depends = [self.func_hash, self.depends, sig_hash]
+        return Cacher(self.fname, depends=depends, dpath=self.dpath,
+                      verbose=0)
+
+    def call(self, args, kwargs):
+        """
+        Load the result of the call from disk, or compute and save it.
+
+        Args:
+            args (Tuple): positional arguments of the call
+            kwargs (Dict): keyword arguments of the call
+
+        Returns:
+            object: the result
+        """
+        cacher = self.cacher(args, kwargs)
+        try:
+            return cacher.load()
+        except IOError:
+            result = self.func(*args, **kwargs)
+            cacher.save(result)
+            return result
+
+
+def memoize(func=None, persist=False, dpath=None, depends=None, maxsize=None,
+            ttl=None, maxbytes=None, identity=False, threadsafe=False):
     """
     memoization decorator that respects args and kwargs
 
@@ -114,11 +625,62 @@ def memoize(func):
     currently faster than memoize for simple functions [FunctoolsCache]_.
     However, memoize can handle more general non-natively hashable inputs.
 
+    This can be used directly as a decorator, or called with keyword
+    arguments to create a decorator with options.
+
     Args:
-        func (Callable): live python function
+        func (Callable | None): live python function
+
+        persist (bool):
+            If True, results are also saved to disk (in addition to the
+            in-memory cache), so they are reused by future processes. The
+            arguments must be supported by :func:`ubelt.util_hash.hash_data`
+            and the results must be pickleable. Results are recomputed when
+            the source code of the function or ``depends`` changes, but not
+            when anything else the function uses changes. Defaults to False.
+
+        dpath (str | PathLike | None):
+            The directory where persisted results are stored. Defaults to the
+            ubelt memoize cache directory.
+
+        depends (object):
+            Extra data (hashed with :func:`ubelt.util_hash.hash_data`) that
+            persisted results depend on, e.g. a version number.
+
+        maxsize (int | None):
+            If specified, only this many results are kept in memory, and the
+            least recently used are evicted first.
+
+        ttl (float | None):
+            If specified, results are recomputed (or reloaded) when they are
+            more than this many seconds old.
+
+        maxbytes (int | None):
+            If specified, least recently used results are evicted while the
+            approximate total size of the results in memory is larger than
+            this. The size of each result is estimated with
+            :func:`sys.getsizeof` on it and the builtin containers it holds
+            (or its ``nbytes`` attribute).
+
+        identity (bool):
+            If True, unhashable arguments that support weak references (e.g.
+            ndarrays) are keyed by their identity instead of hashing their
+            content, which is much faster for large objects. Changes made to
+            such an object in place are then not detected. Results are
+            removed when one of these arguments is garbage collected.
+            Defaults to False.
+
+        threadsafe (bool):
+            If True, when several threads call the function with the same
+            arguments at once, only the first computes the result and the
+            others wait for it (and raise the same error if it fails). Hits
+            do not take a lock unless the cache is bounded. Defaults to False.
 
     Returns:
-        Callable: memoized wrapper
+        Callable: memoized wrapper, or a decorator if ``func`` is None.
+            The wrapper has a ``cache_info`` method that returns the number of
+            hits, misses, evictions and cached results, and a ``cache_clear``
+            method.
 
     References:
         .. [WikiMemoize] https://wiki.python.org/moin/PythonDecoratorLibrary#Memoize
@@ -146,15 +708,76 @@ def memoize(func):
         >>> assert foo('a') == 0 and foo('c') == 1
         >>> assert incr[0] == 6
         >>> assert foo_memo('a') == 'b' and foo_memo('c') == 'd'
+
+    Example:
+        >>> # Persist results on disk so other processes can reuse them
+        >>> import ubelt as ub
+        >>> dpath = ub.Path.appdir('ubelt/tests/memoize/persist').delete()
+        >>> calls = []
+        >>> @ub.memoize(persist=True, dpath=dpath, depends='v1')
+        >>> def slow_square(x):
+        >>>     calls.append(x)
+        >>>     return x * x
+        >>> assert slow_square(3) == 9
+        >>> assert slow_square(3) == 9
+        >>> assert calls == [3]
+        >>> # A new process has an empty in-memory cache, but finds the result
+        >>> slow_square.cache_clear()
+        >>> assert slow_square(3) == 9
+        >>> assert calls == [3]
+
+    Example:
+        >>> # Bound the number of results kept in memory
+        >>> import ubelt as ub
+        >>> @ub.memoize(maxsize=2)
+        >>> def double(x):
+        >>>     return [x] * 2
+        >>> for x in [1, 2, 1, 3, 1, 2]:
+        >>>     double(x)
+        >>> print(double.cache_info())
+        {'hits': 2, 'misses': 4, 'evictions': 2, 'maxsize': 2, 'currsize': 2, 'nbytes': None}
+
+    Example:
+        >>> # Concurrent calls with the same arguments compute the result once
+        >>> import ubelt as ub
+        >>> import time
+        >>> calls = []
+        >>> @ub.memoize(threadsafe=True)
+        >>> def load(name):
+        >>>     calls.append(name)
+        >>>     time.sleep(0.05)
+        >>>     return name.upper()
+        >>> pool = ub.JobPool(mode='thread', max_workers=4)
+        >>> for _ in range(4):
+        >>>     pool.submit(load, 'data')
+        >>> results = [job.result() for job in pool.as_completed()]
+        >>> assert results == ['DATA'] * 4
+        >>> assert calls == ['data']
     """
-    cache = {}
+    if func is None:
+        return functools.partial(memoize, persist=persist, dpath=dpath,
+                                 depends=depends, maxsize=maxsize, ttl=ttl,
+                                 maxbytes=maxbytes, identity=identity,
+                                 threadsafe=threadsafe)
+    memo = _MemoCache(maxsize=maxsize, ttl=ttl, maxbytes=maxbytes,
+                      threadsafe=threadsafe)
+    lookup = memo.lookup
+    call_once = memo.call_once
+    disk = _DiskMemo(func, dpath=dpath, depends=depends) if persist else None
+    identity = _IdentityKeys(memo.discard_part) if identity else None
+    compute = func if disk is None else (
+        lambda *args, **kwargs: disk.call(args, kwargs))
+
     @functools.wraps(func)
     def memoizer(*args, **kwargs):
-        key = _make_signature_key(args, kwargs)
-        if key not in cache:
-            cache[key] = func(*args, **kwargs)
-        return cache[key]
-    memoizer.cache = cache
+        key = _make_signature_key(args, kwargs, identity)
+        value = lookup(key)
+        if value is _MISSING:
+            value = call_once(key, compute, args, kwargs)
+        return value
+    memoizer.cache = memo.data
+    memoizer.cache_info = memo.info
+    memoizer.cache_clear = memo.clear
     return memoizer
 
 
@@ -169,8 +792,16 @@ class memoize_method:
         __func__ (Callable): the wrapped function
 
     Note:
-        This is very thread-unsafe, and has an issue as pointed out in
-        [ActiveState_Miller_2010]_, next version may work on fixing this.
+        By default this is not thread-safe. Pass ``threadsafe=True`` so
+        concurrent calls on the same instance with the same arguments compute
+        the result once (see :func:`memoize`).
+
+    Note:
+        This can be called with ``maxsize``, ``ttl``, ``maxbytes``,
+        ``identity``, and ``threadsafe`` keyword arguments (see
+        :func:`memoize`) to create a decorator that configures the cache of
+        each instance. The bound method has ``cache_info`` and
+        ``cache_clear`` methods for the cache of its instance.
 
     Example:
         >>> import ubelt as ub
@@ -231,18 +862,63 @@ class memoize_method:
         >>> assert method2('a') == (0, 'F2')
         >>> assert method1('z') == ('z2', 'F1')
         >>> assert method2('z') == ('z2', 'F2')
+
+    Example:
+        >>> import ubelt as ub
+        >>> class Foo(object):
+        >>>     @ub.memoize_method(maxsize=1)
+        >>>     def square(self, x):
+        >>>         return x * x
+        >>> self = Foo()
+        >>> self.square(2), self.square(2), self.square(3)
+        >>> info = self.square.cache_info()
+        >>> assert info['hits'] == 1 and info['evictions'] == 1
+        >>> # Each instance has its own cache
+        >>> assert Foo().square.cache_info()['misses'] == 0
     """
-    def __init__(self, func):
+    def __init__(self, func=None, maxsize=None, ttl=None, maxbytes=None,
+                 identity=False, threadsafe=False):
         """
         Args:
-            func (Callable): method to wrap
+            func (Callable | None): method to wrap
+            maxsize (int | None): see :func:`memoize`
+            ttl (float | None): see :func:`memoize`
+            maxbytes (int | None): see :func:`memoize`
+            identity (bool): see :func:`memoize`
+            threadsafe (bool): see :func:`memoize`
         """
+        self._options = {'maxsize': maxsize, 'ttl': ttl, 'maxbytes': maxbytes,
+                         'threadsafe': threadsafe}
+        # Without options the cache of each instance is a plain dict
+        self._plain = (maxsize is None and ttl is None and maxbytes is None
+                       and not threadsafe)
+        self._identity = identity
+        self._func = None
+        if func is not None:
+            self._wrap(func)
+
+    def _wrap(self, func):
         self._func = func
         self._cache_name = '_cache__' + func.__name__
         # Mimic attributes of a bound method
         self.__func__ = func
         functools.update_wrapper(self, func)
 
+    def __call__(self, func):
+        """
+        Wrap the method when the decorator was created with options.
+
+        Args:
+            func (Callable): method to wrap
+
+        Returns:
+            memoize_method
+        """
+        if self._func is not None:
+            raise TypeError('memoize_method is already wrapping a method')
+        self._wrap(func)
+        return self
+
     def __get__(self, instance, cls=None):
         """
         Descriptor get method. Called when the decorated method is accessed
@@ -254,15 +930,34 @@ class memoize_method:
         """
         import types
         unbound = self._func
-        cache = instance.__dict__.setdefault(self._cache_name, {})
+        memo = instance.__dict__.get(self._cache_name, None)
+        if memo is None:
+            # setdefault is atomic, so threads that access the method for the
+            # first time at once share one cache
+            memo = instance.__dict__.setdefault(
+                self._cache_name,
+                {} if self._plain else _MemoCache(**self._options))
+        if isinstance(memo, dict):
+            # The instance stores the plain dict (as the ``cache`` of
+            # :func:`memoize` is), and the statistics are kept here.
+            data = memo
+            memo = _MemoCache()
+            memo.data = data
+        lookup = memo.lookup
+        call_once = memo.call_once
+        identity = _IdentityKeys(memo.discard_part) if self._identity else None
 
         # https://stackoverflow.com/questions/71413937/what-does-using-get-on-a-function-do
         @functools.wraps(unbound)
         def memoizer(instance, *args, **kwargs):
-            key = _make_signature_key(args, kwargs)
-            if key not in cache:
-                cache[key] = unbound(instance, *args, **kwargs)
-            return cache[key]
+            key = _make_signature_key(args, kwargs, identity)
+            value = lookup(key)
+            if value is _MISSING:
+                value = call_once(key, unbound, (instance,) + args, kwargs)
+            return value
+        memoizer.cache = memo.data
+        memoizer.cache_info = memo.info
+        memoizer.cache_clear = memo.clear
 
         # Bind the unbound memoizer to the instance
         bound_memoizer = types.MethodType(memoizer, instance)
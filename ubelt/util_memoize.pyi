@@ -1,20 +1,132 @@
 from typing import Callable
+from typing import Tuple
+from typing import Dict
+from os import PathLike
+from typing import Hashable
+from ubelt.util_cache import Cacher
 
 
-def memoize(func: Callable) -> Callable:
+def _approx_sizeof(obj: object, _depth: int = 0, _seen=None) -> int:
+    ...
+
+
+class _IdentityKeys:
+    on_dead: Callable
+
+    def __init__(self, on_dead: Callable) -> None:
+        ...
+
+    def key(self, item: object) -> Tuple | None:
+        ...
+
+
+def _hashable(item: object,
+              identity: _IdentityKeys | None = None) -> Hashable:
+    ...
+
+
+def _make_signature_key(args: Tuple,
+                        kwargs: Dict,
+                        identity: _IdentityKeys | None = None) -> Hashable:
+    ...
+
+
+class _Flight:
+    event: object
+    owner: int
+    value: object
+    error: BaseException | None
+
+    def __init__(self, owner: int) -> None:
+        ...
+
+
+class _MemoCache:
+    maxsize: int | None
+    ttl: float | None
+    maxbytes: int | None
+    bounded: bool
+    data: Dict
+    nbytes: int
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self,
+                 maxsize: int | None = None,
+                 ttl: float | None = None,
+                 maxbytes: int | None = None,
+                 threadsafe: bool = False) -> None:
+        ...
+
+    def lookup(self, key: Hashable) -> object:
+        ...
+
+    def store(self, key: Hashable, value: object) -> None:
+        ...
+
+    def call_once(self, key: Hashable, func: Callable, args: Tuple,
+                  kwargs: Dict) -> object:
+        ...
+
+    def discard_part(self, part: Hashable) -> None:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+    def info(self) -> Dict[str, int | None]:
+        ...
+
+
+class _DiskMemo:
+    fname: str
+    func: Callable
+    dpath: str | PathLike
+    depends: object
+    func_hash: str
+
+    def __init__(self,
+                 func: Callable,
+                 dpath: str | PathLike | None = None,
+                 depends: object = None) -> None:
+        ...
+
+    def cacher(self, args: Tuple, kwargs: Dict) -> Cacher:
+        ...
+
+    def call(self, args: Tuple, kwargs: Dict) -> object:
+        ...
+
+
+def memoize(func: Callable | None = None,
+            persist: bool = False,
+            dpath: str | PathLike | None = None,
+            depends: object = None,
+            maxsize: int | None = None,
+            ttl: float | None = None,
+            maxbytes: int | None = None,
+            identity: bool = False,
+            threadsafe: bool = False) -> Callable:
     ...
 
 
 class memoize_method:
     __func__: Callable
 
-    def __init__(self, func: Callable) -> None:
+    def __init__(self,
+                 func: Callable | None = None,
+                 maxsize: int | None = None,
+                 ttl: float | None = None,
+                 maxbytes: int | None = None,
+                 identity: bool = False,
+                 threadsafe: bool = False) -> None:
         ...
 
     def __get__(self, instance: object, cls: type | None = None):
         ...
 
-    def __call__(self, *args, **kwargs):
+    def __call__(self, func: Callable) -> memoize_method:
         ...
 
 